@@ -1,13 +1,15 @@
 from django.contrib import admin
+from .admin_mixins import LeanAdminMixin
 from .models import (
     Account, AccountAddress, AccountRole, AccountWarning, AccountBan,
     PasswordReset, ReportAccount, Client, Mechanic, ShopOwner,
-    Admin, HeadAdmin, Notification, TokenPurchase, VerificationRejection
+    Admin, HeadAdmin, Notification, TokenPurchase, VerificationRejection,
+    TokenLedger, TokenBalanceSnapshot, ModerationItem, AdminAuditLog, TokenRevocation
 )
 
 
 @admin.register(Account)
-class AccountAdmin(admin.ModelAdmin):
+class AccountAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['acc_id', 'username', 'email', 'firstname', 'lastname', 'is_active', 'is_verified', 'created_at']
     list_filter = ['is_active', 'is_verified', 'gender', 'created_at']
     search_fields = ['username', 'email', 'firstname', 'lastname']
@@ -16,13 +18,13 @@ class AccountAdmin(admin.ModelAdmin):
 
 
 @admin.register(AccountAddress)
-class AccountAddressAdmin(admin.ModelAdmin):
+class AccountAddressAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['acc_add_id', 'city_municipality', 'province', 'region', 'postal_code']
     search_fields = ['city_municipality', 'province', 'barangay']
 
 
 @admin.register(AccountRole)
-class AccountRoleAdmin(admin.ModelAdmin):
+class AccountRoleAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['acc_rol_id', 'acc', 'account_role', 'appointed_at']
     list_filter = ['account_role', 'appointed_at']
     search_fields = ['acc__username', 'acc__email']
@@ -30,7 +32,7 @@ class AccountRoleAdmin(admin.ModelAdmin):
 
 
 @admin.register(AccountWarning)
-class AccountWarningAdmin(admin.ModelAdmin):
+class AccountWarningAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['acc_war_id', 'receiver', 'issuer', 'created_at']
     list_filter = ['created_at']
     search_fields = ['receiver__username', 'issuer__username', 'reason_warning']
@@ -39,7 +41,7 @@ class AccountWarningAdmin(admin.ModelAdmin):
 
 
 @admin.register(AccountBan)
-class AccountBanAdmin(admin.ModelAdmin):
+class AccountBanAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['acc_ban_id', 'reason_ban', 'banned_at']
     search_fields = ['acc_ban_id__username', 'reason_ban']
     readonly_fields = ['banned_at', 'updated_at']
@@ -47,7 +49,7 @@ class AccountBanAdmin(admin.ModelAdmin):
 
 
 @admin.register(PasswordReset)
-class PasswordResetAdmin(admin.ModelAdmin):
+class PasswordResetAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['reset_id', 'acc', 'status', 'requested_at', 'expires_at']
     list_filter = ['status', 'requested_at']
     search_fields = ['acc__username', 'acc__email', 'reset_token']
@@ -56,7 +58,7 @@ class PasswordResetAdmin(admin.ModelAdmin):
 
 
 @admin.register(ReportAccount)
-class ReportAccountAdmin(admin.ModelAdmin):
+class ReportAccountAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['rep_acc_id', 'reported', 'reporter', 'status', 'reported_at']
     list_filter = ['status', 'reported_at']
     search_fields = ['reported__username', 'reporter__username', 'reason']
@@ -65,31 +67,33 @@ class ReportAccountAdmin(admin.ModelAdmin):
 
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['client_id', 'contact_number', 'created_at']
     search_fields = ['client_id__username', 'client_id__email', 'contact_number']
     readonly_fields = ['created_at', 'updated_at']
 
 
 @admin.register(Mechanic)
-class MechanicAdmin(admin.ModelAdmin):
+class MechanicAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['mechanic_id', 'contact_number', 'ranking', 'average_rating', 'status', 'is_working_for_shop', 'shop', 'token_wallet']
     list_filter = ['ranking', 'status', 'is_working_for_shop', 'created_at']
     search_fields = ['mechanic_id__username', 'mechanic_id__email', 'contact_number']
-    readonly_fields = ['created_at', 'updated_at']
+    # Balances only change through accounts.wallet, which writes the matching TokenLedger entry
+    readonly_fields = ['token_wallet', 'created_at', 'updated_at']
     ordering = ['-average_rating']
 
 
 @admin.register(ShopOwner)
-class ShopOwnerAdmin(admin.ModelAdmin):
+class ShopOwnerAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['shop_owner_id', 'contact_number', 'owns_shop', 'shop', 'status', 'token_wallet']
     list_filter = ['owns_shop', 'status', 'created_at']
     search_fields = ['shop_owner_id__username', 'shop_owner_id__email', 'contact_number']
-    readonly_fields = ['created_at', 'updated_at']
+    # Balances only change through accounts.wallet, which writes the matching TokenLedger entry
+    readonly_fields = ['token_wallet', 'created_at', 'updated_at']
 
 
 @admin.register(Admin)
-class AdminProfileAdmin(admin.ModelAdmin):
+class AdminProfileAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['admin_id', 'contact_number', 'created_by_admin', 'created_at']
     search_fields = ['admin_id__username', 'admin_id__email', 'contact_number']
     readonly_fields = ['created_at', 'updated_at']
@@ -97,7 +101,7 @@ class AdminProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(HeadAdmin)
-class HeadAdminAdmin(admin.ModelAdmin):
+class HeadAdminAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['head_admin_id', 'contact_number', 'created_at']
     search_fields = ['head_admin_id__username', 'head_admin_id__email', 'contact_number']
     readonly_fields = ['created_at', 'updated_at']
@@ -105,26 +109,91 @@ class HeadAdminAdmin(admin.ModelAdmin):
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['notification_id', 'receiver', 'title', 'type', 'is_read', 'created_at']
     list_filter = ['type', 'is_read', 'created_at']
     search_fields = ['receiver__username', 'title', 'message']
     readonly_fields = ['created_at', 'updated_at']
-    ordering = ['-created_at']
+    ordering = ['-notification_id']
 
 
 @admin.register(TokenPurchase)
-class TokenPurchaseAdmin(admin.ModelAdmin):
-    list_display = ['token_purchase_id', 'account', 'tokens_amount', 'price', 'status', 'purchased_at']
-    list_filter = ['status', 'purchased_at']
+class TokenPurchaseAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['token_purchase_id', 'account', 'package', 'tokens_amount', 'price', 'status', 'purchased_at']
+    list_filter = ['status', 'package', 'purchased_at']
     search_fields = ['account__username', 'account__email']
     readonly_fields = ['purchased_at']
     ordering = ['-purchased_at']
 
 
 @admin.register(VerificationRejection)
-class VerificationRejectionAdmin(admin.ModelAdmin):
+class VerificationRejectionAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['rejection_id', 'account', 'rejected_by', 'rejected_at']
     search_fields = ['account__username', 'rejected_by__username', 'reason']
     readonly_fields = ['rejected_at']
     ordering = ['-rejected_at']
+
+
+@admin.register(TokenLedger)
+class TokenLedgerAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['entry_id', 'account', 'entry_type', 'amount', 'service_category', 'created_by', 'created_at']
+    list_filter = ['entry_type', 'created_at']
+    search_fields = ['account__username', 'account__email', 'note']
+    raw_id_fields = ['account', 'token_purchase', 'created_by']
+    readonly_fields = ['created_at']
+    ordering = ['-entry_id']
+
+    # Entries are written by accounts.wallet alongside the balance update, never edited
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TokenBalanceSnapshot)
+class TokenBalanceSnapshotAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['snapshot_id', 'account', 'balance', 'last_entry_id', 'taken_at']
+    search_fields = ['account__username', 'account__email']
+    raw_id_fields = ['account']
+    ordering = ['-taken_at']
+
+
+@admin.register(ModerationItem)
+class ModerationItemAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['item_id', 'item_type', 'object_id', 'priority', 'status', 'claimed_by', 'lease_expires_at', 'submitted_at']
+    list_filter = ['item_type', 'status']
+    raw_id_fields = ['claimed_by']
+    readonly_fields = ['created_at', 'updated_at', 'completed_at']
+    ordering = ['-priority', 'submitted_at']
+
+
+@admin.register(AdminAuditLog)
+class AdminAuditLogAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['log_id', 'occurred_at', 'actor', 'action', 'target_type', 'target_id', 'ip_address']
+    list_filter = ['action', 'target_type']
+    search_fields = ['target_id', 'actor__username']
+    raw_id_fields = ['actor']
+    date_hierarchy = 'occurred_at'
+    ordering = ['-log_id']
+
+    # Entries are written by accounts.audit and never edited
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TokenRevocation)
+class TokenRevocationAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['revocation_id', 'account', 'reason', 'revoked_at']
+    list_filter = ['reason']
+    raw_id_fields = ['account']
+    ordering = ['-revoked_at']
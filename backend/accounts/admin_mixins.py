@@ -0,0 +1,135 @@
+"""
+Changelists for large tables in the Django admin.
+
+The stock changelist runs an exact COUNT(*) for the paginator and another
+for the unfiltered total, loads every foreign key in list_display one row at
+a time through __str__, and renders foreign key form fields as <select>s
+holding the whole related table. LeanAdminMixin replaces each of those:
+
+- counts come from the query planner once they pass EXACT_COUNT_THRESHOLD
+  (see estimated_count); small tables and results still get exact counts
+- foreign keys in list_display are joined with list_select_related
+- foreign key and many-to-many fields use autocomplete widgets when the
+  related model's admin has search_fields, and raw id inputs otherwise
+- when the list is ordered by descending primary key, an "Older entries"
+  link continues after the last row shown (?pk__lt=...), so browsing deep
+  into a table never needs a large OFFSET
+"""
+import json
+
+from django.contrib.admin import widgets
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+# Below this many (estimated) rows an exact count is cheap enough to run
+EXACT_COUNT_THRESHOLD = 10000
+
+
+def estimated_count(queryset):
+    """
+    Planner row estimate for queryset, or None where the database can't give one.
+    PostgreSQL estimates any query from its plan; MySQL only whole tables.
+    """
+    connection = connections[queryset.db]
+    try:
+        if connection.vendor == 'postgresql':
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        if connection.vendor == 'mysql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                    'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            return int(row[0]) if row and row[0] is not None else None
+    except (DatabaseError, KeyError, IndexError, TypeError, ValueError):
+        return None
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count is the planner's estimate for large results"""
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is None or estimate < EXACT_COUNT_THRESHOLD:
+            return super().count
+        return estimate
+
+
+class KeysetChangeList(ChangeList):
+    """Adds keyset_next_url, the page after the last row, to lists ordered by -pk"""
+
+    def get_results(self, request):
+        super().get_results(request)
+        self.keyset_next_url = None
+        ordering = self.queryset.query.order_by
+        pk_name = self.lookup_opts.pk.name
+        if not self.multi_page or not ordering or ordering[0] not in ('-pk', f'-{pk_name}'):
+            return
+        if len(self.result_list) == self.list_per_page:
+            last = self.result_list[len(self.result_list) - 1]
+            self.keyset_next_url = self.get_query_string({'pk__lt': last.pk}, [PAGE_VAR])
+
+
+class LeanAdminMixin:
+    """
+    ModelAdmin mixin for tables too large for exact counts and full <select>s
+    (see the module docstring). Put it before admin.ModelAdmin in the bases.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_list_select_related(self, request):
+        if self.list_select_related:
+            return self.list_select_related
+        related = []
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and (field.many_to_one or field.one_to_one) and field.concrete:
+                related.append(field.name)
+        return related
+
+    def _searchable(self, db_field):
+        related_admin = self.admin_site._registry.get(db_field.remote_field.model)
+        return bool(related_admin and related_admin.search_fields)
+
+    def get_autocomplete_fields(self, request):
+        if self.autocomplete_fields:
+            return self.autocomplete_fields
+        return [
+            field.name for field in self.model._meta.get_fields()
+            if field.concrete and field.is_relation and field.editable and not field.auto_created
+            and (field.many_to_one or field.one_to_one or field.many_to_many)
+            and field.name not in self.raw_id_fields and self._searchable(field)
+        ]
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name not in self.get_autocomplete_fields(request) and 'widget' not in kwargs:
+            kwargs['widget'] = widgets.ForeignKeyRawIdWidget(
+                db_field.remote_field, self.admin_site, using=kwargs.get('using')
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name not in self.get_autocomplete_fields(request) and 'widget' not in kwargs:
+            kwargs['widget'] = widgets.ManyToManyRawIdWidget(
+                db_field.remote_field, self.admin_site, using=kwargs.get('using')
+            )
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
@@ -0,0 +1,130 @@
+"""
+Admin audit trail.
+
+Views call record() after an admin action with the changed fields before
+and after. Entries are held in a per-thread buffer and written with one
+bulk_create when the request finishes (AuditLogMiddleware) or a batch()
+block exits, so auditing costs no extra round-trip per action. Outside a
+request or batch, record() writes the entry straight away.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Account, AdminAuditLog
+
+
+FLUSH_BATCH_SIZE = 500
+
+_local = threading.local()
+
+
+def _buffer():
+    return getattr(_local, 'entries', None)
+
+
+def _client_ip(request):
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR') or None
+
+
+def _account_id(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def snapshot(instance, fields):
+    """The named field values of a model instance, for before/after"""
+    return {field: getattr(instance, field) for field in fields}
+
+
+def record(actor_id, action, target, before=None, after=None, request=None):
+    """
+    Audit an admin action on a model instance. ``before`` and ``after`` are
+    dicts of the fields the action changed (see snapshot()).
+    """
+    entry = AdminAuditLog(
+        occurred_at=timezone.now(),
+        actor_id=_account_id(actor_id),
+        action=action,
+        target_type=target._meta.label_lower,
+        target_id=str(target.pk),
+        before=before,
+        after=after,
+        request_path=request.path[:255] if request is not None else None,
+        ip_address=_client_ip(request) if request is not None else None,
+    )
+    entries = _buffer()
+    if entries is None:
+        _write([entry])
+        return
+    entries.append(entry)
+    if len(entries) >= FLUSH_BATCH_SIZE:
+        flush()
+
+
+def _write(entries):
+    try:
+        with transaction.atomic():
+            AdminAuditLog.objects.bulk_create(entries, batch_size=FLUSH_BATCH_SIZE)
+    except IntegrityError:
+        # An actor id that is not an account must not cost the whole batch; keep the entries without it
+        known = set(Account.objects.filter(
+            acc_id__in={entry.actor_id for entry in entries if entry.actor_id}
+        ).values_list('acc_id', flat=True))
+        for entry in entries:
+            if entry.actor_id not in known:
+                entry.actor_id = None
+        AdminAuditLog.objects.bulk_create(entries, batch_size=FLUSH_BATCH_SIZE)
+
+
+def flush():
+    """Write the buffered entries; returns how many were written"""
+    entries = _buffer()
+    if not entries:
+        return 0
+    pending = entries[:]
+    entries.clear()
+    _write(pending)
+    return len(pending)
+
+
+@contextmanager
+def batch():
+    """Buffer every record() inside the block and write them together when it exits"""
+    if _buffer() is not None:
+        # Nested: the outermost batch flushes
+        yield
+        return
+    _local.entries = []
+    try:
+        yield
+    finally:
+        try:
+            flush()
+        finally:
+            _local.entries = None
+
+
+def search(start, end, actor_id=None, action=None, target_type=None, target_id=None):
+    """
+    Audit entries in [start, end) narrowed by actor, action or target. The
+    time range is required so every lookup is a range scan on one of the
+    occurred_at indexes.
+    """
+    entries = AdminAuditLog.objects.filter(occurred_at__gte=start, occurred_at__lt=end)
+    if actor_id:
+        entries = entries.filter(actor_id=actor_id)
+    if action:
+        entries = entries.filter(action=action)
+    if target_type:
+        entries = entries.filter(target_type=target_type)
+        if target_id:
+            entries = entries.filter(target_id=str(target_id))
+    return entries
@@ -11,6 +11,7 @@ from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFail
 from django.conf import settings
 
 from .models import Account
+from . import revocation
 
 
 class AccountJWTAuthentication(JWTAuthentication):
@@ -39,6 +40,9 @@ class AccountJWTAuthentication(JWTAuthentication):
             if user_id is None:
                 raise InvalidToken('Token contained no recognizable user identification')
             
+            if revocation.is_revoked(user_id, validated_token.get('iat')):
+                raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+            
             # Query Account model using acc_id
             try:
                 user = Account.objects.get(**{user_id_field: user_id})
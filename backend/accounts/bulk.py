@@ -0,0 +1,159 @@
+"""
+Bulk head admin actions.
+
+Each action takes a list of ids and applies the change to all of them with
+set-based queries: one read to classify the ids, one UPDATE or bulk_create
+per table touched and one bulk_create for the notifications, all in a
+single transaction. The result maps every requested id to None on success
+or the reason it was skipped.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from shop.models import Shop
+from .models import Account, AccountBan, AccountRole, Mechanic, Notification, VerificationRejection
+from . import audit, moderation, revocation
+
+
+MAX_BULK_IDS = 500
+
+
+def _results(ids, failures):
+    return {object_id: failures.get(object_id) for object_id in ids}
+
+
+def _notify(account_ids, title, message, type='info'):
+    Notification.objects.bulk_create([
+        Notification(receiver_id=account_id, title=title, message=message, type=type)
+        for account_id in account_ids
+    ], batch_size=1000)
+
+
+def ban_users(admin_id, ids, reason='Banned by head admin', request=None):
+    with transaction.atomic():
+        found = set(Account.objects.filter(acc_id__in=ids).values_list('acc_id', flat=True))
+        banned = set(AccountBan.objects.filter(acc_ban_id__in=found).values_list('acc_ban_id', flat=True))
+        failures = {object_id: 'User not found' for object_id in ids if object_id not in found}
+        failures.update({object_id: 'User is already banned' for object_id in banned})
+
+        to_ban = [object_id for object_id in ids if object_id not in failures]
+        AccountBan.objects.bulk_create(
+            [AccountBan(acc_ban_id_id=object_id, reason_ban=reason) for object_id in to_ban], ignore_conflicts=True
+        )
+        # bulk_create skips the ban signal that revokes outstanding tokens
+        revocation.revoke(to_ban, 'ban')
+    for object_id in to_ban:
+        audit.record(
+            admin_id, 'ban_user', Account(acc_id=object_id),
+            before={'is_banned': False}, after={'is_banned': True, 'reason_ban': reason}, request=request
+        )
+    return _results(ids, failures)
+
+
+def unban_users(admin_id, ids, request=None):
+    with transaction.atomic():
+        found = set(Account.objects.filter(acc_id__in=ids).values_list('acc_id', flat=True))
+        banned = AccountBan.objects.select_for_update().filter(acc_ban_id__in=found)
+        reasons = dict(banned.values_list('acc_ban_id', 'reason_ban'))
+        failures = {object_id: 'User not found' for object_id in ids if object_id not in found}
+        failures.update({object_id: 'User is not banned' for object_id in found if object_id not in reasons})
+
+        AccountBan.objects.filter(acc_ban_id__in=reasons).delete()
+    for object_id, reason in reasons.items():
+        audit.record(
+            admin_id, 'unban_user', Account(acc_id=object_id),
+            before={'is_banned': True, 'reason_ban': reason}, after={'is_banned': False}, request=request
+        )
+    return _results(ids, failures)
+
+
+def verify_shops(admin_id, ids, request=None):
+    with transaction.atomic():
+        shops = {
+            shop_id: (shop_name, owner_id, is_verified)
+            for shop_id, shop_name, owner_id, is_verified in Shop.objects.select_for_update().filter(
+                shop_id__in=ids
+            ).values_list('shop_id', 'shop_name', 'shop_owner_id', 'is_verified')
+        }
+        failures = {object_id: 'Shop not found' for object_id in ids if object_id not in shops}
+        failures.update({shop_id: 'Shop is already verified' for shop_id, shop in shops.items() if shop[2]})
+
+        to_verify = [object_id for object_id in ids if object_id not in failures]
+        Shop.objects.filter(shop_id__in=to_verify).update(is_verified=True, updated_at=timezone.now())
+        Notification.objects.bulk_create([
+            Notification(
+                receiver_id=shops[shop_id][1], title='Shop Verified',
+                message=f'Your shop "{shops[shop_id][0]}" has been verified!', type='info'
+            )
+            for shop_id in to_verify if shops[shop_id][1]
+        ], batch_size=1000)
+    for shop_id in to_verify:
+        audit.record(admin_id, 'verify_shop', Shop(shop_id=shop_id), {'is_verified': False}, {'is_verified': True}, request=request)
+    return _results(ids, failures)
+
+
+def approve_mechanics(admin_id, ids, request=None):
+    now = timezone.now()
+    with transaction.atomic():
+        statuses = dict(
+            Mechanic.objects.select_for_update().filter(mechanic_id__in=ids).values_list('mechanic_id', 'approval_status')
+        )
+        failures = {object_id: 'Mechanic not found' for object_id in ids if object_id not in statuses}
+        failures.update({
+            mechanic_id: 'Mechanic is already approved'
+            for mechanic_id, approval_status in statuses.items() if approval_status == 'approved'
+        })
+
+        to_approve = [object_id for object_id in ids if object_id not in failures]
+        Mechanic.objects.filter(mechanic_id__in=to_approve).update(
+            approval_status='approved', approved_at=now, approved_by_id=admin_id, updated_at=now
+        )
+        has_role = set(AccountRole.objects.filter(
+            acc_id__in=to_approve, account_role=AccountRole.ROLE_MECHANIC
+        ).values_list('acc_id', flat=True))
+        AccountRole.objects.bulk_create([
+            AccountRole(acc_id=mechanic_id, account_role=AccountRole.ROLE_MECHANIC)
+            for mechanic_id in to_approve if mechanic_id not in has_role
+        ])
+        _notify(
+            to_approve, 'Mechanic Application Approved',
+            'Congratulations! Your mechanic application has been approved. You can now access all mechanic features.'
+        )
+    for mechanic_id in to_approve:
+        audit.record(
+            admin_id, 'approve_mechanic', Mechanic(mechanic_id_id=mechanic_id),
+            {'approval_status': statuses[mechanic_id], 'approved_at': None, 'approved_by_id': None},
+            {'approval_status': 'approved', 'approved_at': now, 'approved_by_id': admin_id},
+            request=request
+        )
+    return _results(ids, failures)
+
+
+def reject_verifications(admin_id, ids, reason='Verification requirements not met', request=None):
+    with transaction.atomic():
+        verified = dict(Account.objects.filter(acc_id__in=ids).values_list('acc_id', 'is_verified'))
+        failures = {object_id: 'User not found' for object_id in ids if object_id not in verified}
+        failures.update({object_id: 'User is already verified' for object_id, is_verified in verified.items() if is_verified})
+
+        to_reject = [object_id for object_id in ids if object_id not in failures]
+        previous = dict(
+            VerificationRejection.objects.select_for_update().filter(account_id__in=to_reject).values_list('account_id', 'reason')
+        )
+        VerificationRejection.objects.filter(account_id__in=previous).update(rejected_by_id=admin_id, reason=reason)
+        VerificationRejection.objects.bulk_create([
+            VerificationRejection(account_id=account_id, rejected_by_id=admin_id, reason=reason)
+            for account_id in to_reject if account_id not in previous
+        ])
+        _notify(
+            to_reject, 'Verification Rejected',
+            f'Your verification request has been rejected. Reason: {reason}', type='warning'
+        )
+        # Set-based writes skip the model signals that keep the moderation queue in step
+        rejection_ids = list(VerificationRejection.objects.filter(account_id__in=to_reject).values_list('rejection_id', flat=True))
+        transaction.on_commit(lambda: moderation.sync('verification', rejection_ids))
+    for account_id in to_reject:
+        audit.record(
+            admin_id, 'reject_verification', Account(acc_id=account_id),
+            {'rejection_reason': previous.get(account_id)}, {'rejection_reason': reason}, request=request
+        )
+    return _results(ids, failures)
@@ -0,0 +1,46 @@
+"""
+Keyset-paginated list endpoints for the head admin pages, read with one query.
+
+An AdminListing declares a list once: the values() columns it reads (the
+joins follow from the related paths, so no row ever loads a related object
+on its own), the keyset ordering and how a row is turned into JSON.
+response() then runs a single query for the page and answers
+
+    {"results": [...], "next_cursor": "..." | null}
+
+which is the same shape paginate() responses use (see accounts.pagination).
+Pages hold at most MAX_PAGE_SIZE rows, so the page is read and serialized
+before the response is built: query and serializer errors still reach the
+view's own error handling instead of cutting off a body already being sent.
+"""
+from rest_framework import status
+from rest_framework.response import Response
+
+from .pagination import DEFAULT_PAGE_SIZE, paginate
+
+
+class AdminListing:
+    def __init__(self, columns, ordering, serialize):
+        """
+        columns: values() paths the serializer reads
+        ordering: keyset ordering, ending with a unique column
+        serialize: function turning one values() row dict into the output dict
+        """
+        self.ordering = tuple(ordering)
+        self.columns = list(dict.fromkeys(
+            [*columns, *(field.lstrip('-') for field in self.ordering)]
+        ))
+        self.serialize = serialize
+
+    def page(self, queryset, cursor_values=None, page_size=DEFAULT_PAGE_SIZE):
+        """
+        (results, next_cursor) for one page of queryset.
+        Raises InvalidCursor for a cursor that doesn't fit the ordering.
+        """
+        rows, next_cursor = paginate(queryset.values(*self.columns), self.ordering, cursor_values, page_size)
+        return [self.serialize(row) for row in rows], next_cursor
+
+    def response(self, queryset, cursor_values=None, page_size=DEFAULT_PAGE_SIZE):
+        """Response with one page of queryset; raises like page()"""
+        results, next_cursor = self.page(queryset, cursor_values, page_size)
+        return Response({'results': results, 'next_cursor': next_cursor}, status=status.HTTP_200_OK)
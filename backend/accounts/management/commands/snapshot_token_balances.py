@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from accounts import wallet
+
+
+class Command(BaseCommand):
+    help = 'Snapshot token wallet balances for accounts with new ledger entries'
+
+    def handle(self, *args, **options):
+        taken = 0
+        for account_id in wallet.accounts_needing_snapshot():
+            try:
+                snapshot, wallet_balance = wallet.take_snapshot(account_id)
+            except wallet.NoTokenWallet:
+                continue
+            if snapshot is None:
+                continue
+            taken += 1
+            if snapshot.balance != wallet_balance:
+                self.stdout.write(self.style.WARNING(
+                    f'Account #{account_id}: ledger balance {snapshot.balance} does not match wallet balance {wallet_balance}'
+                ))
+
+        self.stdout.write(self.style.SUCCESS(f'Took {taken} token balance snapshots'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from accounts import moderation
+
+
+class Command(BaseCommand):
+    help = 'Queue open disputes, refunds, reports and verification reviews and close finished ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='item_types', action='append', choices=list(moderation.SOURCES),
+            help='Only sync this item type (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        for item_type in options['item_types'] or moderation.SOURCES:
+            queued, reopened, closed = moderation.sync(item_type)
+            self.stdout.write(f'{item_type}: {queued} queued, {reopened} reopened, {closed} closed')
+
+        self.stdout.write(self.style.SUCCESS('Moderation queue is in sync'))
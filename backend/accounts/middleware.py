@@ -0,0 +1,12 @@
+from . import audit
+
+
+class AuditLogMiddleware:
+    """Write the audit entries a request recorded in one batch once its view returns"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with audit.batch():
+            return self.get_response(request)
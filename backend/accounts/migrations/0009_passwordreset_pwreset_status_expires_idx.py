@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_shopowner_approval_status_shopowner_approved_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordreset',
+            index=models.Index(fields=['status', 'expires_at'], name='pwreset_status_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def record_opening_balances(apps, schema_editor):
+    TokenLedger = apps.get_model('accounts', 'TokenLedger')
+    Mechanic = apps.get_model('accounts', 'Mechanic')
+    ShopOwner = apps.get_model('accounts', 'ShopOwner')
+
+    # Mechanic wallets take precedence for accounts holding both profiles
+    mechanic_ids = set(Mechanic.objects.values_list('mechanic_id', flat=True))
+    wallets = list(Mechanic.objects.exclude(token_wallet=0).values_list('mechanic_id', 'token_wallet'))
+    wallets += [
+        row for row in ShopOwner.objects.exclude(token_wallet=0).values_list('shop_owner_id', 'token_wallet')
+        if row[0] not in mechanic_ids
+    ]
+    TokenLedger.objects.bulk_create([
+        TokenLedger(account_id=account_id, entry_type='opening', amount=balance, note='Balance before the token ledger')
+        for account_id, balance in wallets
+    ], batch_size=500)
+
+
+def remove_opening_balances(apps, schema_editor):
+    apps.get_model('accounts', 'TokenLedger').objects.filter(entry_type='opening').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_passwordreset_pwreset_status_expires_idx'),
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenBalanceSnapshot',
+            fields=[
+                ('snapshot_id', models.AutoField(primary_key=True, serialize=False)),
+                ('last_entry_id', models.IntegerField()),
+                ('balance', models.IntegerField()),
+                ('taken_at', models.DateTimeField()),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='token_snapshots', to='accounts.account')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['account', 'taken_at'], name='tokensnapshot_acc_taken_idx')],
+                'constraints': [models.UniqueConstraint(fields=('account', 'last_entry_id'), name='tokensnapshot_acc_entry_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TokenLedger',
+            fields=[
+                ('entry_id', models.AutoField(primary_key=True, serialize=False)),
+                ('entry_type', models.CharField(choices=[('opening', 'Opening Balance'), ('purchase', 'Purchase'), ('spend', 'Spend'), ('refund', 'Refund'), ('adjustment', 'Admin Adjustment')], max_length=20)),
+                ('amount', models.IntegerField()),
+                ('note', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='token_ledger', to='accounts.account')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='token_adjustments_made', to='accounts.account')),
+                ('service_category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='token_spends', to='services.servicecategory')),
+                ('token_purchase', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='accounts.tokenpurchase')),
+            ],
+            options={
+                'ordering': ['-entry_id'],
+                'indexes': [models.Index(fields=['account', 'entry_id'], name='tokenledger_acc_entry_idx'), models.Index(fields=['account', 'created_at'], name='tokenledger_acc_created_idx')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, remove_opening_balances),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_tokenbalancesnapshot_tokenledger'),
+        ('payment', '0010_tokensalesdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tokenpurchase',
+            name='package',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purchases', to='payment.tokenpackage'),
+        ),
+        migrations.AddIndex(
+            model_name='tokenpurchase',
+            index=models.Index(fields=['purchased_at', 'token_purchase_id'], name='tokenpurchase_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tokenpurchase',
+            index=models.Index(fields=['status', 'purchased_at'], name='tokenpurchase_status_date_idx'),
+        ),
+    ]
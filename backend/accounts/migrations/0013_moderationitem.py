@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_account_account_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationItem',
+            fields=[
+                ('item_id', models.AutoField(primary_key=True, serialize=False)),
+                ('item_type', models.CharField(choices=[('dispute', 'Dispute'), ('refund', 'Refund Request'), ('report', 'Account Report'), ('verification', 'Verification Review')], max_length=20)),
+                ('object_id', models.IntegerField()),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('done', 'Done')], default='open', max_length=10)),
+                ('submitted_at', models.DateTimeField()),
+                ('claim_token', models.UUIDField(blank=True, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('claimed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_claims', to='accounts.account')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-priority', 'submitted_at', 'item_id'], name='moderation_queue_idx'), models.Index(fields=['claimed_by', 'status'], name='moderation_claimed_idx'), models.Index(fields=['claim_token'], name='moderation_claim_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('item_type', 'object_id'), name='moderation_item_uniq')],
+            },
+        ),
+    ]
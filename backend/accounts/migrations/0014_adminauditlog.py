@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:08
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_moderationitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminAuditLog',
+            fields=[
+                ('log_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('occurred_at', models.DateTimeField()),
+                ('action', models.CharField(max_length=50)),
+                ('target_type', models.CharField(max_length=50)),
+                ('target_id', models.CharField(max_length=64)),
+                ('before', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('after', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('request_path', models.CharField(blank=True, max_length=255, null=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_actions', to='accounts.account')),
+            ],
+            options={
+                'ordering': ['-occurred_at', '-log_id'],
+                'indexes': [models.Index(fields=['occurred_at', 'log_id'], name='audit_occurred_idx'), models.Index(fields=['actor', 'occurred_at'], name='audit_actor_occurred_idx'), models.Index(fields=['target_type', 'target_id', 'occurred_at'], name='audit_target_occurred_idx'), models.Index(fields=['action', 'occurred_at'], name='audit_action_occurred_idx')],
+            },
+        ),
+    ]
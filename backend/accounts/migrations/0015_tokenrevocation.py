@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_adminauditlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('revocation_id', models.AutoField(primary_key=True, serialize=False)),
+                ('reason', models.CharField(max_length=50)),
+                ('revoked_at', models.DateTimeField()),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='token_revocations', to='accounts.account')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['revoked_at'], name='tokenrevocation_revoked_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.hashers import check_password as django_check_password
+from django.core.serializers.json import DjangoJSONEncoder
 
 class Account(models.Model):
     acc_id = models.AutoField(primary_key=True)
@@ -17,6 +18,14 @@ class Account(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Admin user grid sort and search columns; PostgreSQL also gets trigram indexes (migration 0012)
+        indexes = [
+            models.Index(fields=['created_at', 'acc_id'], name='account_created_idx'),
+            models.Index(fields=['firstname'], name='account_firstname_idx'),
+            models.Index(fields=['lastname'], name='account_lastname_idx'),
+        ]
+
     def __str__(self):
         return f"{self.firstname} {self.lastname} ({self.username})"
     
@@ -120,6 +129,11 @@ class PasswordReset(models.Model):
     used_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='pwreset_status_expires_idx'),
+        ]
+
 
 class ReportAccount(models.Model):
     STATUS_PENDING = 'pending'
@@ -259,12 +273,65 @@ class Notification(models.Model):
 class TokenPurchase(models.Model):
     token_purchase_id = models.AutoField(primary_key=True)
     account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='token_purchases')
+    package = models.ForeignKey('payment.TokenPackage', on_delete=models.SET_NULL, null=True, blank=True, related_name='purchases')
     tokens_amount = models.IntegerField(default=0)
     price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     payment_method = models.CharField(max_length=255, null=True, blank=True)
     status = models.CharField(max_length=50, null=True, blank=True)
     purchased_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['purchased_at', 'token_purchase_id'], name='tokenpurchase_date_idx'),
+            models.Index(fields=['status', 'purchased_at'], name='tokenpurchase_status_date_idx'),
+        ]
+
+
+class TokenLedger(models.Model):
+    """Append-only history of token wallet changes; amount is signed"""
+    ENTRY_TYPE_CHOICES = [
+        ('opening', 'Opening Balance'),
+        ('purchase', 'Purchase'),
+        ('spend', 'Spend'),
+        ('refund', 'Refund'),
+        ('adjustment', 'Admin Adjustment'),
+    ]
+
+    entry_id = models.AutoField(primary_key=True)
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='token_ledger')
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPE_CHOICES)
+    amount = models.IntegerField()
+    token_purchase = models.ForeignKey('accounts.TokenPurchase', on_delete=models.SET_NULL, null=True, blank=True, related_name='ledger_entries')
+    service_category = models.ForeignKey('services.ServiceCategory', on_delete=models.SET_NULL, null=True, blank=True, related_name='token_spends')
+    created_by = models.ForeignKey('accounts.Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='token_adjustments_made')
+    note = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-entry_id']
+        indexes = [
+            models.Index(fields=['account', 'entry_id'], name='tokenledger_acc_entry_idx'),
+            models.Index(fields=['account', 'created_at'], name='tokenledger_acc_created_idx'),
+        ]
+
+
+class TokenBalanceSnapshot(models.Model):
+    """Wallet balance after every ledger entry up to and including last_entry_id"""
+    snapshot_id = models.AutoField(primary_key=True)
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='token_snapshots')
+    last_entry_id = models.IntegerField()
+    balance = models.IntegerField()
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-taken_at']
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'last_entry_id'], name='tokensnapshot_acc_entry_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['account', 'taken_at'], name='tokensnapshot_acc_taken_idx'),
+        ]
+
 
 class VerificationRejection(models.Model):
     rejection_id = models.AutoField(primary_key=True)
@@ -277,3 +344,94 @@ class VerificationRejection(models.Model):
         ordering = ['-rejected_at']
 
 
+
+
+class ModerationItem(models.Model):
+    """
+    One pending review in the head admin moderation queue, pointing at the
+    Dispute, RefundedBooking, ReportAccount or VerificationRejection row it
+    stands for. An admin holds an item while its lease is live; an expired
+    lease puts it back in the queue (see accounts.moderation).
+    """
+    ITEM_TYPE_CHOICES = [
+        ('dispute', 'Dispute'),
+        ('refund', 'Refund Request'),
+        ('report', 'Account Report'),
+        ('verification', 'Verification Review'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('done', 'Done'),
+    ]
+
+    item_id = models.AutoField(primary_key=True)
+    item_type = models.CharField(max_length=20, choices=ITEM_TYPE_CHOICES)
+    object_id = models.IntegerField()
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    submitted_at = models.DateTimeField()
+    claimed_by = models.ForeignKey('accounts.Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='moderation_claims')
+    claim_token = models.UUIDField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['item_type', 'object_id'], name='moderation_item_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-priority', 'submitted_at', 'item_id'], name='moderation_queue_idx'),
+            models.Index(fields=['claimed_by', 'status'], name='moderation_claimed_idx'),
+            models.Index(fields=['claim_token'], name='moderation_claim_token_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_item_type_display()} #{self.object_id} ({self.status})"
+
+
+class AdminAuditLog(models.Model):
+    """
+    Append-only record of an admin action: who did what to which row, with
+    the changed fields before and after. Written in batches by accounts.audit.
+    """
+    log_id = models.BigAutoField(primary_key=True)
+    occurred_at = models.DateTimeField()
+    actor = models.ForeignKey('accounts.Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_actions')
+    action = models.CharField(max_length=50)
+    target_type = models.CharField(max_length=50)
+    target_id = models.CharField(max_length=64)
+    before = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    after = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    request_path = models.CharField(max_length=255, null=True, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-occurred_at', '-log_id']
+        indexes = [
+            models.Index(fields=['occurred_at', 'log_id'], name='audit_occurred_idx'),
+            models.Index(fields=['actor', 'occurred_at'], name='audit_actor_occurred_idx'),
+            models.Index(fields=['target_type', 'target_id', 'occurred_at'], name='audit_target_occurred_idx'),
+            models.Index(fields=['action', 'occurred_at'], name='audit_action_occurred_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} on {self.target_type} #{self.target_id} by {self.actor_id}"
+
+
+class TokenRevocation(models.Model):
+    """
+    Access and refresh tokens issued to the account at or before revoked_at
+    are rejected. Written on ban, role, permission or active status changes
+    (see accounts.revocation).
+    """
+    revocation_id = models.AutoField(primary_key=True)
+    account = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='token_revocations')
+    reason = models.CharField(max_length=50)
+    revoked_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['revoked_at'], name='tokenrevocation_revoked_idx'),
+        ]
@@ -0,0 +1,169 @@
+"""
+Head admin moderation queue.
+
+Open disputes, refund requests, account reports and verification rejections
+are mirrored into ModerationItem rows, kept in step with their source tables
+by signals (and the sync_moderation_queue command). Admins claim the next N
+available items, highest priority and oldest first, with one indexed query.
+Where the database supports it the candidates are locked with FOR UPDATE
+SKIP LOCKED, so concurrent admins never wait on or receive the same rows; on
+SQLite the claim is a compare-and-swap UPDATE that re-checks availability.
+A claim is a lease: when it expires the item is available again.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.models import Dispute, RefundedBooking
+from .models import ModerationItem, ReportAccount, VerificationRejection
+
+
+DEFAULT_CLAIM_SIZE = 10
+MAX_CLAIM_SIZE = 50
+
+# Higher priority is served first; ties go to the oldest submission
+QUEUE_ORDERING = ('-priority', 'submitted_at', 'item_id')
+QUEUE_PRIORITIES = {
+    'dispute': 30,
+    'refund': 20,
+    'report': 10,
+    'verification': 0,
+}
+
+# item_type -> (source model, submitted timestamp field, filter for rows that still need review)
+SOURCES = {
+    'dispute': (Dispute, 'created_at', Q(status='pending')),
+    'refund': (RefundedBooking, 'requested_at', Q(status='pending')),
+    'report': (ReportAccount, 'reported_at', Q(status=ReportAccount.STATUS_PENDING)),
+    'verification': (VerificationRejection, 'rejected_at', Q(account__is_verified=False)),
+}
+
+# Fields shown with a queue item so an admin can triage it without opening the source
+SUMMARY_FIELDS = {
+    'dispute': ('booking_id', 'issue_description', 'complainer__username', 'complaint_against__username'),
+    'refund': ('booking_id', 'refund_amount', 'reason', 'requested_by__username'),
+    'report': ('reason', 'reporter__username', 'reported__username'),
+    'verification': ('account_id', 'reason', 'account__username'),
+}
+
+
+def lease_duration():
+    return timedelta(seconds=getattr(settings, 'MODERATION_LEASE_SECONDS', 900))
+
+
+def available(now=None, item_types=None):
+    """Open items nobody holds a live lease on"""
+    now = now or timezone.now()
+    items = ModerationItem.objects.filter(status='open').filter(
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+    )
+    if item_types:
+        items = items.filter(item_type__in=item_types)
+    return items
+
+
+def held_by(admin_id, now=None):
+    """Items the admin holds a live lease on"""
+    return ModerationItem.objects.filter(
+        status='open', claimed_by_id=admin_id, lease_expires_at__gt=now or timezone.now()
+    )
+
+
+def claim(admin_id, limit=DEFAULT_CLAIM_SIZE, item_types=None):
+    """
+    Lease up to ``limit`` available items to the admin and return them in
+    queue order. Without SKIP LOCKED an admin that loses a race for some of
+    the candidates gets fewer items rather than waiting.
+    """
+    limit = max(1, min(int(limit), MAX_CLAIM_SIZE))
+    now = timezone.now()
+    token = uuid.uuid4()
+    with transaction.atomic():
+        candidates = available(now, item_types).order_by(*QUEUE_ORDERING)
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        item_ids = list(candidates.values_list('item_id', flat=True)[:limit])
+        if not item_ids:
+            return []
+        # Availability is checked again by the UPDATE itself, so a row another
+        # admin claimed since the SELECT is skipped instead of stolen
+        available(now).filter(item_id__in=item_ids).update(
+            claimed_by_id=admin_id, claim_token=token,
+            lease_expires_at=now + lease_duration(), updated_at=now
+        )
+    return list(ModerationItem.objects.filter(claim_token=token).order_by(*QUEUE_ORDERING))
+
+
+def renew(admin_id, item_ids):
+    """
+    Extend the admin's lease on items they still hold; returns how many were
+    renewed. An expired lease can be renewed as long as nobody else has
+    claimed the item since.
+    """
+    now = timezone.now()
+    return ModerationItem.objects.filter(
+        item_id__in=item_ids, status='open', claimed_by_id=admin_id
+    ).update(lease_expires_at=now + lease_duration(), updated_at=now)
+
+
+def release(admin_id, item_ids):
+    """Hand items back to the queue; returns how many were released"""
+    return ModerationItem.objects.filter(
+        item_id__in=item_ids, status='open', claimed_by_id=admin_id
+    ).update(claimed_by=None, claim_token=None, lease_expires_at=None, updated_at=timezone.now())
+
+
+def sync(item_type, object_ids=None):
+    """
+    Bring queue items for one source table in line with it: queue rows that
+    need review, reopen items whose source went back to pending and close
+    items whose source was reviewed or deleted. ``object_ids`` limits the
+    sync to those source rows. Returns (queued, reopened, closed).
+    """
+    model, submitted_field, needs_review = SOURCES[item_type]
+    sources = model.objects.all()
+    items = ModerationItem.objects.filter(item_type=item_type)
+    if object_ids is not None:
+        sources = sources.filter(pk__in=object_ids)
+        items = items.filter(object_id__in=object_ids)
+    open_sources = sources.filter(needs_review)
+    now = timezone.now()
+
+    with transaction.atomic():
+        existing = set(items.values_list('object_id', flat=True))
+        new_items = [
+            ModerationItem(
+                item_type=item_type, object_id=object_id,
+                priority=QUEUE_PRIORITIES[item_type], submitted_at=submitted_at
+            )
+            for object_id, submitted_at in open_sources.values_list('pk', submitted_field).iterator()
+            if object_id not in existing
+        ]
+        ModerationItem.objects.bulk_create(new_items, batch_size=1000, ignore_conflicts=True)
+
+        reopened = items.filter(status='done', object_id__in=open_sources.values('pk')).update(
+            status='open', completed_at=None, updated_at=now
+        )
+        closed = items.filter(status='open').exclude(object_id__in=open_sources.values('pk')).update(
+            status='done', completed_at=now, claimed_by=None, claim_token=None,
+            lease_expires_at=None, updated_at=now
+        )
+    return len(new_items), reopened, closed
+
+
+def summaries(items):
+    """{(item_type, object_id): summary dict} with one query per item type present"""
+    object_ids = {}
+    for item in items:
+        object_ids.setdefault(item.item_type, []).append(item.object_id)
+
+    by_item = {}
+    for item_type, ids in object_ids.items():
+        model = SOURCES[item_type][0]
+        for row in model.objects.filter(pk__in=ids).values('pk', *SUMMARY_FIELDS[item_type]):
+            by_item[(item_type, row.pop('pk'))] = row
+    return by_item
@@ -0,0 +1,149 @@
+"""
+Keyset (cursor) pagination helpers for head admin list endpoints.
+
+Pages are fetched with a WHERE clause on the ordering columns instead of an
+OFFSET, so every page costs the same index range scan no matter how deep
+the client has scrolled. The cursor is the ordering values of the last row,
+JSON-encoded and base64'd so clients treat it as opaque.
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keep full microsecond precision, which DjangoJSONEncoder trims to milliseconds"""
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeError):
+        raise InvalidCursor('Invalid cursor')
+    # Ordering values are JSON scalars; nested lists or objects never came from encode_cursor
+    if not isinstance(values, list) or any(isinstance(value, (list, dict)) for value in values):
+        raise InvalidCursor('Invalid cursor')
+    return values
+
+
+def get_page_params(request):
+    """
+    Read ?cursor and ?page_size from the request.
+    Raises InvalidCursor for a malformed cursor or page size.
+    """
+    try:
+        page_size = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise InvalidCursor('page_size must be a number')
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    cursor = request.GET.get('cursor')
+    return (decode_cursor(cursor) if cursor else None), page_size
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    for attr in field.split('__'):
+        row = getattr(row, attr)
+    return row
+
+
+def _model_field(model, path):
+    """The model field at the end of a values() path, or None for annotations"""
+    field = None
+    for name in path.split('__'):
+        if model is None:
+            return None
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def _clean_cursor(model, ordering, values):
+    """Cursor values converted to their ordering columns' types"""
+    cleaned = []
+    for field_name, value in zip(ordering, values):
+        field = _model_field(model, field_name.lstrip('-'))
+        if field is not None and value is not None:
+            if field.is_relation:
+                field = field.target_field
+            try:
+                value = field.to_python(value)
+            except (ValidationError, ValueError, TypeError):
+                raise InvalidCursor('Invalid cursor')
+        cleaned.append(value)
+    return cleaned
+
+
+def _after(ordering, values):
+    """Build the filter selecting rows strictly after the cursor position"""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def page_queryset(queryset, ordering, cursor_values=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    The queryset limited to one page after the cursor, plus one extra row
+    that only tells whether a next page exists.
+    Raises InvalidCursor when the cursor doesn't match the ordering or its
+    values don't fit the ordering columns.
+    """
+    if cursor_values is not None:
+        if len(cursor_values) != len(ordering):
+            raise InvalidCursor('Invalid cursor')
+        cursor_values = _clean_cursor(queryset.model, ordering, cursor_values)
+        queryset = queryset.filter(_after(ordering, cursor_values))
+    return queryset.order_by(*ordering)[:page_size + 1]
+
+
+def row_cursor(row, ordering):
+    """Cursor pointing just after row"""
+    return encode_cursor(_row_value(row, field.lstrip('-')) for field in ordering)
+
+
+def paginate(queryset, ordering, cursor_values=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return (rows, next_cursor) for one page of the queryset.
+
+    ``ordering`` must end with a unique column (usually the primary key) so
+    the position is unambiguous, and should match an index. Works with model
+    instances and values() dicts; values() querysets must include every
+    ordering column.
+    """
+    rows = list(page_queryset(queryset, ordering, cursor_values, page_size))
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = row_cursor(rows[-1], ordering)
+    return rows, next_cursor
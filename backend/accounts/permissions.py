@@ -1,109 +1,123 @@
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
-from .models import AccountRole
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+from .models import AccountRole, Admin
+from . import revocation
 
-def head_admin_required(view_func):
+# One bit per Admin.PERMISSION_CHOICES entry, in declaration order.
+# Only ever append to PERMISSION_CHOICES: reordering would change the meaning of issued tokens.
+PERMISSION_BITS = {name: 1 << index for index, (name, _) in enumerate(Admin.PERMISSION_CHOICES)}
+ALL_PERMISSIONS = sum(PERMISSION_BITS.values())
+
+
+def permission_mask(permissions):
+    """Bitmask for a list of permission names; unknown names are ignored"""
+    return sum(PERMISSION_BITS[name] for name in set(permissions or []) if name in PERMISSION_BITS)
+
+
+def compile_claims(account):
     """
-    Decorator to check if user has head_admin role
-    Usage: @head_admin_required
-    Note: This is designed for stateless API with user_id passed in requests
+    Role and permission claims for an account's tokens.
+    Head admins hold every permission; admins hold the ones in Admin.permissions.
     """
-    @wraps(view_func)
-    def wrapper(request, *args, **kwargs):
-        # Get user_id from request
-        user_id = request.GET.get('user_id') or request.data.get('user_id')
-        
-        if not user_id:
-            return Response({
-                'error': 'Authentication required',
-                'details': 'user_id is required'
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        # Verify user exists and is active
-        try:
-            from .models import Account
-            user = Account.objects.get(acc_id=user_id)
-            
-            if not user.is_active:
-                return Response({
-                    'error': 'Account is inactive',
-                    'details': 'This account has been deactivated'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Check if user is banned
-            if hasattr(user, 'ban'):
-                return Response({
-                    'error': 'Account is banned',
-                    'details': user.ban.reason_ban
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Check if user has head_admin role
-            has_head_admin = AccountRole.objects.filter(
-                acc_id=user_id,
-                account_role=AccountRole.ROLE_HEAD_ADMIN
-            ).exists()
-            
-            if not has_head_admin:
+    roles = sorted(set(account.roles.values_list('account_role', flat=True)))
+    if AccountRole.ROLE_HEAD_ADMIN in roles:
+        perms = ALL_PERMISSIONS
+    elif AccountRole.ROLE_ADMIN in roles:
+        perms = permission_mask(
+            Admin.objects.filter(admin_id=account.acc_id).values_list('permissions', flat=True).first()
+        )
+    else:
+        perms = 0
+    return {'roles': roles, 'perms': perms}
+
+
+def _token_claims(request):
+    """
+    Validated access token from the Authorization header, checked in memory
+    (signature, expiry, revocation). Returns (token, None) or (None, error Response).
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(header) != 2 or header[0] != 'Bearer':
+        return None, Response({
+            'error': 'Authentication required',
+            'details': 'A Bearer access token is required'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    try:
+        token = AccessToken(header[1])
+    except TokenError as e:
+        return None, Response({
+            'error': 'Authentication failed',
+            'details': str(e)
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    if revocation.is_revoked(token.get('acc_id'), token.get('iat')):
+        return None, Response({
+            'error': 'Authentication failed',
+            'details': 'Token has been revoked, please log in again'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    return token, None
+
+
+def _role_required(roles, details, permission=None):
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            token, error = _token_claims(request)
+            if error:
+                return error
+
+            token_roles = set(token.get('roles', []))
+            allowed = bool(token_roles & roles)
+            if allowed and permission and AccountRole.ROLE_HEAD_ADMIN not in token_roles:
+                allowed = bool(token.get('perms', 0) & PERMISSION_BITS[permission])
+            if not allowed:
                 return Response({
                     'error': 'Permission denied',
-                    'details': 'Head admin access required'
+                    'details': details
                 }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Store user_id in request for easy access
-            request.head_admin_id = user_id
-            
-        except Account.DoesNotExist:
-            return Response({
-                'error': 'User not found',
-                'details': 'Invalid user_id'
-            }, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({
-                'error': 'Authentication failed',
-                'details': str(e)
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        return view_func(request, *args, **kwargs)
-    
-    return wrapper
+
+            request.admin_id = token['acc_id']
+            if AccountRole.ROLE_HEAD_ADMIN in token_roles:
+                request.head_admin_id = token['acc_id']
+            return view_func(request, *args, **kwargs)
+
+        # The token is authenticated above; DRF's own authentication would load the Account again
+        wrapper.authentication_classes = []
+        return wrapper
+    return decorator
+
+
+def head_admin_required(view_func):
+    """
+    Decorator to check the request's access token carries the head_admin role
+    Usage: @head_admin_required
+    Note: Roles come from the token's claims, so the check runs no queries;
+    bans and role changes revoke outstanding tokens (see accounts.revocation)
+    """
+    return _role_required({AccountRole.ROLE_HEAD_ADMIN}, 'Head admin access required')(view_func)
 
 
 def admin_or_head_admin_required(view_func):
     """
-    Decorator to check if user has admin or head_admin role
+    Decorator to check the request's access token carries the admin or head_admin role
     Usage: @admin_or_head_admin_required
     """
-    @wraps(view_func)
-    def wrapper(request, *args, **kwargs):
-        user_id = request.GET.get('user_id') or request.data.get('user_id')
-        
-        if not user_id:
-            return Response({
-                'error': 'Authentication required',
-                'details': 'user_id is required'
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        try:
-            has_permission = AccountRole.objects.filter(
-                acc_id=user_id,
-                account_role__in=[AccountRole.ROLE_ADMIN, AccountRole.ROLE_HEAD_ADMIN]
-            ).exists()
-            
-            if not has_permission:
-                return Response({
-                    'error': 'Permission denied',
-                    'details': 'Admin access required'
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            request.admin_id = user_id
-            
-        except Exception as e:
-            return Response({
-                'error': 'Authentication failed',
-                'details': str(e)
-            }, status=status.HTTP_401_UNAUTHORIZED)
-        
-        return view_func(request, *args, **kwargs)
-    
-    return wrapper
\ No newline at end of file
+    return _role_required(
+        {AccountRole.ROLE_ADMIN, AccountRole.ROLE_HEAD_ADMIN}, 'Admin access required'
+    )(view_func)
+
+
+def admin_permission_required(permission):
+    """
+    Decorator to check the request's access token belongs to a head admin, or
+    to an admin holding the given Admin.PERMISSION_CHOICES permission
+    Usage: @admin_permission_required('manage_users')
+    """
+    if permission not in PERMISSION_BITS:
+        raise ValueError(f'Unknown admin permission: {permission}')
+    return _role_required(
+        {AccountRole.ROLE_ADMIN, AccountRole.ROLE_HEAD_ADMIN},
+        f'The {permission} permission is required', permission
+    )
@@ -0,0 +1,75 @@
+"""
+JWT revocation.
+
+Access tokens carry the account's roles and admin permission bitmask (see
+accounts.permissions), so a ban, role, permission or active status change
+must invalidate the tokens already issued. Each change writes a
+TokenRevocation row; a token is rejected when it was issued at or before
+the account's latest revocation.
+
+Every process keeps the revocations of the last refresh token lifetime in
+memory and reloads them from the database at most every
+TOKEN_REVOCATION_REFRESH_SECONDS, or as soon as a local revocation commits,
+so checking a token normally costs no query.
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TokenRevocation
+
+
+_lock = threading.Lock()
+_revoked = {}
+_loaded_at = None
+
+
+def _window():
+    """Older revocations can be forgotten: every token issued before them has expired"""
+    jwt_settings = getattr(settings, 'SIMPLE_JWT', {})
+    return max(
+        jwt_settings.get('ACCESS_TOKEN_LIFETIME', timedelta(minutes=5)),
+        jwt_settings.get('REFRESH_TOKEN_LIFETIME', timedelta(days=1)),
+    )
+
+
+def reload():
+    """Replace this process's revocation set with the database's"""
+    global _revoked, _loaded_at
+    latest = {}
+    rows = TokenRevocation.objects.filter(revoked_at__gte=timezone.now() - _window()).values_list('account_id', 'revoked_at')
+    for account_id, revoked_at in rows:
+        latest[account_id] = max(latest.get(account_id, 0), revoked_at.timestamp())
+    with _lock:
+        _revoked = latest
+        _loaded_at = time.monotonic()
+
+
+def _current():
+    refresh_seconds = getattr(settings, 'TOKEN_REVOCATION_REFRESH_SECONDS', 5)
+    if _loaded_at is None or time.monotonic() - _loaded_at >= refresh_seconds:
+        reload()
+    return _revoked
+
+
+def is_revoked(account_id, issued_at):
+    """True when a token for account_id issued at issued_at (epoch seconds) has been revoked"""
+    if account_id is None or issued_at is None:
+        return True
+    revoked_at = _current().get(int(account_id))
+    # iat has whole-second precision, so a token issued in the same second as the revocation is rejected too
+    return revoked_at is not None and issued_at <= revoked_at
+
+
+def revoke(account_ids, reason):
+    """Revoke every token issued so far to the accounts"""
+    now = timezone.now()
+    TokenRevocation.objects.bulk_create([
+        TokenRevocation(account_id=account_id, reason=reason, revoked_at=now)
+        for account_id in set(account_ids)
+    ])
+    transaction.on_commit(reload)
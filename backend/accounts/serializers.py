@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from django.contrib.auth import authenticate
@@ -7,6 +10,8 @@ from .models import (
     Account, AccountAddress, AccountRole, Client, Mechanic, 
     ShopOwner, Admin, HeadAdmin, PasswordReset, Notification
 )
+from .permissions import compile_claims
+from . import revocation
 
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -34,6 +39,10 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         primary_role = user.get_primary_role()
         token['role'] = primary_role
         
+        # Roles and admin permission bitmask, checked in memory by accounts.permissions
+        for claim, value in compile_claims(user).items():
+            token[claim] = value
+        
         return token
     
     def validate(self, attrs):
@@ -67,6 +76,35 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
             raise serializers.ValidationError('Must include username and password.')
 
 
+class AccountTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuse to refresh tokens issued before a revocation: the new access token
+    would carry the role and permission claims the revocation invalidated
+    """
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if revocation.is_revoked(refresh.get('acc_id'), refresh.get('iat')):
+            raise InvalidToken('Token has been revoked, please log in again')
+        # The base serializer looks the user up in AUTH_USER_MODEL, which Account is not
+        if not Account.objects.filter(acc_id=refresh.get('acc_id'), is_active=True).exists():
+            raise InvalidToken('No active account found for the given token')
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # Blacklist app not installed
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
+
+
 class AccountAddressSerializer(serializers.ModelSerializer):
     class Meta:
         model = AccountAddress
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from bookings.models import Dispute, RefundedBooking
+from .models import ReportAccount, VerificationRejection, AccountBan, AccountRole, Admin
+from . import moderation, revocation
+
+
+QUEUE_SOURCES = {
+    Dispute: 'dispute',
+    RefundedBooking: 'refund',
+    ReportAccount: 'report',
+    VerificationRejection: 'verification',
+}
+
+
+@receiver(post_save, sender=Dispute)
+@receiver(post_save, sender=RefundedBooking)
+@receiver(post_save, sender=ReportAccount)
+@receiver(post_save, sender=VerificationRejection)
+@receiver(post_delete, sender=Dispute)
+@receiver(post_delete, sender=RefundedBooking)
+@receiver(post_delete, sender=ReportAccount)
+@receiver(post_delete, sender=VerificationRejection)
+def moderation_source_changed(sender, instance, **kwargs):
+    """Queue, reopen or close the moderation item once the change commits"""
+    # Deleting clears instance.pk before on_commit runs, so capture it now
+    item_type, object_id = QUEUE_SOURCES[sender], instance.pk
+    transaction.on_commit(lambda: moderation.sync(item_type, [object_id]))
+
+
+@receiver(post_save, sender=AccountBan)
+def account_banned(sender, instance, created, **kwargs):
+    if created:
+        revocation.revoke([instance.acc_ban_id_id], 'ban')
+
+
+@receiver(post_delete, sender=AccountRole)
+def account_role_removed(sender, instance, **kwargs):
+    # Added roles only widen access and are picked up at the next login; removed ones must take effect now
+    revocation.revoke([instance.acc_id], 'role_removed')
+
+
+@receiver(post_save, sender=Admin)
+def admin_permissions_changed(sender, instance, created, **kwargs):
+    if not created:
+        revocation.revoke([instance.admin_id_id], 'permissions_changed')
@@ -0,0 +1,135 @@
+"""
+Head admin dashboard statistics.
+
+Each table's numbers come from a single conditional aggregation query
+(Count/Sum with filter=...), so a dashboard load costs one query per table.
+Results are cached for DASHBOARD_STATS_CACHE_SECONDS. Only one thread per
+cache recomputes at a time: the others keep serving the previous copy, or
+wait briefly for the recomputation when there is no copy yet.
+
+The copy and the lock live in the default cache. Without a shared CACHES
+backend that is per-process memory, so the single-flight is per process:
+each worker process computes its own copy, at most once per period.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum, Q, Exists, OuterRef
+
+from .models import Account, AccountBan, AccountRole, ReportAccount
+from bookings.models import Booking, Dispute, RefundedBooking
+from services.models import Service, ServiceCategory
+from shop.models import Shop
+from payment import rollups
+
+
+CACHE_KEY = 'head_admin_dashboard_stats'
+LOCK_KEY = 'head_admin_dashboard_stats_lock'
+LOCK_SECONDS = 30
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+
+# Stale copies outlive their freshness so waiting workers always have something to serve
+STALE_FACTOR = 10
+
+BOOKING_STATUSES = ('active', 'completed', 'cancelled', 'dispute', 'refunded')
+
+
+def _has_role(*roles):
+    return Exists(AccountRole.objects.filter(acc_id=OuterRef('acc_id'), account_role__in=roles))
+
+
+def _count(field, **filters):
+    return Count(field, filter=Q(**filters))
+
+
+def compute():
+    """Run the aggregation queries and return the dashboard payload"""
+    users = Account.objects.aggregate(
+        total=Count('acc_id'),
+        clients=Count('acc_id', filter=Q(_has_role('client'))),
+        mechanics=Count('acc_id', filter=Q(_has_role('mechanic'))),
+        shop_owners=Count('acc_id', filter=Q(_has_role('shop_owner'))),
+        admins=Count('acc_id', filter=Q(_has_role('admin', 'head_admin'))),
+        active=_count('acc_id', is_active=True),
+        banned=Count('acc_id', filter=Q(Exists(AccountBan.objects.filter(acc_ban_id=OuterRef('acc_id'))))),
+        unverified=_count('acc_id', is_verified=False),
+    )
+
+    bookings = Booking.objects.aggregate(
+        total=Count('booking_id'),
+        **{status: _count('booking_id', status=status) for status in BOOKING_STATUSES}
+    )
+
+    refunds = RefundedBooking.objects.aggregate(
+        pending=_count('refunded_booking_id', status='pending'),
+        pending_amount=Sum('refund_amount', filter=Q(status='pending')),
+    )
+
+    shops = Shop.objects.aggregate(
+        total=Count('shop_id'),
+        verified=_count('shop_id', is_verified=True),
+        unverified=_count('shop_id', is_verified=False),
+    )
+
+    pending_reports = ReportAccount.objects.filter(status='pending').count()
+    pending_disputes = Dispute.objects.filter(status='pending').count()
+
+    return {
+        'users': users,
+        'bookings': {
+            'total': bookings['total'],
+            'active': bookings['active'],
+            'completed': bookings['completed'],
+            'cancelled': bookings['cancelled'],
+            'disputed': bookings['dispute'],
+            'refunded': bookings['refunded']
+        },
+        'financial': {
+            'total_revenue': str(rollups.summarize()['revenue']),
+            'pending_refunds': refunds['pending'],
+            'refund_amount_pending': str(refunds['pending_amount'] or 0)
+        },
+        'shops': shops,
+        'services': {
+            'total_categories': ServiceCategory.objects.count(),
+            'total_services': Service.objects.count()
+        },
+        'moderation': {
+            'pending_reports': pending_reports,
+            'pending_disputes': pending_disputes,
+            'pending_refunds': refunds['pending']
+        }
+    }
+
+
+def _refresh(ttl):
+    try:
+        stats = compute()
+        cache.set(CACHE_KEY, {'stats': stats, 'fresh_until': time.time() + ttl}, ttl * STALE_FACTOR)
+        return stats
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def get_dashboard_stats():
+    """Return cached dashboard stats, recomputing them in at most one thread per cache at a time"""
+    ttl = getattr(settings, 'DASHBOARD_STATS_CACHE_SECONDS', 30)
+    cached = cache.get(CACHE_KEY)
+    if cached and cached['fresh_until'] > time.time():
+        return cached['stats']
+
+    if cache.add(LOCK_KEY, 1, LOCK_SECONDS):
+        return _refresh(ttl)
+    if cached:
+        # Another thread sharing this cache is already recomputing; the previous copy is good enough meanwhile
+        return cached['stats']
+
+    deadline = time.monotonic() + WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        cached = cache.get(CACHE_KEY)
+        if cached:
+            return cached['stats']
+    return compute()
@@ -1,3 +1,159 @@
-from django.test import TestCase
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from accounts import revocation
+from accounts.models import Account, AccountAddress, AccountBan, AccountRole, Admin, Mechanic, ShopOwner
+from accounts.permissions import admin_or_head_admin_required, admin_permission_required, head_admin_required
+from accounts.serializers import MyTokenObtainPairSerializer
+from services.models import Service, ShopService
+from shop.models import Shop, ShopMechanic
+
+
+class HeadAdminShopListTests(TestCase):
+    url = '/api/accounts/head-admin/shops/'
+
+    def create_shops(self, count):
+        start = Shop.objects.count()
+        for n in range(start, start + count):
+            owner = Account.objects.create(
+                firstname=f'Owner{n}', lastname='Test', email=f'owner{n}@example.com',
+                username=f'owner{n}', password='x'
+            )
+            AccountAddress.objects.create(acc_add_id=owner, city_municipality='Cebu City', province='Cebu')
+            shop = Shop.objects.create(shop_owner=ShopOwner.objects.create(shop_owner_id=owner), shop_name=f'Shop {n}')
+
+            mechanic = Account.objects.create(
+                firstname=f'Mechanic{n}', lastname='Test', email=f'mechanic{n}@example.com',
+                username=f'mechanic{n}', password='x'
+            )
+            ShopMechanic.objects.create(shop=shop, mechanic=Mechanic.objects.create(mechanic_id=mechanic))
+            for i in range(2):
+                ShopService.objects.create(shop=shop, service=Service.objects.create(name=f'Service {n}-{i}'))
+
+    def fetch(self, params=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url + params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_query_count_does_not_grow_with_shops(self):
+        self.create_shops(10)
+        data, small = self.fetch()
+        self.assertEqual(len(data['results']), 10)
+
+        self.create_shops(90)
+        data, large = self.fetch()
+        self.assertEqual(len(data['results']), 50)
+        self.assertEqual(small, large)
+
+        _, next_page = self.fetch(f"?cursor={data['next_cursor']}")
+        self.assertEqual(next_page, large)
+
+    def test_counts_are_annotated(self):
+        self.create_shops(3)
+        data, _ = self.fetch()
+        self.assertEqual(data['counts'], {'total': 3, 'verified': 0, 'active': 3, 'mechanics': 3})
+        for shop in data['results']:
+            self.assertEqual(shop['total_mechanics'], 1)
+            self.assertEqual(shop['total_services'], 2)
+            self.assertEqual(shop['city'], 'Cebu City, Cebu')
+
+    def test_pages_follow_cursor(self):
+        self.create_shops(5)
+        first, _ = self.fetch('?page_size=3')
+        second, _ = self.fetch(f"?page_size=3&cursor={first['next_cursor']}")
+        self.assertIsNone(second['next_cursor'])
+        names = [shop['shop_name'] for shop in first['results'] + second['results']]
+        self.assertEqual(names, [f'Shop {n}' for n in range(4, -1, -1)])
+
+
+class AdminTokenPermissionTests(TestCase):
+    """Admin checks run on the access token's claims (accounts.permissions, accounts.revocation)"""
+
+    def setUp(self):
+        # Revocations are cached per process; start every test from this test's (empty) table
+        revocation.reload()
+        self.factory = RequestFactory()
+        self.head_admin = self.create_account('head', AccountRole.ROLE_HEAD_ADMIN)
+        self.admin = self.create_account('admin', AccountRole.ROLE_ADMIN)
+        Admin.objects.create(admin_id=self.admin, permissions=['manage_users'])
+        self.client_account = self.create_account('client', AccountRole.ROLE_CLIENT)
+
+    def create_account(self, username, role):
+        account = Account.objects.create(
+            firstname=username.title(), lastname='Test', email=f'{username}@example.com',
+            username=username, password='x'
+        )
+        AccountRole.objects.create(acc=account, account_role=role)
+        return account
+
+    def tokens(self, account):
+        refresh = MyTokenObtainPairSerializer.get_token(account)
+        return str(refresh.access_token), str(refresh)
+
+    def call(self, decorator, access=None, data=None):
+        """Run a view behind decorator; returns (response, request.admin_id seen by the view)"""
+        seen = {}
+
+        def view(request):
+            seen['admin_id'] = request.admin_id
+            return HttpResponse('ok')
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {access}'} if access else {}
+        request = self.factory.post('/', data or {}, **headers)
+        return decorator(view)(request), seen.get('admin_id')
+
+    def test_missing_or_bad_token_is_unauthorized(self):
+        for decorator in (head_admin_required, admin_or_head_admin_required, admin_permission_required('manage_users')):
+            self.assertEqual(self.call(decorator)[0].status_code, 401)
+            self.assertEqual(self.call(decorator, 'not-a-token')[0].status_code, 401)
+            self.assertEqual(self.call(decorator, self.tokens(self.admin)[1])[0].status_code, 401)
+
+    def test_missing_role_or_permission_is_forbidden(self):
+        client_access, _ = self.tokens(self.client_account)
+        admin_access, _ = self.tokens(self.admin)
+        self.assertEqual(self.call(admin_or_head_admin_required, client_access)[0].status_code, 403)
+        self.assertEqual(self.call(head_admin_required, admin_access)[0].status_code, 403)
+        self.assertEqual(self.call(admin_permission_required('manage_tokens'), admin_access)[0].status_code, 403)
+        self.assertEqual(self.call(admin_permission_required('manage_users'), admin_access)[0].status_code, 200)
+
+    def test_head_admin_passes_every_check(self):
+        access, _ = self.tokens(self.head_admin)
+        decorators = [head_admin_required, admin_or_head_admin_required]
+        decorators += [admin_permission_required(name) for name, _ in Admin.PERMISSION_CHOICES]
+        for decorator in decorators:
+            self.assertEqual(self.call(decorator, access)[0].status_code, 200)
+
+    def test_admin_id_comes_from_token(self):
+        access, _ = self.tokens(self.admin)
+        response, admin_id = self.call(
+            admin_permission_required('manage_users'), access, {'admin_id': self.head_admin.acc_id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(admin_id, self.admin.acc_id)
+
+    def assert_revoked(self, account, revoke):
+        access, refresh = self.tokens(account)
+        self.assertEqual(self.call(admin_or_head_admin_required, access)[0].status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            revoke()
+        self.assertEqual(self.call(admin_or_head_admin_required, access)[0].status_code, 401)
+        response = self.client.post('/api/accounts/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, 401)
+
+    def test_ban_revokes_tokens(self):
+        self.assert_revoked(self.admin, lambda: AccountBan.objects.create(acc_ban_id=self.admin, reason_ban='test'))
+
+    def test_role_removal_revokes_tokens(self):
+        self.assert_revoked(
+            self.admin, lambda: AccountRole.objects.filter(acc=self.admin, account_role=AccountRole.ROLE_ADMIN).delete()
+        )
+
+    def test_deactivation_revokes_tokens(self):
+        head_access, _ = self.tokens(self.head_admin)
+        self.assert_revoked(self.admin, lambda: self.client.post(
+            f'/api/accounts/head-admin/admin-accounts/{self.admin.acc_id}/toggle-active/',
+            {'is_active': False}, content_type='application/json', HTTP_AUTHORIZATION=f'Bearer {head_access}'
+        ))
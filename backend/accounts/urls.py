@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     authentication, dashboard, users, verifications, shops, 
-    tokens, disputes, reports, financial, account_management
+    tokens, disputes, reports, moderation, financial, account_management, exports, audit_log, bulk
 )
 from rest_framework_simplejwt.views import TokenRefreshView
 
@@ -60,6 +60,7 @@ urlpatterns = [
     path('head-admin/verifications/', verifications.get_verifications, name='get_verifications'),
     path('head-admin/verify-user/', verifications.verify_user_verification, name='verify_user_verification'),
     path('head-admin/reject-verification/', verifications.reject_verification, name='reject_verification'),
+    path('head-admin/verification-documents/<str:grant>/', verifications.verification_document, name='verification_document'),
     
     # Head Admin Mechanic Approval Management
     path('head-admin/mechanics/pending/', verifications.get_pending_mechanics, name='get_pending_mechanics'),
@@ -74,6 +75,8 @@ urlpatterns = [
 
     # Head Admin Token Management
     path('head-admin/token-purchases/', tokens.get_token_purchases, name='get_token_purchases'),
+    path('head-admin/token-sales/', tokens.get_token_sales, name='get_token_sales'),
+    path('head-admin/token-wallets/<int:acc_id>/', tokens.token_wallet, name='token_wallet'),
     
     # Head Admin Dispute Management
     path('head-admin/disputes/', disputes.get_disputes, name='get_disputes'),
@@ -83,16 +86,34 @@ urlpatterns = [
     path('head-admin/reports/', reports.get_reports, name='get_reports'),
     path('head-admin/review-report/', reports.review_report, name='review_report'),
     path('head-admin/dismiss-report/', reports.dismiss_report, name='dismiss_report'),
+
+    # Head Admin Moderation Queue
+    path('head-admin/moderation/queue/', moderation.get_moderation_queue, name='get_moderation_queue'),
+    path('head-admin/moderation/claim/', moderation.claim_moderation_items, name='claim_moderation_items'),
+    path('head-admin/moderation/renew/', moderation.renew_moderation_items, name='renew_moderation_items'),
+    path('head-admin/moderation/release/', moderation.release_moderation_items, name='release_moderation_items'),
     
     # Head Admin Financial Management
     path('head-admin/financial/stats/', financial.get_financial_stats, name='get_financial_stats'),
     path('head-admin/financial/transactions/', financial.get_financial_transactions, name='get_financial_transactions'),
+    path('head-admin/financial/ledger/', financial.get_financial_ledger, name='get_financial_ledger'),
     path('head-admin/commission/settings/', financial.commission_settings, name='commission_settings'),
+    path('head-admin/export/<str:dataset>/', exports.export_dataset, name='export_dataset'),
 
     # Head Admin Account Management
     path('head-admin/admin-accounts/', account_management.manage_admin_accounts, name='manage_admin_accounts'),
     path('head-admin/admin-accounts/<int:admin_id>/', account_management.manage_admin_accounts, name='manage_admin_accounts_detail'),
     path('head-admin/admin-accounts/<int:admin_id>/toggle-active/', account_management.toggle_admin_active, name='toggle_admin_active'),
+
+    # Head Admin Audit Log
+    path('head-admin/audit-log/', audit_log.get_audit_log, name='get_audit_log'),
+
+    # Head Admin Bulk Actions
+    path('head-admin/bulk/ban-users/', bulk.bulk_ban_users, name='bulk_ban_users'),
+    path('head-admin/bulk/unban-users/', bulk.bulk_unban_users, name='bulk_unban_users'),
+    path('head-admin/bulk/verify-shops/', bulk.bulk_verify_shops, name='bulk_verify_shops'),
+    path('head-admin/bulk/approve-mechanics/', bulk.bulk_approve_mechanics, name='bulk_approve_mechanics'),
+    path('head-admin/bulk/reject-verifications/', bulk.bulk_reject_verifications, name='bulk_reject_verifications'),
     
     # Head Admin Token Pricing
     path('head-admin/token-pricing/', tokens.manage_token_pricing, name='manage_token_pricing'),
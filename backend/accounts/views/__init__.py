@@ -10,13 +10,21 @@ from .users import (
     get_client_address
 )
 from .dashboard import head_admin_dashboard_stats, health_check
-from .verifications import get_verifications, verify_user_verification, reject_verification
+from .verifications import get_verifications, verify_user_verification, reject_verification, verification_document
 from .shops import get_shops, verify_shop, deactivate_shop, activate_shop
-from .tokens import get_token_purchases, manage_token_pricing
+from .tokens import get_token_purchases, get_token_sales, manage_token_pricing, token_wallet
 from .disputes import get_disputes, resolve_dispute
 from .reports import get_reports, review_report, dismiss_report
-from .financial import get_financial_stats, get_financial_transactions, commission_settings
+from .moderation import (
+    get_moderation_queue, claim_moderation_items, renew_moderation_items, release_moderation_items
+)
+from .financial import get_financial_stats, get_financial_transactions, get_financial_ledger, commission_settings
 from .account_management import manage_admin_accounts, toggle_admin_active
+from .exports import export_dataset
+from .audit_log import get_audit_log
+from .bulk import (
+    bulk_ban_users, bulk_unban_users, bulk_verify_shops, bulk_approve_mechanics, bulk_reject_verifications
+)
 
 __all__ = [
     # Authentication
@@ -30,17 +38,25 @@ __all__ = [
     # Dashboard
     'head_admin_dashboard_stats', 'health_check',
     # Verifications
-    'get_verifications', 'verify_user_verification', 'reject_verification',
+    'get_verifications', 'verify_user_verification', 'reject_verification', 'verification_document',
     # Shops
     'get_shops', 'verify_shop', 'deactivate_shop', 'activate_shop',
     # Tokens
-    'get_token_purchases', 'manage_token_pricing',
+    'get_token_purchases', 'get_token_sales', 'manage_token_pricing', 'token_wallet',
     # Disputes
     'get_disputes', 'resolve_dispute',
     # Reports
     'get_reports', 'review_report', 'dismiss_report',
+    # Moderation Queue
+    'get_moderation_queue', 'claim_moderation_items', 'renew_moderation_items', 'release_moderation_items',
     # Financial
-    'get_financial_stats', 'get_financial_transactions', 'commission_settings',
+    'get_financial_stats', 'get_financial_transactions', 'get_financial_ledger', 'commission_settings',
     # Account Management
     'manage_admin_accounts', 'toggle_admin_active',
+    # Exports
+    'export_dataset',
+    # Audit Log
+    'get_audit_log',
+    # Bulk Actions
+    'bulk_ban_users', 'bulk_unban_users', 'bulk_verify_shops', 'bulk_approve_mechanics', 'bulk_reject_verifications',
 ]
@@ -6,45 +6,53 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from ..models import Account, AccountRole, Admin
+from ..listing import AdminListing
+from ..pagination import InvalidCursor, get_page_params
+from ..permissions import head_admin_required
+from .. import audit, revocation
+
+
+def _admin_account_row(row):
+    return {
+        'id': row['acc_id'],
+        'username': row['username'],
+        'email': row['email'],
+        'first_name': row['firstname'],
+        'last_name': row['lastname'],
+        'is_active': row['is_active'],
+        'created_at': row['created_at'].isoformat(),
+        'created_by': row['admin_profile__created_by_admin__username'],
+        'permissions': row['admin_profile__permissions'] or []
+    }
+
+
+ADMIN_ACCOUNT_LISTING = AdminListing(
+    columns=[
+        'acc_id', 'username', 'email', 'firstname', 'lastname', 'is_active', 'created_at',
+        'admin_profile__created_by_admin__username', 'admin_profile__permissions',
+    ],
+    ordering=('-created_at', '-acc_id'),
+    serialize=_admin_account_row,
+)
 
 
 @api_view(['GET', 'POST', 'PUT', 'DELETE'])
 @permission_classes([AllowAny])
+@head_admin_required
 def manage_admin_accounts(request, admin_id=None):
     """
     Manage admin accounts - CRUD operations
+    GET query params: cursor, page_size
     """
     try:
         if request.method == 'GET':
-            # Get all admin accounts
-            admins = Account.objects.filter(
-                roles__account_role='admin'
-            ).prefetch_related('roles').order_by('-created_at')
-            
-            admin_data = []
-            for admin in admins:
-                # Get admin profile
-                try:
-                    admin_profile = Admin.objects.get(admin_id=admin.acc_id)
-                    created_by_name = None
-                    if admin_profile.created_by_admin:
-                        created_by_name = admin_profile.created_by_admin.username
-                    
-                    admin_data.append({
-                        'id': admin.acc_id,
-                        'username': admin.username,
-                        'email': admin.email,
-                        'first_name': admin.firstname,
-                        'last_name': admin.lastname,
-                        'is_active': admin.is_active,
-                        'created_at': admin.created_at.isoformat(),
-                        'created_by': created_by_name,
-                        'permissions': admin_profile.permissions if admin_profile.permissions else []
-                    })
-                except Admin.DoesNotExist:
-                    continue
-            
-            return Response(admin_data, status=status.HTTP_200_OK)
+            try:
+                cursor_values, page_size = get_page_params(request)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            admins = Account.objects.filter(roles__account_role='admin', admin_profile__isnull=False)
+            return ADMIN_ACCOUNT_LISTING.response(admins, cursor_values, page_size)
         
         elif request.method == 'POST':
             # Create new admin account
@@ -134,6 +142,8 @@ def manage_admin_accounts(request, admin_id=None):
                 admin_account.password = make_password(request.data['password'])
             
             admin_account.save()
+            if not admin_account.is_active:
+                revocation.revoke([admin_account.acc_id], 'deactivated')
             
             # Update admin profile permissions
             if 'permissions' in request.data:
@@ -162,6 +172,8 @@ def manage_admin_accounts(request, admin_id=None):
                 'message': 'Admin account deleted successfully'
             }, status=status.HTTP_200_OK)
     
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to manage admin accounts',
@@ -171,6 +183,7 @@ def manage_admin_accounts(request, admin_id=None):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@head_admin_required
 def toggle_admin_active(request, admin_id):
     """
     Toggle admin account active status
@@ -179,8 +192,13 @@ def toggle_admin_active(request, admin_id):
         admin_account = get_object_or_404(Account, acc_id=admin_id)
         is_active = request.data.get('is_active')
         
+        before = audit.snapshot(admin_account, ['is_active'])
         admin_account.is_active = is_active
         admin_account.save()
+        if not is_active:
+            revocation.revoke([admin_account.acc_id], 'deactivated')
+        # admin_id in the URL is the target; the acting head admin comes from the access token
+        audit.record(request.admin_id, 'toggle_admin_active', admin_account, before, {'is_active': is_active}, request=request)
         
         return Response({
             'message': 'Admin status updated successfully'
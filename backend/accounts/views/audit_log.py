@@ -0,0 +1,88 @@
+from datetime import datetime, time, timedelta
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+from django.utils import timezone
+
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import head_admin_required
+from .. import audit
+
+
+# Longest window one query may cover; investigations page through wider ranges window by window
+AUDIT_LOG_MAX_DAYS = 31
+
+
+def _parse_day(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@head_admin_required
+def get_audit_log(request):
+    """
+    Get a page of admin audit entries, newest first
+    Query params: from, to (YYYY-MM-DD, required, at most 31 days apart),
+                  actor_id, action, target_type (e.g. accounts.account), target_id,
+                  cursor, page_size
+    """
+    try:
+        if not request.GET.get('from') or not request.GET.get('to'):
+            return Response({'error': 'from and to are required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start_day = _parse_day(request.GET['from'])
+            end_day = _parse_day(request.GET['to'])
+        except ValueError:
+            return Response({'error': 'Dates must use YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+        if end_day < start_day or (end_day - start_day).days >= AUDIT_LOG_MAX_DAYS:
+            return Response({
+                'error': f'to must be on or after from and at most {AUDIT_LOG_MAX_DAYS} days apart'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = audit.search(
+            timezone.make_aware(datetime.combine(start_day, time.min)),
+            timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min)),
+            actor_id=request.GET.get('actor_id'),
+            action=request.GET.get('action'),
+            target_type=request.GET.get('target_type'),
+            target_id=request.GET.get('target_id'),
+        )
+
+        rows, next_cursor = paginate(entries.values(
+            'log_id', 'occurred_at', 'actor_id', 'actor__username', 'action',
+            'target_type', 'target_id', 'before', 'after', 'request_path', 'ip_address'
+        ), ('-occurred_at', '-log_id'), cursor_values, page_size)
+
+        entries_data = [{
+            'id': row['log_id'],
+            'occurred_at': row['occurred_at'].isoformat(),
+            'actor_id': row['actor_id'],
+            'actor_username': row['actor__username'],
+            'action': row['action'],
+            'target_type': row['target_type'],
+            'target_id': row['target_id'],
+            'before': row['before'],
+            'after': row['after'],
+            'request_path': row['request_path'],
+            'ip_address': row['ip_address']
+        } for row in rows]
+
+        return Response({
+            'results': entries_data,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': 'Failed to fetch audit log',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,113 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+
+from ..permissions import admin_permission_required
+from .. import bulk
+
+
+def _bulk_ids(request):
+    """
+    Read the ids list from the body, dropping duplicates.
+    Raises ValueError describing what is missing or malformed.
+    """
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('A non-empty ids list is required')
+    if len(ids) > bulk.MAX_BULK_IDS:
+        raise ValueError(f'At most {bulk.MAX_BULK_IDS} ids per request')
+    try:
+        return list(dict.fromkeys(int(object_id) for object_id in ids))
+    except (TypeError, ValueError):
+        raise ValueError('ids must be numbers')
+
+
+def _bulk_response(results):
+    failed = sum(1 for error in results.values() if error)
+    return Response({
+        'results': [
+            {'id': object_id, 'success': error is None, **({'error': error} if error else {})}
+            for object_id, error in results.items()
+        ],
+        'succeeded': len(results) - failed,
+        'failed': failed
+    }, status=status.HTTP_200_OK)
+
+
+def _run_bulk(request, action, failure_message, **options):
+    """Run a bulk action as the access token's admin (set by the permission decorators)"""
+    try:
+        try:
+            ids = _bulk_ids(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return _bulk_response(action(request.admin_id, ids, request=request, **options))
+
+    except Exception as e:
+        return Response({
+            'error': failure_message,
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_users')
+def bulk_ban_users(request):
+    """
+    Ban many user accounts at once
+    Body: ids (account ids, at most 500), reason (optional)
+    """
+    return _run_bulk(
+        request, bulk.ban_users, 'Failed to ban users',
+        reason=request.data.get('reason') or 'Banned by head admin'
+    )
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_users')
+def bulk_unban_users(request):
+    """
+    Unban many user accounts at once
+    Body: ids (account ids, at most 500)
+    """
+    return _run_bulk(request, bulk.unban_users, 'Failed to unban users')
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_shops')
+def bulk_verify_shops(request):
+    """
+    Verify many shops at once
+    Body: ids (shop ids, at most 500)
+    """
+    return _run_bulk(request, bulk.verify_shops, 'Failed to verify shops')
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
+def bulk_approve_mechanics(request):
+    """
+    Approve many mechanic applications at once and assign the mechanic role
+    Body: ids (mechanic account ids, at most 500)
+    """
+    return _run_bulk(request, bulk.approve_mechanics, 'Failed to approve mechanics')
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
+def bulk_reject_verifications(request):
+    """
+    Reject many verification requests at once
+    Body: ids (account ids, at most 500), reason (optional)
+    """
+    return _run_bulk(
+        request, bulk.reject_verifications, 'Failed to reject verifications',
+        reason=request.data.get('reason') or 'Verification requirements not met'
+    )
@@ -6,54 +6,76 @@ from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
 from ..models import Notification
+from ..listing import AdminListing
+from ..pagination import InvalidCursor, get_page_params
+from ..permissions import admin_permission_required
+from .. import audit
 from bookings.models import Dispute, Booking
 
 
+def _dispute_row(row):
+    client_id = row['booking__request__client_id']
+    provider_id = row['booking__request__provider_id']
+    return {
+        'id': row['dispute_id'],
+        'booking_id': row['booking_id'],
+        'client_id': client_id,
+        'client_name': (
+            f"{row['booking__request__client__client_id__firstname']} {row['booking__request__client__client_id__lastname']}"
+            if client_id else "Unknown"
+        ),
+        'client_email': row['booking__request__client__client_id__email'] if client_id else "",
+        'mechanic_id': provider_id,
+        'mechanic_name': (
+            f"{row['booking__request__provider__firstname']} {row['booking__request__provider__lastname']}"
+            if provider_id else "Unknown"
+        ),
+        'mechanic_email': row['booking__request__provider__email'] if provider_id else "",
+        'reason': row['issue_description'] or 'No reason provided',
+        'description': row['issue_description'] or 'No description available',
+        'filed_at': row['created_at'].isoformat(),
+        'status': row['status'],
+        'resolved_at': row['resolved_at'].isoformat() if row['resolved_at'] else None,
+        'resolution_notes': row['resolution_notes']
+    }
+
+
+DISPUTE_LISTING = AdminListing(
+    columns=[
+        'dispute_id', 'booking_id',
+        'booking__request__client_id', 'booking__request__client__client_id__firstname',
+        'booking__request__client__client_id__lastname', 'booking__request__client__client_id__email',
+        'booking__request__provider_id', 'booking__request__provider__firstname',
+        'booking__request__provider__lastname', 'booking__request__provider__email',
+        'issue_description', 'created_at', 'status', 'resolved_at', 'resolution_notes',
+    ],
+    ordering=('-created_at', '-dispute_id'),
+    serialize=_dispute_row,
+)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_disputes(request):
     """
-    Get all disputes for head admin
+    Get a page of disputes for head admin, newest first
+    Query params: status, cursor, page_size
     """
     try:
-        from requests.models import Request
-        
-        disputes = Dispute.objects.all().select_related(
-            'booking__request__client__client_id',
-            'booking__request__provider',
-            'complainer',
-            'complaint_against'
-        ).order_by('-created_at')
-        
-        disputes_data = []
-        for dispute in disputes:
-            booking = dispute.booking
-            request_obj = booking.request
-            
-            # Get client from request
-            client_account = request_obj.client.client_id if request_obj and request_obj.client else None
-            # Get provider (mechanic) from request
-            provider_account = request_obj.provider if request_obj else None
-            
-            disputes_data.append({
-                'id': dispute.dispute_id,
-                'booking_id': booking.booking_id,
-                'client_id': client_account.acc_id if client_account else None,
-                'client_name': f"{client_account.firstname} {client_account.lastname}" if client_account else "Unknown",
-                'client_email': client_account.email if client_account else "",
-                'mechanic_id': provider_account.acc_id if provider_account else None,
-                'mechanic_name': f"{provider_account.firstname} {provider_account.lastname}" if provider_account else "Unknown",
-                'mechanic_email': provider_account.email if provider_account else "",
-                'reason': dispute.issue_description or 'No reason provided',
-                'description': dispute.issue_description or 'No description available',
-                'filed_at': dispute.created_at.isoformat(),
-                'status': dispute.status,
-                'resolved_at': dispute.resolved_at.isoformat() if dispute.resolved_at else None,
-                'resolution_notes': dispute.resolution_notes
-            })
-        
-        return Response(disputes_data, status=status.HTTP_200_OK)
-    
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        disputes = Dispute.objects.all()
+        status_filter = request.GET.get('status')
+        if status_filter:
+            disputes = disputes.filter(status=status_filter)
+
+        return DISPUTE_LISTING.response(disputes, cursor_values, page_size)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch disputes',
@@ -63,28 +85,32 @@ def get_disputes(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_disputes')
 def resolve_dispute(request):
     """
     Resolve a dispute
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         dispute_id = request.data.get('dispute_id')
         resolution = request.data.get('resolution', 'resolved')
         resolution_notes = request.data.get('resolution_notes', '')
         
-        if not admin_id or not dispute_id:
+        if not dispute_id:
             return Response({
-                'error': 'admin_id and dispute_id are required'
+                'error': 'dispute_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         dispute = get_object_or_404(Dispute, dispute_id=dispute_id)
         
         # Update dispute
+        audited_fields = ['status', 'resolution_notes', 'resolved_at']
+        before = audit.snapshot(dispute, audited_fields)
         dispute.status = resolution
         dispute.resolution_notes = resolution_notes
         dispute.resolved_at = timezone.now()
         dispute.save()
+        audit.record(admin_id, 'resolve_dispute', dispute, before, audit.snapshot(dispute, audited_fields), request=request)
         
         # Notify both parties
         booking = dispute.booking
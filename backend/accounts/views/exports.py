@@ -0,0 +1,123 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from bookings.models import Booking
+from payment.models import BookingPayment, Transaction
+from ..permissions import head_admin_required
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+# dataset name -> (model, date field used for ?from/?to, exported columns)
+EXPORT_DATASETS = {
+    'bookings': (Booking, 'booked_at', [
+        'booking_id', 'request_id', 'request__request_type', 'request__client_id',
+        'request__provider_id', 'status', 'amount_fee', 'booked_at', 'completed_at',
+    ]),
+    'payments': (BookingPayment, 'created_at', [
+        'payment_id', 'booking_id', 'payment_type', 'payment_status', 'payment_method',
+        'total_amount', 'amount_paid', 'remaining_balance', 'reference_number',
+        'paid_by_id', 'payment_date', 'created_at',
+    ]),
+    'transactions': (Transaction, 'transaction_date', [
+        'transaction_id', 'booking_id', 'provider_id', 'client_id', 'total_amount',
+        'commission_tier', 'commission_rate', 'commission_amount', 'provider_payout',
+        'payment_method', 'status', 'payout_status', 'payout_date', 'transaction_date',
+    ]),
+}
+
+EXPORT_OUTPUTS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose write() hands back the value for streaming"""
+    def write(self, value):
+        return value
+
+
+def _parse_day(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def _csv_rows(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            '' if value is None else value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row
+        )
+
+
+def _ndjson_rows(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@head_admin_required
+def export_dataset(request, dataset):
+    """
+    Stream bookings, payments or transactions as CSV or NDJSON for head admin
+    Query params: output=csv|ndjson, from=YYYY-MM-DD, to=YYYY-MM-DD, status
+    """
+    try:
+        if dataset not in EXPORT_DATASETS:
+            return Response({
+                'error': f'Unknown dataset. Choose one of: {", ".join(EXPORT_DATASETS)}'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        output = request.GET.get('output', 'csv')
+        if output not in EXPORT_OUTPUTS:
+            return Response({'error': 'output must be csv or ndjson'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start_day = _parse_day(request.GET.get('from'))
+            end_day = _parse_day(request.GET.get('to'))
+        except ValueError:
+            return Response({'error': 'Dates must use YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        model, date_field, columns = EXPORT_DATASETS[dataset]
+        queryset = model.objects.all()
+
+        # Whole-day bounds keep the filter a plain range scan on the date column
+        if start_day:
+            start = timezone.make_aware(datetime.combine(start_day, time.min))
+            queryset = queryset.filter(**{f'{date_field}__gte': start})
+        if end_day:
+            end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min))
+            queryset = queryset.filter(**{f'{date_field}__lt': end})
+
+        status_filter = request.GET.get('status')
+        if status_filter:
+            status_field = 'payment_status' if dataset == 'payments' else 'status'
+            queryset = queryset.filter(**{status_field: status_filter})
+
+        rows = queryset.order_by(model._meta.pk.name).values_list(*columns).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+        content = _csv_rows(columns, rows) if output == 'csv' else _ndjson_rows(columns, rows)
+
+        filename = '_'.join(filter(None, [dataset, str(start_day or ''), str(end_day or '')]))
+        response = StreamingHttpResponse(content, content_type=EXPORT_OUTPUTS[output])
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+        return response
+
+    except Exception as e:
+        return Response({
+            'error': 'Failed to export data',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
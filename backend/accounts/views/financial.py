@@ -2,65 +2,74 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Sum, Q
+from django.db.models import Sum, Count, Q
 from django.shortcuts import get_object_or_404
+from datetime import datetime, time, timedelta
+from django.utils import timezone
 
-from bookings.models import Booking, RefundedBooking
-from payment.models import CommissionSettings
+from bookings.models import Booking
+from payment.models import CommissionSettings, Transaction
+from payment import commission, recalculation, rollups
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import head_admin_required
+from .. import audit
+
+
+# Ledger columns returned per row; amounts are serialized as exact decimal strings
+LEDGER_FIELDS = [
+    'transaction_id', 'booking_id', 'provider_id', 'client_id',
+    'provider__firstname', 'provider__lastname', 'provider__email',
+    'client__firstname', 'client__lastname',
+    'booking__request__request_type', 'booking__request__direct_request__service__name',
+    'total_amount', 'commission_tier', 'commission_rate', 'commission_amount', 'provider_payout',
+    'payment_method', 'status', 'payout_status', 'payout_date', 'transaction_date',
+]
+LEDGER_ORDERING = ('-transaction_date', '-transaction_id')
 
 
 def get_commission_rate():
     """
-    Get the current commission rate from database
-    Returns default 15% if not set
+    Get the current default commission rate from the cached commission settings
     """
-    try:
-        commission_setting = CommissionSettings.objects.first()
-        if commission_setting:
-            return float(commission_setting.rate)
-        return 15.0  # Default fallback
-    except Exception:
-        return 15.0  # Default fallback
+    return float(commission.get_rate('default'))
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_financial_stats(request):
     """
-    Get financial statistics for head admin
+    Get financial statistics for head admin from the daily rollups
+    Optional query params: from=YYYY-MM-DD, to=YYYY-MM-DD, provider_type=mechanic|shop
     """
     try:
-        # Calculate total revenue from completed bookings
-        completed_bookings = Booking.objects.filter(status='completed')
-        total_revenue = completed_bookings.aggregate(total=Sum('amount_fee'))['total'] or 0
+        try:
+            start_day = request.GET.get('from')
+            end_day = request.GET.get('to')
+            start_day = datetime.strptime(start_day, '%Y-%m-%d').date() if start_day else None
+            end_day = datetime.strptime(end_day, '%Y-%m-%d').date() if end_day else None
+        except ValueError:
+            return Response({'error': 'Dates must use YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        totals = rollups.summarize(start_day, end_day, request.GET.get('provider_type'))
         
         # Get commission rate from database
         commission_rate = get_commission_rate()
-        total_commission = float(total_revenue) * (commission_rate / 100)
-        platform_earnings = total_commission
         
-        # Pending payouts (completed but not paid out to mechanics)
-        pending_payouts = completed_bookings.filter(
-            Q(payout_status='pending') | Q(payout_status__isnull=True)
-        ).count()
-        pending_payout_amount = completed_bookings.filter(
-            Q(payout_status='pending') | Q(payout_status__isnull=True)
-        ).aggregate(total=Sum('amount_fee'))['total'] or 0
-        
-        # Refunded amount
-        refunded_amount = RefundedBooking.objects.filter(
-            status='approved'
-        ).aggregate(total=Sum('refund_amount'))['total'] or 0
+        # Pending payouts (completed ledger transactions not yet paid out to providers)
+        pending = Transaction.objects.filter(status='completed', payout_status='pending').aggregate(
+            count=Count('transaction_id'), total=Sum('provider_payout')
+        )
         
         return Response({
-            'total_revenue': str(total_revenue),
-            'total_commission': str(total_commission),
+            'total_revenue': str(totals['revenue']),
+            'total_commission': str(totals['commission']),
             'commission_rate': commission_rate,
-            'pending_payouts': pending_payouts,
-            'pending_payout_amount': str(pending_payout_amount),
-            'completed_bookings': completed_bookings.count(),
-            'refunded_amount': str(refunded_amount),
-            'platform_earnings': str(platform_earnings)
+            'pending_payouts': pending['count'],
+            'pending_payout_amount': str(pending['total'] or 0),
+            'completed_bookings': totals['booking_count'],
+            'refunded_amount': str(totals['refunds']),
+            'paid_out_amount': str(totals['payouts']),
+            'platform_earnings': str(totals['commission'])
         }, status=status.HTTP_200_OK)
     
     except Exception as e:
@@ -80,8 +89,9 @@ def get_financial_transactions(request):
         from requests.models import Request
         
         bookings = Booking.objects.select_related(
-            'request__client__client_profile',
-            'request__provider'
+            'request__client__client_id',
+            'request__provider',
+            'request__direct_request__service'
         ).filter(status__in=['completed', 'refunded']).order_by('-completed_at')
         
         # Get commission rate from database
@@ -106,7 +116,7 @@ def get_financial_transactions(request):
             # Get service name based on request type
             service_name = "N/A"
             if hasattr(booking.request, 'direct_request') and booking.request.direct_request:
-                service_name = booking.request.direct_request.service.service_name
+                service_name = booking.request.direct_request.service.name
             elif hasattr(booking.request, 'custom_request'):
                 service_name = "Custom Request"
             elif hasattr(booking.request, 'emergency_request'):
@@ -136,11 +146,117 @@ def get_financial_transactions(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _ledger_row(row):
+    service_name = row['booking__request__direct_request__service__name']
+    if not service_name:
+        request_type = row['booking__request__request_type']
+        service_name = f"{request_type.title()} Request" if request_type else "N/A"
+    return {
+        'id': row['transaction_id'],
+        'transaction_id': row['transaction_id'],
+        'booking_id': row['booking_id'],
+        'provider_id': row['provider_id'],
+        'mechanic_name': f"{row['provider__firstname']} {row['provider__lastname']}" if row['provider_id'] else "N/A",
+        'mechanic_email': row['provider__email'] or "N/A",
+        'client_id': row['client_id'],
+        'client_name': f"{row['client__firstname']} {row['client__lastname']}" if row['client_id'] else "N/A",
+        'service_name': service_name,
+        'amount': str(row['total_amount']),
+        'commission_tier': row['commission_tier'],
+        'commission_rate': str(row['commission_rate']),
+        'commission_amount': str(row['commission_amount']),
+        'provider_payout': str(row['provider_payout']),
+        'payment_method': row['payment_method'],
+        'status': row['status'],
+        'payout_status': row['payout_status'],
+        'payout_date': row['payout_date'].isoformat() if row['payout_date'] else None,
+        'transaction_date': row['transaction_date'].isoformat(),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_financial_ledger(request):
+    """
+    Get a page of ledger transactions for head admin, newest first
+    Query params: status, provider_id, from=YYYY-MM-DD, to=YYYY-MM-DD, cursor, page_size
+    """
+    try:
+        try:
+            cursor_values, page_size = get_page_params(request)
+            start_day = request.GET.get('from')
+            end_day = request.GET.get('to')
+            start_day = datetime.strptime(start_day, '%Y-%m-%d').date() if start_day else None
+            end_day = datetime.strptime(end_day, '%Y-%m-%d').date() if end_day else None
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        provider_id = request.GET.get('provider_id')
+        if provider_id:
+            try:
+                provider_id = int(provider_id)
+            except ValueError:
+                return Response({'error': 'provider_id must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        transactions = Transaction.objects.all()
+
+        # Filters line up with the (status, transaction_date) and (provider, transaction_date) indexes
+        status_filter = request.GET.get('status')
+        if status_filter:
+            transactions = transactions.filter(status=status_filter)
+        if provider_id:
+            transactions = transactions.filter(provider_id=provider_id)
+        if start_day:
+            transactions = transactions.filter(
+                transaction_date__gte=timezone.make_aware(datetime.combine(start_day, time.min))
+            )
+        if end_day:
+            transactions = transactions.filter(
+                transaction_date__lt=timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min))
+            )
+
+        rows, next_cursor = paginate(
+            transactions.values(*LEDGER_FIELDS), LEDGER_ORDERING, cursor_values, page_size
+        )
+
+        return Response({
+            'results': [_ledger_row(row) for row in rows],
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': 'Failed to fetch ledger',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _recalculation_summary(summary):
+    return {
+        'tier': summary['tier'],
+        'rate': str(summary['rate']),
+        'transactions': summary['transactions'],
+        'commission_before': str(summary['commission_before']),
+        'commission_after': str(summary['commission_after']),
+        'commission_delta': str(summary['commission_delta']),
+        'sample': [{
+            'transaction_id': row['transaction_id'],
+            'total_amount': str(row['total_amount']),
+            'commission_rate': str(row['commission_rate']),
+            'commission_amount': str(row['commission_amount']),
+            'new_commission_amount': str(row['new_commission']),
+        } for row in summary['sample']]
+    }
+
+
 @api_view(['GET', 'PUT'])
 @permission_classes([AllowAny])
+@head_admin_required
 def commission_settings(request):
     """
     Get or update commission settings
+    PUT re-splits pending transactions of changed tiers; with dry_run it only returns the diff
     """
     try:
         if request.method == 'GET':
@@ -173,6 +289,7 @@ def commission_settings(request):
             commission_setting = CommissionSettings.objects.first()
             if not commission_setting:
                 commission_setting = CommissionSettings.objects.create()
+            previous_rates = commission.rates_for(commission_setting)
             
             # Update fields if provided
             if 'default_commission_rate' in request.data:
@@ -220,10 +337,26 @@ def commission_settings(request):
                 except ValueError:
                     return Response({'error': 'Invalid shop commission rate format'}, status=status.HTTP_400_BAD_REQUEST)
             
+            # Pending transactions of every tier whose rate changed are re-split at the new rate
+            new_rates = commission.rates_for(commission_setting)
+            changed_tiers = [tier for tier in new_rates if new_rates[tier] != previous_rates[tier]]
+            if request.data.get('dry_run') in (True, 'true', '1', 1):
+                summaries = recalculation.recalculate(new_rates, changed_tiers, dry_run=True) if changed_tiers else []
+                return Response({
+                    'dry_run': True,
+                    'recalculation': [_recalculation_summary(summary) for summary in summaries]
+                }, status=status.HTTP_200_OK)
+
             commission_setting.save()
+            summaries = recalculation.recalculate(new_rates, changed_tiers) if changed_tiers else []
+            audit.record(
+                request.admin_id, 'update_commission_settings',
+                commission_setting, previous_rates, new_rates, request=request
+            )
             
             return Response({
                 'message': 'Commission settings updated successfully',
+                'recalculation': [_recalculation_summary(summary) for summary in summaries],
                 'default_commission_rate': float(commission_setting.default_commission_rate),
                 'mechanic_bronze_rate': float(commission_setting.mechanic_bronze_rate),
                 'mechanic_silver_rate': float(commission_setting.mechanic_silver_rate),
@@ -0,0 +1,186 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework import status
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import ModerationItem
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import admin_or_head_admin_required
+from .. import moderation
+
+
+def _serialize_items(items):
+    summaries = moderation.summaries(items)
+    return [{
+        'id': item.item_id,
+        'item_type': item.item_type,
+        'object_id': item.object_id,
+        'priority': item.priority,
+        'status': item.status,
+        'submitted_at': item.submitted_at.isoformat(),
+        'claimed_by': item.claimed_by_id,
+        'lease_expires_at': item.lease_expires_at.isoformat() if item.lease_expires_at else None,
+        'summary': summaries.get((item.item_type, item.object_id))
+    } for item in items]
+
+
+def _item_types(value):
+    """Parse a comma separated ?types / types value; raises ValueError for unknown types"""
+    if not value:
+        return None
+    item_types = value if isinstance(value, list) else value.split(',')
+    unknown = set(item_types) - set(moderation.SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown item types: {', '.join(sorted(unknown))}")
+    return item_types
+
+
+def _item_ids(request):
+    item_ids = request.data.get('item_ids')
+    if not isinstance(item_ids, list) or not item_ids:
+        return None
+    return item_ids
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_moderation_queue(request):
+    """
+    Get a page of the open moderation queue in the order items are claimed
+    Query params: types (comma separated dispute/refund/report/verification),
+                  claimed (true: only items under a live lease, false: only available items),
+                  admin_id (with claimed=true, only that admin's items), cursor, page_size
+    """
+    try:
+        try:
+            cursor_values, page_size = get_page_params(request)
+            item_types = _item_types(request.GET.get('types'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        now = timezone.now()
+        live_lease = Q(lease_expires_at__gt=now)
+        counts = ModerationItem.objects.filter(status='open').aggregate(
+            total=Count('item_id'),
+            claimed=Count('item_id', filter=live_lease),
+            **{item_type: Count('item_id', filter=Q(item_type=item_type)) for item_type in moderation.SOURCES}
+        )
+
+        items = ModerationItem.objects.filter(status='open')
+        if item_types:
+            items = items.filter(item_type__in=item_types)
+        claimed = request.GET.get('claimed')
+        if claimed == 'true':
+            items = items.filter(live_lease)
+            admin_id = request.GET.get('admin_id')
+            if admin_id:
+                items = items.filter(claimed_by_id=admin_id)
+        elif claimed == 'false':
+            items = moderation.available(now, item_types)
+
+        rows, next_cursor = paginate(items, moderation.QUEUE_ORDERING, cursor_values, page_size)
+
+        return Response({
+            'results': _serialize_items(rows),
+            'next_cursor': next_cursor,
+            'counts': counts
+        }, status=status.HTTP_200_OK)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': 'Failed to fetch moderation queue',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_or_head_admin_required
+def claim_moderation_items(request):
+    """
+    Claim the next available moderation items
+    Body: limit (default 10, max 50), types (optional list of item types)
+    The claiming admin is the access token's account
+    """
+    try:
+        try:
+            limit = int(request.data.get('limit', moderation.DEFAULT_CLAIM_SIZE))
+            item_types = _item_types(request.data.get('types'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        items = moderation.claim(request.admin_id, limit, item_types)
+
+        return Response({
+            'items': _serialize_items(items),
+            'lease_seconds': int(moderation.lease_duration().total_seconds())
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({
+            'error': 'Failed to claim moderation items',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_or_head_admin_required
+def renew_moderation_items(request):
+    """
+    Extend the lease on moderation items the admin holds
+    Body: item_ids
+    """
+    try:
+        item_ids = _item_ids(request)
+        if not item_ids:
+            return Response({
+                'error': 'item_ids is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        renewed = moderation.renew(request.admin_id, item_ids)
+
+        return Response({
+            'message': f'Renewed {renewed} moderation items',
+            'renewed': renewed,
+            'lease_seconds': int(moderation.lease_duration().total_seconds())
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({
+            'error': 'Failed to renew moderation items',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@admin_or_head_admin_required
+def release_moderation_items(request):
+    """
+    Return claimed moderation items to the queue
+    Body: item_ids
+    """
+    try:
+        item_ids = _item_ids(request)
+        if not item_ids:
+            return Response({
+                'error': 'item_ids is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        released = moderation.release(request.admin_id, item_ids)
+
+        return Response({
+            'message': f'Released {released} moderation items',
+            'released': released
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({
+            'error': 'Failed to release moderation items',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.shortcuts import get_object_or_404
 
 from ..models import ReportAccount, Notification
+from ..permissions import admin_permission_required
 
 
 @api_view(['GET'])
@@ -48,19 +49,20 @@ def get_reports(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_reports')
 def review_report(request):
     """
     Review a report and take action
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         report_id = request.data.get('report_id')
         status_update = request.data.get('status', 'reviewed')
         admin_action_notes = request.data.get('admin_action_notes', '')
         
-        if not admin_id or not report_id:
+        if not report_id:
             return Response({
-                'error': 'admin_id and report_id are required'
+                'error': 'report_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         report = get_object_or_404(ReportAccount, rep_acc_id=report_id)
@@ -92,17 +94,18 @@ def review_report(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_reports')
 def dismiss_report(request):
     """
     Dismiss a report
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         report_id = request.data.get('report_id')
         
-        if not admin_id or not report_id:
+        if not report_id:
             return Response({
-                'error': 'admin_id and report_id are required'
+                'error': 'report_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         report = get_object_or_404(ReportAccount, rep_acc_id=report_id)
@@ -3,25 +3,80 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from ..models import Account, Notification
-from shop.models import Shop
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import admin_permission_required
+from .. import audit
+from shop.models import Shop, ShopMechanic
+from services.models import ShopService
+
+
+def _subquery_count(queryset):
+    """Correlated COUNT(*) subquery, 0 when no rows match"""
+    counted = queryset.order_by().values('shop').annotate(count=Func(F('pk'), function='COUNT')).values('count')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def admin_shop_queryset():
+    """
+    Shops with owner account and address joined and their mechanic and service
+    counts computed as subqueries, so a page is one query however many rows it holds
+    """
+    return Shop.objects.select_related('shop_owner__shop_owner_id__address').annotate(
+        total_mechanics=_subquery_count(ShopMechanic.objects.filter(shop=OuterRef('shop_id'))),
+        total_services=_subquery_count(ShopService.objects.filter(shop=OuterRef('shop_id'))),
+    )
+
+
+SHOP_STATUS_FILTERS = {
+    'active': Q(status='open'),
+    'inactive': ~Q(status='open'),
+}
+SHOP_VERIFICATION_FILTERS = {
+    'verified': Q(is_verified=True),
+    'unverified': Q(is_verified=False),
+}
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_shops(request):
     """
-    Get all shops for head admin
+    Get a page of shops for head admin, newest first
+    Query params: status (active/inactive), verification (verified/unverified),
+                  search (shop name prefix), cursor, page_size
     """
     try:
-        from shop.models import ShopMechanic
-        from services.models import ShopService
-        
-        shops = Shop.objects.all().select_related('shop_owner').prefetch_related('shop_mechanics')
-        
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        counts = Shop.objects.aggregate(
+            total=Count('shop_id'),
+            verified=Count('shop_id', filter=Q(is_verified=True)),
+            active=Count('shop_id', filter=Q(status='open')),
+        )
+        counts['mechanics'] = ShopMechanic.objects.count()
+
+        shops = admin_shop_queryset()
+        status_filter = request.GET.get('status')
+        if status_filter in SHOP_STATUS_FILTERS:
+            shops = shops.filter(SHOP_STATUS_FILTERS[status_filter])
+        verification = request.GET.get('verification')
+        if verification in SHOP_VERIFICATION_FILTERS:
+            shops = shops.filter(SHOP_VERIFICATION_FILTERS[verification])
+        search = request.GET.get('search', '').strip()
+        if search:
+            shops = shops.filter(shop_name__istartswith=search)
+
+        rows, next_cursor = paginate(shops, ('-created_at', '-shop_id'), cursor_values, page_size)
+
         shops_data = []
-        for shop in shops:
+        for shop in rows:
             # Get owner info
             owner_account = None
             owner_contact = ""
@@ -37,12 +92,6 @@ def get_shops(request):
                 address = f"{addr.house_building_number or ''} {addr.street_name or ''}, {addr.barangay or ''}".strip()
                 city = f"{addr.city_municipality or ''}, {addr.province or ''}".strip()
             
-            # Count mechanics through ShopMechanic
-            total_mechanics = shop.shop_mechanics.count()
-            
-            # Count services through ShopService
-            total_services = ShopService.objects.filter(shop=shop).count()
-            
             shops_data.append({
                 'id': shop.shop_id,
                 'shop_name': shop.shop_name,
@@ -56,13 +105,19 @@ def get_shops(request):
                 'address': address,
                 'city': city,
                 'created_at': shop.created_at.isoformat(),
-                'total_mechanics': total_mechanics,
+                'total_mechanics': shop.total_mechanics,
                 'average_rating': None,
-                'total_services': total_services
+                'total_services': shop.total_services
             })
         
-        return Response(shops_data, status=status.HTTP_200_OK)
+        return Response({
+            'results': shops_data,
+            'next_cursor': next_cursor,
+            'counts': counts
+        }, status=status.HTTP_200_OK)
     
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch shops',
@@ -72,24 +127,27 @@ def get_shops(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_shops')
 def verify_shop(request):
     """
     Verify a shop
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         shop_id = request.data.get('shop_id')
         
-        if not admin_id or not shop_id:
+        if not shop_id:
             return Response({
-                'error': 'admin_id and shop_id are required'
+                'error': 'shop_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         shop = get_object_or_404(Shop, shop_id=shop_id)
         
         # Verify the shop
+        before = audit.snapshot(shop, ['is_verified'])
         shop.is_verified = True
         shop.save()
+        audit.record(admin_id, 'verify_shop', shop, before, audit.snapshot(shop, ['is_verified']), request=request)
         
         # Notify shop owner if they have an account
         if shop.shop_owner:
@@ -114,17 +172,18 @@ def verify_shop(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_shops')
 def deactivate_shop(request):
     """
     Deactivate a shop
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         shop_id = request.data.get('shop_id')
         
-        if not admin_id or not shop_id:
+        if not shop_id:
             return Response({
-                'error': 'admin_id and shop_id are required'
+                'error': 'shop_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         shop = get_object_or_404(Shop, shop_id=shop_id)
@@ -156,17 +215,18 @@ def deactivate_shop(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_shops')
 def activate_shop(request):
     """
     Activate a shop
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         shop_id = request.data.get('shop_id')
         
-        if not admin_id or not shop_id:
+        if not shop_id:
             return Response({
-                'error': 'admin_id and shop_id are required'
+                'error': 'shop_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         shop = get_object_or_404(Shop, shop_id=shop_id)
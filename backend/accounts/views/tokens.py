@@ -2,47 +2,102 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Sum
+from django.db.models import Exists, OuterRef, Case, When, Value, CharField
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import datetime
 
-from ..models import Account, AccountRole, TokenPurchase
+from ..models import Account, AccountRole, TokenPurchase, TokenLedger
+from ..listing import AdminListing
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import admin_permission_required
+from .. import wallet
 from payment.models import TokenPackage
+from payment import rollups
+
+
+def _has_role(role):
+    return Exists(AccountRole.objects.filter(acc_id=OuterRef('account_id'), account_role=role))
+
+
+# Buyer type resolved in the purchases query; mechanic wins over shop owner
+USER_TYPE = Case(
+    When(_has_role('mechanic'), then=Value('mechanic')),
+    When(_has_role('shop_owner'), then=Value('shop_owner')),
+    default=Value('client'),
+    output_field=CharField()
+)
+
+
+def _purchase_row(row):
+    return {
+        'id': row['token_purchase_id'],
+        'user_id': row['account_id'],
+        'username': row['account__username'],
+        'user_email': row['account__email'],
+        'user_type': row['user_type'],
+        'full_name': f"{row['account__firstname']} {row['account__lastname']}",
+        'package_id': row['package_id'],
+        'package_name': row['package__name'],
+        'tokens_amount': row['tokens_amount'],
+        'price': str(row['price']),
+        'payment_method': row['payment_method'] or 'N/A',
+        'status': row['status'] or 'completed',
+        'purchased_at': row['purchased_at'].isoformat()
+    }
+
+
+PURCHASE_LISTING = AdminListing(
+    columns=[
+        'token_purchase_id', 'account_id', 'account__username', 'account__email',
+        'account__firstname', 'account__lastname', 'user_type', 'package_id', 'package__name',
+        'tokens_amount', 'price', 'payment_method', 'status', 'purchased_at',
+    ],
+    ordering=('-purchased_at', '-token_purchase_id'),
+    serialize=_purchase_row,
+)
+
+WALLET_LEDGER_FIELDS = [
+    'entry_id', 'entry_type', 'amount', 'token_purchase_id',
+    'service_category_id', 'service_category__name', 'created_by_id', 'note', 'created_at',
+]
+WALLET_LEDGER_ORDERING = ('-entry_id',)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_token_purchases(request):
     """
-    Get all token purchases for head admin
+    Get a page of token purchases for head admin, newest first
+    Query params: status, user_type, package_id, cursor, page_size
     """
     try:
-        purchases = TokenPurchase.objects.all().select_related('account').order_by('-purchased_at')
-        
-        purchases_data = []
-        for purchase in purchases:
-            # Get user type from AccountRole
-            user_roles = AccountRole.objects.filter(acc=purchase.account).values_list('account_role', flat=True)
-            user_type = 'client'  # default
-            if 'mechanic' in user_roles:
-                user_type = 'mechanic'
-            elif 'shop_owner' in user_roles:
-                user_type = 'shop_owner'
-            
-            purchases_data.append({
-                'id': purchase.token_purchase_id,
-                'user_id': purchase.account.acc_id,
-                'username': purchase.account.username,
-                'user_email': purchase.account.email,
-                'user_type': user_type,
-                'full_name': f"{purchase.account.firstname} {purchase.account.lastname}",
-                'tokens_amount': purchase.tokens_amount,
-                'price': str(purchase.price),
-                'payment_method': purchase.payment_method or 'N/A',
-                'status': purchase.status or 'completed',
-                'purchased_at': purchase.purchased_at.isoformat()
-            })
-        
-        return Response(purchases_data, status=status.HTTP_200_OK)
-    
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        package_id = request.GET.get('package_id')
+        if package_id:
+            try:
+                package_id = int(package_id)
+            except ValueError:
+                return Response({'error': 'package_id must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        purchases = TokenPurchase.objects.annotate(user_type=USER_TYPE)
+        status_filter = request.GET.get('status')
+        if status_filter:
+            purchases = purchases.filter(status=status_filter)
+        user_type = request.GET.get('user_type')
+        if user_type:
+            purchases = purchases.filter(user_type=user_type)
+        if package_id:
+            purchases = purchases.filter(package_id=package_id)
+
+        return PURCHASE_LISTING.response(purchases, cursor_values, page_size)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch token purchases',
@@ -50,8 +105,53 @@ def get_token_purchases(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_token_sales(request):
+    """
+    Get completed token sales totals per package and per day from the daily rollups
+    Optional query params: from=YYYY-MM-DD, to=YYYY-MM-DD
+    """
+    try:
+        try:
+            start_day = request.GET.get('from')
+            end_day = request.GET.get('to')
+            start_day = datetime.strptime(start_day, '%Y-%m-%d').date() if start_day else None
+            end_day = datetime.strptime(end_day, '%Y-%m-%d').date() if end_day else None
+        except ValueError:
+            return Response({'error': 'Dates must use YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+        sales = rollups.summarize_token_sales(start_day, end_day)
+
+        return Response({
+            'total_sales': sales['total_sales'],
+            'tokens_sold': sales['tokens_sold'],
+            'total_revenue': str(sales['total_revenue']),
+            'by_package': [{
+                'package_id': row['package_id'],
+                'package_name': row['package__name'] or 'No package',
+                'total_sales': row['purchase_count'],
+                'tokens_sold': row['tokens_sold'],
+                'total_revenue': str(row['revenue'])
+            } for row in sales['by_package']],
+            'by_day': [{
+                'day': row['day'].isoformat(),
+                'total_sales': row['purchase_count'],
+                'tokens_sold': row['tokens_sold'],
+                'total_revenue': str(row['revenue'])
+            } for row in sales['by_day']]
+        }, status=status.HTTP_200_OK)
+
+    except Exception as e:
+        return Response({
+            'error': 'Failed to fetch token sales',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET', 'POST', 'PUT', 'DELETE'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_tokens')
 def manage_token_pricing(request, package_id=None):
     """
     Manage token pricing packages - CRUD operations
@@ -74,11 +174,10 @@ def manage_token_pricing(request, package_id=None):
                     'description': pkg.description
                 })
             
-            # Get stats
-            total_sales = TokenPurchase.objects.filter(status='completed').count()
-            total_revenue = TokenPurchase.objects.filter(status='completed').aggregate(
-                total=Sum('price')
-            )['total'] or 0
+            # Get stats from the token sales rollups
+            sales = rollups.summarize_token_sales()
+            total_sales = sales['total_sales']
+            total_revenue = sales['total_revenue']
             
             stats = {
                 'total_packages': packages.count(),
@@ -174,3 +273,90 @@ def manage_token_pricing(request, package_id=None):
             'error': 'Failed to manage token pricing',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([AllowAny])
+@admin_permission_required('manage_tokens')
+def token_wallet(request, acc_id):
+    """
+    GET: wallet balance and a page of ledger entries, newest first
+         Query params: at=ISO datetime (balance at that time), cursor, page_size
+    POST: admin adjustment with amount (signed tokens) and note, made by the access token's admin
+    """
+    try:
+        account = get_object_or_404(Account, acc_id=acc_id)
+
+        if request.method == 'POST':
+            admin_id = request.admin_id
+            note = request.data.get('note')
+            try:
+                amount = int(request.data.get('amount'))
+            except (TypeError, ValueError):
+                return Response({'error': 'amount must be a whole number of tokens'}, status=status.HTTP_400_BAD_REQUEST)
+            if not amount or not note:
+                return Response({
+                    'error': 'A non-zero amount and note are required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                entry = wallet.adjust(account.acc_id, amount, admin_id=admin_id, note=note)
+            except wallet.NoTokenWallet:
+                return Response({'error': 'This account has no token wallet'}, status=status.HTTP_400_BAD_REQUEST)
+            except wallet.InsufficientTokens:
+                return Response({'error': 'Adjustment would make the balance negative'}, status=status.HTTP_400_BAD_REQUEST)
+
+            return Response({
+                'message': 'Token balance adjusted successfully',
+                'entry_id': entry.entry_id,
+                'balance': wallet.get_balance(account.acc_id)
+            }, status=status.HTTP_201_CREATED)
+
+        try:
+            cursor_values, page_size = get_page_params(request)
+            at = request.GET.get('at')
+            if at:
+                at = parse_datetime(at)
+                if at is None:
+                    raise ValueError('at must be an ISO 8601 datetime')
+                if timezone.is_naive(at):
+                    at = timezone.make_aware(at)
+            balance = wallet.get_balance(account.acc_id)
+        except wallet.NoTokenWallet:
+            return Response({'error': 'This account has no token wallet'}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, next_cursor = paginate(
+            TokenLedger.objects.filter(account=account).values(*WALLET_LEDGER_FIELDS),
+            WALLET_LEDGER_ORDERING, cursor_values, page_size
+        )
+
+        data = {
+            'account_id': account.acc_id,
+            'balance': balance,
+            'results': [{
+                'entry_id': row['entry_id'],
+                'entry_type': row['entry_type'],
+                'amount': row['amount'],
+                'token_purchase_id': row['token_purchase_id'],
+                'service_category_id': row['service_category_id'],
+                'service_category': row['service_category__name'],
+                'created_by_id': row['created_by_id'],
+                'note': row['note'],
+                'created_at': row['created_at'].isoformat(),
+            } for row in rows],
+            'next_cursor': next_cursor
+        }
+        if at:
+            data['balance_at'] = wallet.balance_at(account.acc_id, at)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': 'Failed to process token wallet',
+            'details': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -3,10 +3,13 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.db.models import Exists, OuterRef, Q
 
 from ..models import Account, AccountRole, AccountBan, Notification, AccountAddress
+from ..pagination import InvalidCursor, get_page_params, paginate
 from ..serializers import AccountSerializer, NotificationSerializer, MechanicDiscoverySerializer
-from ..permissions import head_admin_required
+from ..permissions import admin_permission_required, head_admin_required
+from .. import audit, revocation
 
 
 @api_view(['GET'])
@@ -89,6 +92,7 @@ def deactivate_user(request, user_id):
         user = get_object_or_404(Account, acc_id=user_id)
         user.is_active = False
         user.save()
+        revocation.revoke([user.acc_id], 'deactivated')
         
         return Response({
             'message': f'User {user.username} has been deactivated'
@@ -381,31 +385,104 @@ def mechanic_detail(request, mechanic_id):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+def _has_role(role):
+    return Exists(AccountRole.objects.filter(acc_id=OuterRef('acc_id'), account_role=role))
+
+
+ROLE_FLAGS = {f'has_{role}': role for role, _ in AccountRole.ROLE_CHOICES}
+USER_GRID_FIELDS = [
+    'acc_id', 'username', 'email', 'firstname', 'lastname', 'is_active', 'is_verified',
+    'is_banned', 'created_at', *ROLE_FLAGS,
+]
+# ?sort values; each ordering ends with the primary key and matches an index
+USER_GRID_ORDERINGS = {
+    '-created_at': ('-created_at', '-acc_id'),
+    'created_at': ('created_at', 'acc_id'),
+    'username': ('username', 'acc_id'),
+    '-username': ('-username', '-acc_id'),
+    'email': ('email', 'acc_id'),
+    '-email': ('-email', '-acc_id'),
+    'lastname': ('lastname', 'acc_id'),
+    '-lastname': ('-lastname', '-acc_id'),
+}
+BOOLEAN_PARAMS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _search_users(users, search):
+    """Prefix search on username, email and names; "first last" matches both names"""
+    condition = (
+        Q(username__istartswith=search) | Q(email__istartswith=search) |
+        Q(firstname__istartswith=search) | Q(lastname__istartswith=search)
+    )
+    parts = search.split(None, 1)
+    if len(parts) == 2:
+        condition |= Q(firstname__istartswith=parts[0], lastname__istartswith=parts[1])
+    return users.filter(condition)
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_all_users(request):
     """
-    Get all users for head admin user management
+    Get a page of users for head admin user management
+    Query params: search, role, banned, verified, active (true/false),
+                  sort (-created_at, created_at, username, email, lastname, optionally prefixed with -),
+                  cursor, page_size
     """
     try:
-        users = Account.objects.all().prefetch_related('roles', 'ban').order_by('-created_at')
-        
-        users_data = []
-        for user in users:
-            users_data.append({
-                'id': user.acc_id,
-                'username': user.username,
-                'email': user.email,
-                'first_name': user.firstname,
-                'last_name': user.lastname,
-                'is_active': user.is_active,
-                'is_banned': hasattr(user, 'ban'),
-                'date_joined': user.created_at.isoformat(),
-                'roles': [{'account_role': role.account_role} for role in user.roles.all()]
-            })
-        
-        return Response(users_data, status=status.HTTP_200_OK)
+        ordering = USER_GRID_ORDERINGS.get(request.GET.get('sort', '-created_at'))
+        if ordering is None:
+            return Response({
+                'error': f"sort must be one of {', '.join(USER_GRID_ORDERINGS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        users = Account.objects.annotate(
+            is_banned=Exists(AccountBan.objects.filter(acc_ban_id=OuterRef('acc_id'))),
+            **{flag: _has_role(role) for flag, role in ROLE_FLAGS.items()}
+        )
+
+        search = request.GET.get('search', '').strip()
+        if search:
+            users = _search_users(users, search)
+        role = request.GET.get('role')
+        if role:
+            if f'has_{role}' not in ROLE_FLAGS:
+                return Response({'error': 'Unknown role'}, status=status.HTTP_400_BAD_REQUEST)
+            users = users.filter(**{f'has_{role}': True})
+        for param, field in (('banned', 'is_banned'), ('verified', 'is_verified'), ('active', 'is_active')):
+            value = request.GET.get(param)
+            if value is None:
+                continue
+            if value.lower() not in BOOLEAN_PARAMS:
+                return Response({'error': f'{param} must be true or false'}, status=status.HTTP_400_BAD_REQUEST)
+            users = users.filter(**{field: BOOLEAN_PARAMS[value.lower()]})
+
+        rows, next_cursor = paginate(users.values(*USER_GRID_FIELDS), ordering, cursor_values, page_size)
+
+        users_data = [{
+            'id': row['acc_id'],
+            'username': row['username'],
+            'email': row['email'],
+            'first_name': row['firstname'],
+            'last_name': row['lastname'],
+            'is_active': row['is_active'],
+            'is_verified': row['is_verified'],
+            'is_banned': row['is_banned'],
+            'date_joined': row['created_at'].isoformat(),
+            'roles': [{'account_role': role} for flag, role in ROLE_FLAGS.items() if row[flag]]
+        } for row in rows]
+
+        return Response({
+            'results': users_data,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
     
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch users',
@@ -415,17 +492,18 @@ def get_all_users(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_users')
 def ban_user(request):
     """
     Ban a user account
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         user_id = request.data.get('user_id')
         
-        if not admin_id or not user_id:
+        if not user_id:
             return Response({
-                'error': 'admin_id and user_id are required'
+                'error': 'user_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         user = get_object_or_404(Account, acc_id=user_id)
@@ -438,10 +516,15 @@ def ban_user(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Create ban record
-        AccountBan.objects.create(
+        ban = AccountBan.objects.create(
             acc_ban_id=user,
             reason_ban='Banned by head admin'
         )
+        audit.record(
+            admin.acc_id, 'ban_user', user,
+            before={'is_banned': False}, after={'is_banned': True, 'reason_ban': ban.reason_ban},
+            request=request
+        )
         
         return Response({
             'message': 'User banned successfully'
@@ -456,17 +539,18 @@ def ban_user(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_users')
 def unban_user(request):
     """
     Unban a user account
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         user_id = request.data.get('user_id')
         
-        if not admin_id or not user_id:
+        if not user_id:
             return Response({
-                'error': 'admin_id and user_id are required'
+                'error': 'user_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         user = get_object_or_404(Account, acc_id=user_id)
@@ -1,102 +1,179 @@
+import base64
+import time
+from collections import defaultdict
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.core import signing
+from django.db.models import Exists, OuterRef, Q, Count, BooleanField, ExpressionWrapper
+from django.db.models.functions import Length, Substr
+from django.http import HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 
 from ..models import Account, Notification, VerificationRejection, Mechanic, AccountRole
+from ..pagination import InvalidCursor, get_page_params, paginate
+from ..permissions import admin_permission_required
+from .. import audit, revocation
+from .users import _search_users
+from documents.models import MechanicDocument, ShopOwnerDocument
+from payment.blobstore import DATA_URL_RE, DEFAULT_CONTENT_TYPE, is_external_url, set_content_headers
+
+
+# owner type -> (document model, primary key, owner foreign key column)
+DOCUMENT_MODELS = {
+    'mechanic': (MechanicDocument, 'mechanic_document_id', 'mechanic_id'),
+    'shop_owner': (ShopOwnerDocument, 'shop_owner_document_id', 'shop_owner_id'),
+}
+DOCUMENT_HEAD_CHARS = 256
+DOCUMENT_CHUNK_CHARS = 256 * 1024
+# Document links are opened in a new tab without the Bearer header, so they carry a signed, short-lived grant
+DOCUMENT_URL_SALT = 'accounts.verification_document'
+DOCUMENT_URL_MAX_AGE = 5 * 60
+VERIFICATION_STATUS_FILTERS = {
+    'approved': Q(is_verified=True),
+    'rejected': Q(is_verified=False, is_rejected=True),
+    'pending': Q(is_verified=False, is_rejected=False),
+}
+
+
+def _has_role(role):
+    return Exists(AccountRole.objects.filter(acc_id=OuterRef('acc_id'), account_role=role))
+
+
+def _document_url(request, owner_type, document_id):
+    """Signed verification_document link for the requesting admin, valid for DOCUMENT_URL_MAX_AGE"""
+    grant = signing.dumps([owner_type, document_id, request.admin_id, int(time.time())], salt=DOCUMENT_URL_SALT)
+    return request.build_absolute_uri(reverse('verification_document', args=[grant]))
+
+
+def _document_metadata(request, owner_type, owner_ids):
+    """
+    Metadata for every document of the given owners, grouped by owner id, from
+    one query. Bodies stay in the database; each entry carries a signed link to
+    verification_document, and size is estimated from the base64 length.
+    """
+    model, pk_name, owner_field = DOCUMENT_MODELS[owner_type]
+    documents = model.objects.filter(**{f'{owner_field}__in': owner_ids}).annotate(
+        encoded_length=Length('document_file'),
+        is_link=ExpressionWrapper(Q(document_file__startswith='http'), output_field=BooleanField())
+    ).values(
+        pk_name, owner_field, 'document_name', 'document_type', 'date_issued', 'date_expiry',
+        'uploaded_at', 'encoded_length', 'is_link'
+    ).order_by(pk_name)
+
+    by_owner = defaultdict(list)
+    for doc in documents:
+        by_owner[doc[owner_field]].append({
+            'id': doc[pk_name],
+            'name': doc['document_name'],
+            'type': doc['document_type'],
+            'url': _document_url(request, owner_type, doc[pk_name]),
+            'size': None if doc['is_link'] else (doc['encoded_length'] or 0) * 3 // 4,
+            'date_issued': doc['date_issued'].isoformat() if doc['date_issued'] else None,
+            'date_expiry': doc['date_expiry'].isoformat() if doc['date_expiry'] else None,
+            'uploaded_at': doc['uploaded_at'].isoformat()
+        })
+    return by_owner
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def get_verifications(request):
     """
-    Get all verification requests for head admin
+    Get a page of verification requests for head admin, newest first
+    Documents are listed as metadata; bodies are fetched from verification_document
+    Query params: status (pending/approved/rejected), account_type (mechanic/shop_owner),
+                  search, cursor, page_size
     """
     try:
-        from documents.models import MechanicDocument, ShopOwnerDocument
-        
-        # Get all users with mechanic or shop owner roles
-        all_users = Account.objects.filter(
-            roles__account_role__in=['mechanic', 'shop_owner']
-        ).distinct().select_related('address', 'mechanic_profile', 'shop_owner_profile', 'verification_rejection').prefetch_related('roles')
-        
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        accounts = Account.objects.annotate(
+            is_mechanic=_has_role('mechanic'),
+            is_shop_owner=_has_role('shop_owner'),
+            is_rejected=Exists(VerificationRejection.objects.filter(account_id=OuterRef('acc_id'))),
+        ).filter(Q(is_mechanic=True) | Q(is_shop_owner=True))
+
+        counts = accounts.aggregate(
+            total=Count('acc_id'),
+            approved=Count('acc_id', filter=Q(is_verified=True)),
+            rejected=Count('acc_id', filter=Q(is_verified=False, is_rejected=True)),
+            pending=Count('acc_id', filter=Q(is_verified=False, is_rejected=False)),
+        )
+
+        status_filter = request.GET.get('status')
+        if status_filter in VERIFICATION_STATUS_FILTERS:
+            accounts = accounts.filter(VERIFICATION_STATUS_FILTERS[status_filter])
+        account_type = request.GET.get('account_type')
+        if account_type == 'mechanic':
+            accounts = accounts.filter(is_mechanic=True)
+        elif account_type == 'shop_owner':
+            accounts = accounts.filter(is_mechanic=False)
+        search = request.GET.get('search', '').strip()
+        if search:
+            accounts = _search_users(accounts, search)
+
+        rows, next_cursor = paginate(accounts.values(
+            'acc_id', 'username', 'email', 'firstname', 'lastname', 'created_at',
+            'is_verified', 'is_mechanic', 'is_rejected',
+            'mechanic_profile__contact_number', 'mechanic_profile__bio',
+            'shop_owner_profile__contact_number', 'shop_owner_profile__bio',
+            'address__acc_add_id', 'address__city_municipality', 'address__province',
+        ), ('-created_at', '-acc_id'), cursor_values, page_size)
+
+        mechanic_ids = [row['acc_id'] for row in rows if row['is_mechanic']]
+        shop_owner_ids = [row['acc_id'] for row in rows if not row['is_mechanic']]
+        documents = {
+            'mechanic': _document_metadata(request, 'mechanic', mechanic_ids) if mechanic_ids else {},
+            'shop_owner': _document_metadata(request, 'shop_owner', shop_owner_ids) if shop_owner_ids else {},
+        }
+
         verifications_data = []
-        for user in all_users:
-            # Determine account type
-            account_type = 'mechanic' if user.roles.filter(account_role='mechanic').exists() else 'shop_owner'
-            
-            # Determine status
-            if user.is_verified:
+        for row in rows:
+            account_type = 'mechanic' if row['is_mechanic'] else 'shop_owner'
+            if row['is_verified']:
                 verification_status = 'approved'
-            elif hasattr(user, 'verification_rejection'):
+            elif row['is_rejected']:
                 verification_status = 'rejected'
             else:
                 verification_status = 'pending'
-            
-            # Get profile data
-            profile_data = {}
-            documents_list = []
-            
-            if account_type == 'mechanic' and hasattr(user, 'mechanic_profile'):
-                profile_data = {
-                    'contact_number': user.mechanic_profile.contact_number,
-                    'bio': user.mechanic_profile.bio,
-                }
-                
-                # Fetch mechanic documents
-                mechanic_docs = MechanicDocument.objects.filter(mechanic=user.mechanic_profile)
-                for doc in mechanic_docs:
-                    documents_list.append({
-                        'id': doc.mechanic_document_id,
-                        'name': doc.document_name,
-                        'type': doc.document_type,
-                        'url': doc.document_file,
-                        'date_issued': doc.date_issued.isoformat() if doc.date_issued else None,
-                        'date_expiry': doc.date_expiry.isoformat() if doc.date_expiry else None,
-                        'uploaded_at': doc.uploaded_at.isoformat()
-                    })
-                    
-            elif account_type == 'shop_owner' and hasattr(user, 'shop_owner_profile'):
-                profile_data = {
-                    'contact_number': user.shop_owner_profile.contact_number,
-                    'bio': user.shop_owner_profile.bio,
-                }
-                
-                # Fetch shop owner documents
-                shop_owner_docs = ShopOwnerDocument.objects.filter(shop_owner=user.shop_owner_profile)
-                for doc in shop_owner_docs:
-                    documents_list.append({
-                        'id': doc.shop_owner_document_id,
-                        'name': doc.document_name,
-                        'type': doc.document_type,
-                        'url': doc.document_file,
-                        'date_issued': doc.date_issued.isoformat() if doc.date_issued else None,
-                        'date_expiry': doc.date_expiry.isoformat() if doc.date_expiry else None,
-                        'uploaded_at': doc.uploaded_at.isoformat()
-                    })
-            
-            # Get address
-            if hasattr(user, 'address'):
-                address = f"{user.address.city_municipality}, {user.address.province}"
-                profile_data['address'] = address
-            
+
+            profile_data = {
+                'contact_number': row[f'{account_type}_profile__contact_number'],
+                'bio': row[f'{account_type}_profile__bio'],
+            }
+            if row['address__acc_add_id']:
+                profile_data['address'] = f"{row['address__city_municipality']}, {row['address__province']}"
+
             verifications_data.append({
-                'id': user.acc_id,
-                'user_id': user.acc_id,
-                'username': user.username,
-                'email': user.email,
-                'full_name': f"{user.firstname} {user.lastname}",
+                'id': row['acc_id'],
+                'user_id': row['acc_id'],
+                'username': row['username'],
+                'email': row['email'],
+                'full_name': f"{row['firstname']} {row['lastname']}",
                 'account_type': account_type,
-                'requested_at': user.created_at.isoformat(),
+                'requested_at': row['created_at'].isoformat(),
                 'status': verification_status,
-                'documents': documents_list,
+                'documents': documents[account_type].get(row['acc_id'], []),
                 'profile_data': profile_data
             })
-        
-        return Response(verifications_data, status=status.HTTP_200_OK)
+
+        return Response({
+            'results': verifications_data,
+            'next_cursor': next_cursor,
+            'counts': counts
+        }, status=status.HTTP_200_OK)
     
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch verifications',
@@ -104,19 +181,79 @@ def get_verifications(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def verification_document(request, grant):
+    """
+    Stream one verification document body
+    The grant is the signed link from get_verifications (see _document_url); it
+    expires after DOCUMENT_URL_MAX_AGE and with the issuing admin's tokens.
+    Inline base64 documents are decoded a slice at a time; linked documents redirect
+    """
+    try:
+        owner_type, document_id, admin_id, issued_at = signing.loads(
+            grant, salt=DOCUMENT_URL_SALT, max_age=DOCUMENT_URL_MAX_AGE
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return Response({'error': 'Document link is invalid or has expired'}, status=status.HTTP_403_FORBIDDEN)
+    if revocation.is_revoked(admin_id, issued_at):
+        return Response({'error': 'Document link has been revoked'}, status=status.HTTP_403_FORBIDDEN)
+    if owner_type not in DOCUMENT_MODELS:
+        return Response({'error': 'Unknown document owner type'}, status=status.HTTP_404_NOT_FOUND)
+    model, pk_name, _ = DOCUMENT_MODELS[owner_type]
+
+    head = model.objects.filter(**{pk_name: document_id}).annotate(
+        head=Substr('document_file', 1, DOCUMENT_HEAD_CHARS),
+        encoded_length=Length('document_file')
+    ).values('head', 'encoded_length', 'document_name', 'updated_at').first()
+    if head is None:
+        return Response({'error': 'Document not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if is_external_url(head['head']):
+        link = model.objects.filter(**{pk_name: document_id}).values_list('document_file', flat=True).first()
+        return HttpResponseRedirect(link)
+
+    etag = f'"{owner_type}-{document_id}-{int(head["updated_at"].timestamp())}"'
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified()
+
+    content_type = DEFAULT_CONTENT_TYPE
+    start = 0
+    match = DATA_URL_RE.match(head['head'])
+    if match:
+        content_type = match.group('content_type') or DEFAULT_CONTENT_TYPE
+        start = match.end()
+
+    def chunks():
+        # Slices are a multiple of 4 characters long, so each decodes on its own
+        for offset in range(start, head['encoded_length'], DOCUMENT_CHUNK_CHARS):
+            piece = model.objects.filter(**{pk_name: document_id}, updated_at=head['updated_at']).annotate(
+                piece=Substr('document_file', offset + 1, DOCUMENT_CHUNK_CHARS)
+            ).values_list('piece', flat=True).first()
+            if not piece:
+                return
+            yield base64.b64decode(piece + '=' * (-len(piece) % 4))
+
+    response = StreamingHttpResponse(chunks())
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=3600'
+    return set_content_headers(response, content_type, head['document_name'])
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def verify_user_verification(request):
     """
     Approve a verification request
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         verification_id = request.data.get('verification_id')
         
-        if not admin_id or not verification_id:
+        if not verification_id:
             return Response({
-                'error': 'admin_id and verification_id are required'
+                'error': 'verification_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         user = get_object_or_404(Account, acc_id=verification_id)
@@ -149,18 +286,19 @@ def verify_user_verification(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def reject_verification(request):
     """
     Reject a verification request
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         verification_id = request.data.get('verification_id')
         reason = request.data.get('reason', 'Verification requirements not met')
         
-        if not admin_id or not verification_id:
+        if not verification_id:
             return Response({
-                'error': 'admin_id and verification_id are required'
+                'error': 'verification_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         user = get_object_or_404(Account, acc_id=verification_id)
@@ -202,61 +340,56 @@ def reject_verification(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def get_pending_mechanics(request):
     """
-    Get all pending mechanic applications for admin review
+    Get a page of pending mechanic applications for admin review, oldest first
+    Query params: cursor, page_size
     """
     try:
-        from documents.models import MechanicDocument
-        
-        # Get all mechanics with pending approval status
-        pending_mechanics = Mechanic.objects.filter(
-            approval_status='pending'
-        ).select_related('mechanic_id', 'mechanic_id__address')
-        
+        try:
+            cursor_values, page_size = get_page_params(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows, next_cursor = paginate(
+            Mechanic.objects.filter(approval_status='pending').values(
+                'mechanic_id', 'contact_number', 'bio', 'approval_status', 'created_at',
+                'mechanic_id__username', 'mechanic_id__email', 'mechanic_id__firstname', 'mechanic_id__lastname',
+                'mechanic_id__address__city_municipality', 'mechanic_id__address__province',
+            ),
+            ('created_at', 'mechanic_id'), cursor_values, page_size
+        )
+        documents = _document_metadata(request, 'mechanic', [row['mechanic_id'] for row in rows]) if rows else {}
+
         mechanics_data = []
-        for mechanic in pending_mechanics:
-            user = mechanic.mechanic_id
-            
-            # Get address
+        for row in rows:
             address = ''
-            if hasattr(user, 'address'):
-                addr = user.address
-                address = f"{addr.city_municipality or ''}, {addr.province or ''}".strip()
-            
-            # Get documents
-            documents_list = []
-            mechanic_docs = MechanicDocument.objects.filter(mechanic=mechanic)
-            for doc in mechanic_docs:
-                documents_list.append({
-                    'id': doc.mechanic_document_id,
-                    'name': doc.document_name,
-                    'type': doc.document_type,
-                    'url': doc.document_file,
-                    'date_issued': doc.date_issued.isoformat() if doc.date_issued else None,
-                    'date_expiry': doc.date_expiry.isoformat() if doc.date_expiry else None,
-                    'uploaded_at': doc.uploaded_at.isoformat()
-                })
-            
+            if row['mechanic_id__address__city_municipality'] or row['mechanic_id__address__province']:
+                address = f"{row['mechanic_id__address__city_municipality'] or ''}, {row['mechanic_id__address__province'] or ''}".strip()
+
             mechanics_data.append({
-                'mechanic_id': mechanic.mechanic_id.acc_id,
-                'user_id': user.acc_id,
-                'username': user.username,
-                'email': user.email,
-                'full_name': f"{user.firstname} {user.lastname}",
-                'contact_number': mechanic.contact_number,
-                'bio': mechanic.bio,
+                'mechanic_id': row['mechanic_id'],
+                'user_id': row['mechanic_id'],
+                'username': row['mechanic_id__username'],
+                'email': row['mechanic_id__email'],
+                'full_name': f"{row['mechanic_id__firstname']} {row['mechanic_id__lastname']}",
+                'contact_number': row['contact_number'],
+                'bio': row['bio'],
                 'address': address,
-                'approval_status': mechanic.approval_status,
-                'applied_at': mechanic.created_at.isoformat(),
-                'documents': documents_list
+                'approval_status': row['approval_status'],
+                'applied_at': row['created_at'].isoformat(),
+                'documents': documents.get(row['mechanic_id'], [])
             })
         
         return Response({
             'mechanics': mechanics_data,
-            'count': len(mechanics_data)
+            'count': len(mechanics_data),
+            'next_cursor': next_cursor
         }, status=status.HTTP_200_OK)
     
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'error': 'Failed to fetch pending mechanics',
@@ -266,18 +399,19 @@ def get_pending_mechanics(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def approve_mechanic(request):
     """
     Approve a mechanic application and assign mechanic role
     Admin-only endpoint
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         mechanic_id = request.data.get('mechanic_id')
         
-        if not admin_id or not mechanic_id:
+        if not mechanic_id:
             return Response({
-                'error': 'admin_id and mechanic_id are required'
+                'error': 'mechanic_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Get admin account
@@ -299,10 +433,13 @@ def approve_mechanic(request):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Update mechanic approval status
+        audited_fields = ['approval_status', 'approved_at', 'approved_by_id']
+        before = audit.snapshot(mechanic, audited_fields)
         mechanic.approval_status = 'approved'
         mechanic.approved_at = timezone.now()
         mechanic.approved_by = admin
         mechanic.save()
+        audit.record(admin.acc_id, 'approve_mechanic', mechanic, before, audit.snapshot(mechanic, audited_fields), request=request)
         
         # Assign mechanic role (now that they're approved)
         AccountRole.objects.get_or_create(
@@ -336,19 +473,20 @@ def approve_mechanic(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@admin_permission_required('manage_verifications')
 def reject_mechanic(request):
     """
     Reject a mechanic application
     Admin-only endpoint
     """
     try:
-        admin_id = request.data.get('admin_id')
+        admin_id = request.admin_id
         mechanic_id = request.data.get('mechanic_id')
         reason = request.data.get('reason', 'Application requirements not met')
         
-        if not admin_id or not mechanic_id:
+        if not mechanic_id:
             return Response({
-                'error': 'admin_id and mechanic_id are required'
+                'error': 'mechanic_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Get admin account
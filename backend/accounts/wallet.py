@@ -0,0 +1,145 @@
+"""
+Token wallets.
+
+Mechanic.token_wallet and ShopOwner.token_wallet hold the current balance.
+Every change goes through this module: the balance is moved with a single
+F() UPDATE (debits are guarded by token_wallet >= amount, so a wallet never
+goes negative and concurrent writers cannot lose updates) and an append-only
+TokenLedger entry is written in the same transaction. TokenBalanceSnapshot
+rows are taken periodically so balance_at() only sums the entries written
+since the closest snapshot.
+"""
+from decimal import Decimal, ROUND_CEILING
+
+from django.db import transaction
+from django.db.models import F, Sum, Max
+from django.utils import timezone
+
+from .models import Mechanic, ShopOwner, TokenLedger, TokenBalanceSnapshot, TokenPurchase
+
+
+# Wallet models in lookup order; an account with both profiles uses its mechanic wallet
+WALLET_MODELS = (Mechanic, ShopOwner)
+
+
+class NoTokenWallet(ValueError):
+    pass
+
+
+class InsufficientTokens(ValueError):
+    pass
+
+
+def _wallet_model(account_id):
+    for model in WALLET_MODELS:
+        if model.objects.filter(pk=account_id).exists():
+            return model
+    raise NoTokenWallet(f'Account {account_id} has no token wallet')
+
+
+def get_balance(account_id):
+    return _wallet_model(account_id).objects.values_list('token_wallet', flat=True).get(pk=account_id)
+
+
+def tokens_for_category(service_category):
+    """Tokens charged for a service category; fractional worth rounds up"""
+    return int(Decimal(service_category.worth_token or 0).to_integral_value(rounding=ROUND_CEILING))
+
+
+def record(account_id, entry_type, amount, **fields):
+    """
+    Move a wallet balance by a signed amount and append the ledger entry.
+    Raises InsufficientTokens when a debit would take the balance below zero.
+    """
+    amount = int(amount)
+    model = _wallet_model(account_id)
+    with transaction.atomic():
+        wallet = model.objects.filter(pk=account_id)
+        if amount < 0:
+            wallet = wallet.filter(token_wallet__gte=-amount)
+        if not wallet.update(token_wallet=F('token_wallet') + amount):
+            raise InsufficientTokens(f'Account {account_id} has fewer than {-amount} tokens')
+        return TokenLedger.objects.create(account_id=account_id, entry_type=entry_type, amount=amount, **fields)
+
+
+def purchase(token_purchase):
+    """Credit a completed TokenPurchase; crediting the same purchase twice is a no-op"""
+    with transaction.atomic():
+        locked = TokenPurchase.objects.select_for_update().get(pk=token_purchase.pk)
+        entry = locked.ledger_entries.first()
+        if entry is None:
+            entry = record(
+                locked.account_id, 'purchase', locked.tokens_amount,
+                token_purchase=locked, note=f'Purchase #{locked.token_purchase_id}'
+            )
+    return entry
+
+
+def spend(account_id, service_category, note=None):
+    return record(
+        account_id, 'spend', -tokens_for_category(service_category),
+        service_category=service_category, note=note
+    )
+
+
+def refund(account_id, amount, service_category=None, note=None):
+    return record(account_id, 'refund', abs(int(amount)), service_category=service_category, note=note)
+
+
+def adjust(account_id, amount, admin_id=None, note=None):
+    return record(account_id, 'adjustment', amount, created_by_id=admin_id, note=note)
+
+
+def balance_at(account_id, at):
+    """Wallet balance as of a point in time: closest snapshot plus the entries after it"""
+    snapshot = TokenBalanceSnapshot.objects.filter(
+        account_id=account_id, taken_at__lte=at
+    ).order_by('-taken_at', '-last_entry_id').first()
+
+    entries = TokenLedger.objects.filter(account_id=account_id, created_at__lte=at)
+    balance = 0
+    if snapshot:
+        entries = entries.filter(entry_id__gt=snapshot.last_entry_id)
+        balance = snapshot.balance
+    return balance + (entries.aggregate(total=Sum('amount'))['total'] or 0)
+
+
+def take_snapshot(account_id):
+    """
+    Snapshot an account's balance after its latest ledger entry. The wallet row
+    is locked so no entry can be written while the snapshot is computed.
+    Returns (snapshot or None when nothing changed, current wallet balance).
+    """
+    model = _wallet_model(account_id)
+    with transaction.atomic():
+        wallet_balance = model.objects.select_for_update().values_list('token_wallet', flat=True).get(pk=account_id)
+        previous = TokenBalanceSnapshot.objects.filter(account_id=account_id).order_by('-last_entry_id').first()
+
+        entries = TokenLedger.objects.filter(account_id=account_id)
+        if previous:
+            entries = entries.filter(entry_id__gt=previous.last_entry_id)
+        totals = entries.aggregate(total=Sum('amount'), last_entry_id=Max('entry_id'))
+        if totals['last_entry_id'] is None:
+            return None, wallet_balance
+
+        snapshot = TokenBalanceSnapshot.objects.create(
+            account_id=account_id,
+            last_entry_id=totals['last_entry_id'],
+            balance=(previous.balance if previous else 0) + totals['total'],
+            taken_at=timezone.now()
+        )
+    return snapshot, wallet_balance
+
+
+def accounts_needing_snapshot():
+    """Account ids with ledger entries newer than their latest snapshot"""
+    latest_entries = dict(
+        TokenLedger.objects.values('account_id').annotate(last=Max('entry_id')).values_list('account_id', 'last')
+    )
+    snapshotted = dict(
+        TokenBalanceSnapshot.objects.values('account_id').annotate(last=Max('last_entry_id')).values_list('account_id', 'last')
+    )
+    return sorted(
+        account_id for account_id, last in latest_entries.items()
+        if last > snapshotted.get(account_id, 0)
+    )
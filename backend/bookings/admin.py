@@ -1,3 +1,12 @@
 from django.contrib import admin
+from accounts.admin_mixins import LeanAdminMixin
+from .models import Booking
 
-# Register your models here.
+
+@admin.register(Booking)
+class BookingAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['booking_id', 'request_id', 'status', 'amount_fee', 'booked_at', 'completed_at']
+    list_filter = ['status']
+    search_fields = ['=booking_id', '=request__request_id']
+    readonly_fields = ['booked_at', 'updated_at']
+    ordering = ['-booking_id']
@@ -0,0 +1,214 @@
+"""
+Mechanic availability calendar.
+
+Free slots are derived from the configured working hours minus the
+ServiceTime slots already committed to the mechanic's open requests and
+active bookings. Each (mechanic, day) result is cached and dropped whenever
+a booking, request or service time touching that mechanic changes state.
+
+The cache is best-effort: invalidation only reaches the default cache of
+the process that made the change, and without a shared CACHES backend
+that is per-process memory. Other workers can show a taken slot as free
+for up to CACHE_TIMEOUT, so callers committing a slot must not rely on it.
+"""
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from requests.models import Request
+from service_details.models import ServiceTime
+
+
+# Also bounds how long other workers can serve a stale day (see the module docstring)
+CACHE_TIMEOUT = 60 * 5  # 5 minutes
+
+# Bookings in these states still occupy their scheduled slot
+ACTIVE_BOOKING_STATUSES = ('active', 'rescheduled', 'back_jobs')
+
+# Requests in these states hold their slot before a booking exists
+OPEN_REQUEST_STATUSES = ('pending', 'qouted')
+
+DEFAULT_WORKING_HOURS = {
+    'start': '08:00',
+    'end': '17:00',
+    'slot_minutes': 60,
+}
+
+
+def get_working_hours():
+    """
+    Return (start, end, slot_minutes) from settings.MECHANIC_WORKING_HOURS
+    """
+    config = {**DEFAULT_WORKING_HOURS, **getattr(settings, 'MECHANIC_WORKING_HOURS', {})}
+    start = datetime.strptime(config['start'], '%H:%M').time()
+    end = datetime.strptime(config['end'], '%H:%M').time()
+    return start, end, int(config['slot_minutes'])
+
+
+def cache_key(mechanic_id, day):
+    return f'mechanic_availability_{mechanic_id}_{day.isoformat()}'
+
+
+def _slot_starts(day):
+    start, end, slot_minutes = get_working_hours()
+    current = datetime.combine(day, start)
+    day_end = datetime.combine(day, end)
+    step = timedelta(minutes=slot_minutes)
+    slots = []
+    while current + step <= day_end:
+        slots.append(current.time())
+        current += step
+    return slots
+
+
+def _slot_for(day, value, slots, step):
+    """Return the slot start that contains the given time, if any"""
+    match = None
+    for slot in slots:
+        if slot <= value:
+            match = slot
+        else:
+            break
+    # Times past the end of the last slot fall outside working hours
+    if match is not None and datetime.combine(day, value) >= datetime.combine(day, match) + step:
+        return None
+    return match
+
+
+def _committed_times(mechanic_id, days):
+    """
+    Fetch (date, time) pairs committed for the mechanic on the given days
+    in a single query across every ServiceTime owner type.
+    """
+    holding_requests = Request.objects.filter(
+        Q(request_status__in=OPEN_REQUEST_STATUSES) |
+        Q(request_status='accepted', bookings__status__in=ACTIVE_BOOKING_STATUSES),
+        provider_id=mechanic_id,
+    ).values('request_id')
+
+    direct_q = Q(direct_request__request__in=holding_requests)
+    custom_q = Q(custom_request__request__in=holding_requests)
+    reschedule_q = Q(
+        reschedule__booking__request__provider_id=mechanic_id,
+        reschedule__status__in=['pending', 'approved'],
+        reschedule__booking__status__in=ACTIVE_BOOKING_STATUSES,
+    )
+    back_jobs_q = Q(
+        back_jobs__booking__request__provider_id=mechanic_id,
+        back_jobs__status__in=['pending', 'approved'],
+        back_jobs__booking__status__in=ACTIVE_BOOKING_STATUSES,
+    )
+
+    return ServiceTime.objects.filter(
+        direct_q | custom_q | reschedule_q | back_jobs_q,
+        date__in=days,
+        time__isnull=False,
+    ).values_list('date', 'time')
+
+
+def compute_availability(mechanic_id, days):
+    """
+    Build availability for each day without touching the cache.
+    Returns a dict of {date: {'free': [...], 'booked': [...]}}.
+    """
+    busy = {day: set() for day in days}
+    slots_by_day = {day: _slot_starts(day) for day in days}
+    step = timedelta(minutes=get_working_hours()[2])
+
+    for day, value in _committed_times(mechanic_id, days):
+        slot = _slot_for(day, value, slots_by_day[day], step)
+        if slot is not None:
+            busy[day].add(slot)
+
+    result = {}
+    for day in days:
+        result[day] = {
+            'free': [s.strftime('%H:%M') for s in slots_by_day[day] if s not in busy[day]],
+            'booked': sorted(s.strftime('%H:%M') for s in busy[day]),
+        }
+    return result
+
+
+def get_availability(mechanic_id, start_day, end_day):
+    """
+    Return availability for every day in [start_day, end_day] using the
+    per-(mechanic, day) cache, computing all misses with one query.
+    """
+    days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+    keys = {cache_key(mechanic_id, day): day for day in days}
+
+    cached = cache.get_many(list(keys))
+    missing = [day for key, day in keys.items() if key not in cached]
+
+    if missing:
+        computed = compute_availability(mechanic_id, missing)
+        cache.set_many(
+            {cache_key(mechanic_id, day): data for day, data in computed.items()},
+            timeout=CACHE_TIMEOUT
+        )
+        for day, data in computed.items():
+            cached[cache_key(mechanic_id, day)] = data
+
+    return [{'date': day.isoformat(), **cached[cache_key(mechanic_id, day)]} for day in days]
+
+
+def invalidate(mechanic_id, days):
+    if mechanic_id and days:
+        cache.delete_many([cache_key(mechanic_id, day) for day in set(days)])
+
+
+def invalidate_for_requests(request_ids):
+    """
+    Drop cached days for every ServiceTime tied to the given requests,
+    either directly or through their bookings' reschedules and back jobs.
+    """
+    request_ids = list(request_ids)
+    if not request_ids:
+        return
+
+    providers = dict(
+        Request.objects.filter(request_id__in=request_ids, provider__isnull=False)
+        .values_list('request_id', 'provider_id')
+    )
+    if not providers:
+        return
+
+    rows = ServiceTime.objects.filter(
+        Q(direct_request__request_id__in=providers) |
+        Q(custom_request__request_id__in=providers) |
+        Q(reschedule__booking__request_id__in=providers) |
+        Q(back_jobs__booking__request_id__in=providers),
+        date__isnull=False,
+    ).values_list(
+        'date', 'direct_request_id', 'custom_request_id',
+        'reschedule__booking__request_id', 'back_jobs__booking__request_id'
+    )
+
+    keys = set()
+    for day, *owners in rows:
+        request_id = next((owner for owner in owners if owner in providers), None)
+        if request_id is not None:
+            keys.add(cache_key(providers[request_id], day))
+    if keys:
+        cache.delete_many(list(keys))
+
+
+def invalidate_for_service_time(service_time):
+    """Drop the cached day a single ServiceTime row belongs to"""
+    if service_time.date is None:
+        return
+
+    if service_time.direct_request_id or service_time.custom_request_id:
+        request_id = service_time.direct_request_id or service_time.custom_request_id
+        request_filter = Q(request_id=request_id)
+    elif service_time.reschedule_id:
+        request_filter = Q(bookings__reschedules=service_time.reschedule_id)
+    elif service_time.back_jobs_id:
+        request_filter = Q(bookings__back_jobs=service_time.back_jobs_id)
+    else:
+        return
+
+    provider_id = Request.objects.filter(request_filter).values_list('provider_id', flat=True).first()
+    invalidate(provider_id, [service_time.date])
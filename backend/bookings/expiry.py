@@ -0,0 +1,196 @@
+"""
+Expiry sweeper for rows that stay pending forever.
+
+Each sweep walks its (status, age) index in bounded batches, flips the
+selected rows to expired with a single UPDATE and sends the matching
+notifications with one bulk insert per batch. Rows are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED where the database supports it, so
+several nodes can run the sweeper at the same time without double work.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Notification, PasswordReset
+from requests.models import Request
+from .models import Booking, RescheduledBooking, BackJobsBooking
+from . import availability
+
+
+DEFAULT_MAX_AGE_HOURS = {
+    'requests': 72,
+    'reschedules': 48,
+    'back_jobs': 72,
+    'password_resets': 24,
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def get_max_age(name):
+    config = {**DEFAULT_MAX_AGE_HOURS, **getattr(settings, 'STALE_RECORD_MAX_AGE_HOURS', {})}
+    return timedelta(hours=config[name])
+
+
+def _claim(queryset, batch_size):
+    """Lock and return one batch of rows, skipping rows another node holds"""
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    return list(queryset[:batch_size])
+
+
+def _expire_requests(now, batch_size):
+    cutoff = now - get_max_age('requests')
+    rows = _claim(
+        Request.objects.filter(request_status='pending', created_at__lt=cutoff)
+        .order_by('created_at')
+        .values_list('request_id', 'client_id', 'request_type'),
+        batch_size
+    )
+    if not rows:
+        return 0
+
+    ids = [row[0] for row in rows]
+    Request.objects.filter(request_id__in=ids, request_status='pending').update(
+        request_status='expired', updated_at=now
+    )
+    Notification.objects.bulk_create([
+        Notification(
+            receiver_id=client_id,
+            title='Request Expired',
+            message=f'Your {request_type} request #{request_id} expired before a mechanic responded.',
+            type='warning'
+        )
+        for request_id, client_id, request_type in rows
+    ])
+    availability.invalidate_for_requests(ids)
+    return len(rows)
+
+
+def _expire_reschedules(now, batch_size):
+    cutoff = now - get_max_age('reschedules')
+    rows = _claim(
+        RescheduledBooking.objects.filter(status='pending', requested_at__lt=cutoff)
+        .order_by('requested_at')
+        .values_list('rescheduled_booking_id', 'booking_id', 'requested_by_id'),
+        batch_size
+    )
+    if not rows:
+        return 0
+
+    ids = [row[0] for row in rows]
+    booking_ids = {row[1] for row in rows}
+    RescheduledBooking.objects.filter(rescheduled_booking_id__in=ids, status='pending').update(
+        status='expired', updated_at=now
+    )
+    # Bookings go back to active once no reschedule is waiting on them
+    Booking.objects.filter(booking_id__in=booking_ids, status='rescheduled').exclude(
+        reschedules__status='pending'
+    ).update(status='active', updated_at=now)
+
+    Notification.objects.bulk_create([
+        Notification(
+            receiver_id=requested_by_id,
+            title='Reschedule Request Expired',
+            message=f'Your reschedule request for booking #{booking_id} expired without a response.',
+            type='warning'
+        )
+        for _, booking_id, requested_by_id in rows if requested_by_id
+    ])
+    availability.invalidate_for_requests(
+        Booking.objects.filter(booking_id__in=booking_ids).values_list('request_id', flat=True)
+    )
+    return len(rows)
+
+
+def _expire_back_jobs(now, batch_size):
+    cutoff = now - get_max_age('back_jobs')
+    rows = _claim(
+        BackJobsBooking.objects.filter(status='pending', created_at__lt=cutoff)
+        .order_by('created_at')
+        .values_list('back_jobs_booking_id', 'booking_id', 'requested_by_id'),
+        batch_size
+    )
+    if not rows:
+        return 0
+
+    ids = [row[0] for row in rows]
+    booking_ids = {row[1] for row in rows}
+    BackJobsBooking.objects.filter(back_jobs_booking_id__in=ids, status='pending').update(
+        status='expired', updated_at=now
+    )
+    # The original job stands as completed when its back job lapses
+    Booking.objects.filter(booking_id__in=booking_ids, status='back_jobs').exclude(
+        back_jobs__status='pending'
+    ).update(status='completed', updated_at=now)
+
+    Notification.objects.bulk_create([
+        Notification(
+            receiver_id=requested_by_id,
+            title='Back Job Request Expired',
+            message=f'Your back job request for booking #{booking_id} expired without a response.',
+            type='warning'
+        )
+        for _, booking_id, requested_by_id in rows if requested_by_id
+    ])
+    availability.invalidate_for_requests(
+        Booking.objects.filter(booking_id__in=booking_ids).values_list('request_id', flat=True)
+    )
+    return len(rows)
+
+
+def _expire_password_resets(now, batch_size):
+    # Resets carry their own expiry; older rows without one fall back to the max age
+    cutoff = now - get_max_age('password_resets')
+    ids = _claim(
+        PasswordReset.objects.filter(status=PasswordReset.STATUS_PENDING, expires_at__lt=now)
+        .order_by('expires_at')
+        .values_list('reset_id', flat=True),
+        batch_size
+    )
+    if len(ids) < batch_size:
+        ids += _claim(
+            PasswordReset.objects.filter(
+                status=PasswordReset.STATUS_PENDING, expires_at__isnull=True, requested_at__lt=cutoff
+            ).values_list('reset_id', flat=True),
+            batch_size - len(ids)
+        )
+    if not ids:
+        return 0
+
+    PasswordReset.objects.filter(reset_id__in=ids, status=PasswordReset.STATUS_PENDING).update(
+        status=PasswordReset.STATUS_EXPIRED
+    )
+    return len(ids)
+
+
+SWEEPS = {
+    'requests': _expire_requests,
+    'reschedules': _expire_reschedules,
+    'back_jobs': _expire_back_jobs,
+    'password_resets': _expire_password_resets,
+}
+
+
+def sweep(names=None, batch_size=DEFAULT_BATCH_SIZE, max_batches=None):
+    """
+    Expire stale rows for the given sweeps (all by default).
+    Every batch commits on its own so locks are held only briefly.
+    Returns a dict of {sweep name: rows expired}.
+    """
+    results = {}
+    for name in names or SWEEPS:
+        expire = SWEEPS[name]
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with transaction.atomic():
+                count = expire(timezone.now(), batch_size)
+            total += count
+            batches += 1
+            if count < batch_size:
+                break
+        results[name] = total
+    return results
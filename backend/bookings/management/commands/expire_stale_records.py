@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings import expiry
+
+
+class Command(BaseCommand):
+    help = 'Expire stale pending requests, reschedules, back jobs and password resets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            choices=list(expiry.SWEEPS),
+            help='Run only the given sweeps',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=expiry.DEFAULT_BATCH_SIZE,
+            help='Rows expired per transaction',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping every --interval seconds instead of exiting',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between sweeps when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            results = expiry.sweep(options['only'], batch_size=options['batch_size'])
+            summary = ', '.join(f'{name}: {count}' for name, count in results.items())
+            self.stdout.write(self.style.SUCCESS(f'Expired stale records ({summary})'))
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
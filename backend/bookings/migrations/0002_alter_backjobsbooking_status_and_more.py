@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_passwordreset_pwreset_status_expires_idx'),
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backjobsbooking',
+            name='status',
+            field=models.CharField(choices=[('pending', 'pending'), ('approved', 'approved'), ('rejected', 'rejected'), ('completed', 'completed'), ('expired', 'expired')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='backjobsbooking',
+            index=models.Index(fields=['status', 'created_at'], name='backjob_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rescheduledbooking',
+            index=models.Index(fields=['status', 'requested_at'], name='reschedule_status_req_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_tokenrevocation'),
+        ('bookings', '0002_alter_backjobsbooking_status_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['created_at', 'dispute_id'], name='dispute_created_idx'),
+        ),
+    ]
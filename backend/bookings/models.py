@@ -1,5 +1,23 @@
 from django.db import models
 
+from requests.models import LIST_DEFERRED_FIELDS
+
+
+class BookingQuerySet(models.QuerySet):
+    def for_list(self):
+        """
+        List-mode bookings: request, people and request details joined in
+        one query, without the large media and text columns.
+        """
+        return self.select_related(
+            'request__client__client_id',
+            'request__provider',
+            'request__custom_request',
+            'request__emergency_request',
+            'request__direct_request__service',
+        ).defer(*(f'request__{field}' for field in LIST_DEFERRED_FIELDS))
+
+
 class Booking(models.Model):
     STATUS_CHOICES = [
         ('active','active'),
@@ -19,6 +37,11 @@ class Booking(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = BookingQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Booking #{self.booking_id} - {self.status}"
+
 
 class ActiveBooking(models.Model):
     active_booking_id = models.AutoField(primary_key=True)
@@ -40,6 +63,11 @@ class RescheduledBooking(models.Model):
     requested_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'requested_at'], name='reschedule_status_req_idx'),
+        ]
+
 
 class CancelledBooking(models.Model):
     cancelled_booking_id = models.AutoField(primary_key=True)
@@ -57,12 +85,17 @@ class BackJobsBooking(models.Model):
     booking = models.ForeignKey('bookings.Booking', on_delete=models.CASCADE, related_name='back_jobs')
     requested_by = models.ForeignKey('accounts.Account', on_delete=models.SET_NULL, null=True, blank=True, related_name='back_jobs_requests')
     reason = models.TextField(null=True, blank=True)
-    STATUS_CHOICES = [('pending','pending'),('approved','approved'),('rejected','rejected'),('completed','completed')]
+    STATUS_CHOICES = [('pending','pending'),('approved','approved'),('rejected','rejected'),('completed','completed'),('expired','expired')]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='backjob_status_created_idx'),
+        ]
+
 
 class Dispute(models.Model):
     dispute_id = models.AutoField(primary_key=True)
@@ -80,6 +113,11 @@ class Dispute(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'dispute_id'], name='dispute_created_idx'),
+        ]
+
 
 class RefundedBooking(models.Model):
     refunded_booking_id = models.AutoField(primary_key=True)
@@ -348,12 +348,10 @@ class BookingListSerializer(serializers.ModelSerializer):
     def get_request_summary(self, obj):
         """Get a summary of the request based on type"""
         if obj.request.request_type == 'custom' and hasattr(obj.request, 'custom_request'):
-            description = obj.request.custom_request.description or "No description"
-            return description[:100] + "..." if len(description) > 100 else description
+            return obj.request.custom_request.summary or "No description"
         elif obj.request.request_type == 'direct' and hasattr(obj.request, 'direct_request'):
             service_name = obj.request.direct_request.service.name if obj.request.direct_request.service else "Unknown Service"
             return f"Direct service request: {service_name}"
         elif obj.request.request_type == 'emergency' and hasattr(obj.request, 'emergency_request'):
-            description = obj.request.emergency_request.description or "Emergency request"
-            return description[:100] + "..." if len(description) > 100 else description
+            return obj.request.emergency_request.summary or "Emergency request"
         return "Booking details unavailable"
\ No newline at end of file
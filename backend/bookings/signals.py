@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from requests.models import Request
+from service_details.models import ServiceTime
+from .models import Booking, RescheduledBooking, BackJobsBooking
+from . import availability
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_changed(sender, instance, **kwargs):
+    """Booking state changes free or occupy the mechanic's slots"""
+    availability.invalidate_for_requests([instance.request_id])
+
+
+@receiver(post_save, sender=RescheduledBooking)
+@receiver(post_save, sender=BackJobsBooking)
+def booking_followup_changed(sender, instance, **kwargs):
+    availability.invalidate_for_requests(
+        Booking.objects.filter(booking_id=instance.booking_id).values_list('request_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Request)
+def request_changed(sender, instance, **kwargs):
+    """Declined or quoted requests change which slots are held"""
+    if not kwargs.get('created'):
+        availability.invalidate_for_requests([instance.request_id])
+
+
+@receiver(post_save, sender=ServiceTime)
+@receiver(post_delete, sender=ServiceTime)
+def service_time_changed(sender, instance, **kwargs):
+    availability.invalidate_for_service_time(instance)
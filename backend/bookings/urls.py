@@ -13,6 +13,7 @@ urlpatterns = [
     
     # Mechanic bookings
     path('mechanic/', views.mechanic_bookings_list, name='mechanic_bookings_list'),
+    path('mechanic/<int:mechanic_id>/availability/', views.mechanic_availability, name='mechanic_availability'),
     
     path('<int:booking_id>/', views.booking_detail, name='booking_detail'),
     path('<int:booking_id>/complete/', views.complete_booking, name='complete_booking'),
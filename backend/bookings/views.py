@@ -16,6 +16,10 @@ from .serializers import (
     DisputeSerializer, RefundedBookingSerializer
 )
 from accounts.models import Client
+from payment import ledger
+from . import availability
+
+MAX_AVAILABILITY_DAYS = 31
 
 
 @api_view(['GET'])
@@ -54,16 +58,7 @@ def client_bookings_list(request):
     bookings = Booking.objects.filter(
         request__client=client,
         status=backend_status
-    ).select_related(
-        'request',
-        'request__client',
-        'request__client__client_id',
-        'request__provider'
-    ).prefetch_related(
-        'request__custom_request',
-        'request__direct_request',
-        'request__emergency_request'
-    ).order_by('-booked_at')
+    ).for_list().order_by('-booked_at')
     
     serializer = BookingListSerializer(bookings, many=True)
     
@@ -113,10 +108,11 @@ def booking_detail(request, booking_id):
                             status=status.HTTP_400_BAD_REQUEST
                         )
                 
-                booking.status = new_status
                 if new_status == 'completed':
-                    booking.completed_at = timezone.now()
-                booking.save()
+                    ledger.complete_booking(booking)
+                else:
+                    booking.status = new_status
+                    booking.save()
                 
                 serializer = BookingSerializer(booking)
                 return Response(serializer.data)
@@ -588,15 +584,7 @@ def mechanic_bookings_list(request):
     # Get bookings for this mechanic
     bookings = Booking.objects.filter(
         **query_filter
-    ).select_related(
-        'request',
-        'request__client',
-        'request__client__client_id'
-    ).prefetch_related(
-        'request__custom_request',
-        'request__direct_request',
-        'request__emergency_request'
-    ).order_by('-booked_at')
+    ).for_list().order_by('-booked_at')
     
     # Serialize the bookings
     serializer = BookingListSerializer(bookings, many=True)
@@ -646,23 +634,8 @@ def complete_booking(request, booking_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update booking status to completed
-        booking.status = 'completed'
-        booking.completed_at = timezone.now()
-        booking.save()
-        
-        # Create CompletedBooking record if needed
-        try:
-            CompletedBooking.objects.get_or_create(
-                booking=booking,
-                defaults={
-                    'status': 'completed',
-                    'completed_at': booking.completed_at
-                }
-            )
-        except Exception as e:
-            # Log but don't fail if CompletedBooking creation fails
-            print(f"Warning: Could not create CompletedBooking: {e}")
+        # Complete the booking and write its ledger transaction atomically
+        ledger.complete_booking(booking)
         
         # Serialize and return the updated booking
         serializer = BookingSerializer(booking)
@@ -833,19 +806,8 @@ def mark_booking_complete(request):
     except Booking.DoesNotExist:
         return Response({'error': 'Booking not found'}, status=status.HTTP_404_NOT_FOUND)
     
-    # Update booking status to completed
-    from django.utils import timezone
-    booking.status = 'completed'
-    booking.completed_at = timezone.now()
-    booking.save()
-    
-    # Create CompletedBooking entry if it doesn't exist
-    completed_booking, created = CompletedBooking.objects.get_or_create(
-        booking=booking,
-        defaults={
-            'completed_at': timezone.now()
-        }
-    )
+    # Complete the booking and write its ledger transaction atomically
+    ledger.complete_booking(booking)
     
     # Send notification to provider
     from accounts.models import Notification
@@ -954,6 +916,50 @@ def accept_backjob(request, backjob_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+def mechanic_availability(request, mechanic_id):
+    """
+    Get free and booked time slots for a mechanic between two dates
+    GET /api/bookings/mechanic/<mechanic_id>/availability/?from=YYYY-MM-DD&to=YYYY-MM-DD
+    """
+    from datetime import date, timedelta
+
+    today = timezone.localdate()
+    try:
+        start_day = date.fromisoformat(request.GET['from']) if request.GET.get('from') else today
+        end_day = date.fromisoformat(request.GET['to']) if request.GET.get('to') else start_day + timedelta(days=6)
+    except ValueError:
+        return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if end_day < start_day:
+        return Response({'error': '"to" must not be before "from"'}, status=status.HTTP_400_BAD_REQUEST)
+    if (end_day - start_day).days >= MAX_AVAILABILITY_DAYS:
+        return Response(
+            {'error': f'Date range cannot exceed {MAX_AVAILABILITY_DAYS} days'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not Mechanic.objects.filter(mechanic_id=mechanic_id).exists():
+        return Response({'error': 'Mechanic not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    days = availability.get_availability(mechanic_id, start_day, end_day)
+
+    # Slots that already started are never offered, but the cached day stays intact
+    now = timezone.localtime().strftime('%H:%M')
+    for day in days:
+        if day['date'] < today.isoformat():
+            day['free'] = []
+        elif day['date'] == today.isoformat():
+            day['free'] = [slot for slot in day['free'] if slot > now]
+
+    return Response({
+        'mechanic_id': mechanic_id,
+        'from': start_day.isoformat(),
+        'to': end_day.isoformat(),
+        'days': days
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 def health_check(request):
     """Health check endpoint for bookings API"""
@@ -63,6 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'accounts.middleware.AuditLogMiddleware',
 ]
 
 # Disable CSRF for development (enable in production with proper setup)
@@ -249,7 +250,12 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'USER_ID_FIELD': 'acc_id',  # Account model uses acc_id as primary key, not id
     'USER_ID_CLAIM': 'acc_id',  # Include acc_id in JWT payload
+    # Rejects refresh tokens issued before a revocation (see accounts.revocation)
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.AccountTokenRefreshSerializer',
 }
+
+# In-process token revocation sets are reloaded from the database at most this often
+TOKEN_REVOCATION_REFRESH_SECONDS = 5
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
@@ -259,4 +265,27 @@ EMAIL_HOST_PASSWORD = 'vrzatuzbyyxvwszp'
 DEFAULT_FROM_EMAIL = 'MechConnect <mechconnect.app@gmail.com>'
 
 # Email verification token expiry (in seconds) - 24 hours
-EMAIL_VERIFICATION_TIMEOUT = 86400
\ No newline at end of file
+EMAIL_VERIFICATION_TIMEOUT = 86400
+# Mechanic availability calendar - working hours used to build bookable slots
+MECHANIC_WORKING_HOURS = {
+    'start': '08:00',
+    'end': '17:00',
+    'slot_minutes': 60,
+}
+
+# Pending rows older than these ages (hours) are expired by the expire_stale_records command
+STALE_RECORD_MAX_AGE_HOURS = {
+    'requests': 72,
+    'reschedules': 48,
+    'back_jobs': 72,
+    'password_resets': 24,
+}
+
+# Content-addressed store for payment proof images (see payment.blobstore)
+PAYMENT_PROOF_ROOT = BASE_DIR / 'media' / 'payment_proofs'
+
+# Head admin dashboard stats are recomputed at most this often (see accounts.stats)
+DASHBOARD_STATS_CACHE_SECONDS = 30
+
+# Seconds an admin holds a claimed moderation item before it returns to the queue (see accounts.moderation)
+MODERATION_LEASE_SECONDS = 900
@@ -1,9 +1,13 @@
 from django.contrib import admin
-from .models import TokenPurchase, Payment, CommissionSettings, Transaction, Payout, TokenPackage
+from accounts.admin_mixins import LeanAdminMixin
+from .models import (
+    TokenPurchase, Payment, CommissionSettings, Transaction, Payout, TokenPackage, ProviderEarnings, BookingPayment,
+    FinancialDailyRollup, TokenSalesDailyRollup, ReconciliationRun, ReconciliationMismatch
+)
 
 
 @admin.register(TokenPurchase)
-class TokenPurchaseAdmin(admin.ModelAdmin):
+class TokenPurchaseAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['token_purchase_id', 'account', 'tokens_amount', 'price', 'status', 'purchased_at']
     list_filter = ['status', 'purchased_at']
     search_fields = ['account__username', 'account__email']
@@ -12,8 +16,8 @@ class TokenPurchaseAdmin(admin.ModelAdmin):
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
-    list_display = ['payment_id', 'request', 'amount', 'status', 'created_at']
+class PaymentAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['payment_id', 'request_id', 'amount', 'status', 'created_at']
     list_filter = ['status', 'created_at']
     search_fields = ['request__request_id']
     readonly_fields = ['created_at']
@@ -21,7 +25,7 @@ class PaymentAdmin(admin.ModelAdmin):
 
 
 @admin.register(CommissionSettings)
-class CommissionSettingsAdmin(admin.ModelAdmin):
+class CommissionSettingsAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['settings_id', 'default_commission_rate', 'mechanic_bronze_rate', 
                     'mechanic_silver_rate', 'mechanic_gold_rate', 'shop_commission_rate', 'updated_at']
     readonly_fields = ['created_at', 'updated_at']
@@ -42,19 +46,19 @@ class CommissionSettingsAdmin(admin.ModelAdmin):
 
 
 @admin.register(Transaction)
-class TransactionAdmin(admin.ModelAdmin):
+class TransactionAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['transaction_id', 'booking', 'provider', 'client', 'total_amount', 
                     'commission_amount', 'provider_payout', 'status', 'payout_status', 'transaction_date']
-    list_filter = ['status', 'payout_status', 'transaction_date']
+    list_filter = ['status', 'payout_status', 'commission_tier', 'transaction_date']
     search_fields = ['booking__booking_id', 'provider__username', 'client__username']
     readonly_fields = ['transaction_date', 'updated_at']
-    ordering = ['-transaction_date']
+    ordering = ['-transaction_id']
     fieldsets = (
         ('Transaction Info', {
             'fields': ('booking', 'provider', 'client', 'status')
         }),
         ('Financial Details', {
-            'fields': ('total_amount', 'commission_rate', 'commission_amount', 'provider_payout', 'payment_method')
+            'fields': ('total_amount', 'commission_tier', 'commission_rate', 'commission_amount', 'provider_payout', 'payment_method')
         }),
         ('Payout Status', {
             'fields': ('payout_status', 'payout_date')
@@ -65,14 +69,40 @@ class TransactionAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ProviderEarnings)
+class ProviderEarningsAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['earnings_id', 'provider', 'day', 'gross_amount', 'commission_amount',
+                    'net_amount', 'paid_out_amount', 'transaction_count']
+    list_filter = ['day']
+    search_fields = ['provider__username', 'provider__email']
+    readonly_fields = ['updated_at']
+    ordering = ['-day']
+
+
+@admin.register(FinancialDailyRollup)
+class FinancialDailyRollupAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['rollup_id', 'day', 'provider_type', 'revenue', 'commission',
+                    'refunds', 'payouts', 'booking_count', 'refund_count']
+    list_filter = ['provider_type', 'day']
+    readonly_fields = ['updated_at']
+    ordering = ['-day']
+
+
+@admin.register(TokenSalesDailyRollup)
+class TokenSalesDailyRollupAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['rollup_id', 'day', 'package', 'purchase_count', 'tokens_sold', 'revenue']
+    list_filter = ['package', 'day']
+    readonly_fields = ['updated_at']
+    ordering = ['-day']
+
+
 @admin.register(Payout)
-class PayoutAdmin(admin.ModelAdmin):
+class PayoutAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['payout_id', 'recipient', 'amount', 'status', 'requested_at', 'processed_at']
     list_filter = ['status', 'requested_at', 'processed_at']
     search_fields = ['recipient__username', 'recipient__email', 'reference_number']
     readonly_fields = ['requested_at', 'updated_at']
     ordering = ['-requested_at']
-    filter_horizontal = ['transactions']
     fieldsets = (
         ('Payout Info', {
             'fields': ('recipient', 'amount', 'status')
@@ -93,9 +123,34 @@ class PayoutAdmin(admin.ModelAdmin):
 
 
 @admin.register(TokenPackage)
-class TokenPackageAdmin(admin.ModelAdmin):
+class TokenPackageAdmin(LeanAdminMixin, admin.ModelAdmin):
     list_display = ['package_id', 'name', 'tokens', 'price', 'discount_percentage', 'is_active', 'is_featured', 'created_at']
     list_filter = ['is_active', 'is_featured', 'created_at']
     search_fields = ['name', 'description']
     ordering = ['-is_featured', 'tokens']
 
+
+@admin.register(ReconciliationRun)
+class ReconciliationRunAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['run_id', 'status', 'bookings_checked', 'mismatches_found', 'last_booking_id', 'started_at', 'finished_at']
+    list_filter = ['status', 'started_at']
+    readonly_fields = ['started_at', 'updated_at', 'finished_at']
+    ordering = ['-started_at']
+
+
+@admin.register(ReconciliationMismatch)
+class ReconciliationMismatchAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['mismatch_id', 'run', 'booking', 'check_type', 'expected_amount', 'actual_amount', 'record_id']
+    list_filter = ['check_type', 'run']
+    search_fields = ['booking__booking_id']
+    raw_id_fields = ['run', 'booking']
+
+
+@admin.register(BookingPayment)
+class BookingPaymentAdmin(LeanAdminMixin, admin.ModelAdmin):
+    list_display = ['payment_id', 'booking', 'payment_type', 'payment_status', 'payment_method',
+                    'total_amount', 'amount_paid', 'remaining_balance', 'created_at']
+    list_filter = ['payment_status', 'payment_type', 'payment_method']
+    search_fields = ['=booking__booking_id', 'reference_number']
+    readonly_fields = ['remaining_balance', 'created_at', 'updated_at']
+    ordering = ['-payment_id']
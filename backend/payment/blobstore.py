@@ -0,0 +1,124 @@
+"""
+Content-addressed blob store for payment proofs.
+
+Blobs are named by the SHA-256 of their bytes and fanned out into two
+levels of directories (ab/cd/abcd...), so identical uploads are stored once
+and a blob's name never changes. The store is a Django Storage, local disk
+by default, and can be swapped for any other backend through settings.
+"""
+import base64
+import binascii
+import hashlib
+import re
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import LazyObject
+from django.utils.http import content_disposition_header
+
+
+DATA_URL_RE = re.compile(r'^data:(?P<content_type>[\w.+-]+/[\w.+-]+)?(?:;[^,]*)?;base64,', re.IGNORECASE)
+DEFAULT_CONTENT_TYPE = 'application/octet-stream'
+WHITESPACE_RE = re.compile(r'\s+')
+# Types a browser may render inline; anything else (SVG included, it can carry script) is downloaded
+INLINE_CONTENT_TYPES = frozenset({'image/png', 'image/jpeg', 'image/gif', 'image/webp', 'application/pdf'})
+# Proof links are opened without credentials, so they carry a signed, expiring payment id
+PROOF_URL_SALT = 'payment.download_payment_proof'
+PROOF_URL_MAX_AGE = 60 * 60
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, digest):
+        return f'{digest[:2]}/{digest[2:4]}/{digest}'
+
+    def put(self, data):
+        """Store bytes under their SHA-256 and return (digest, size)"""
+        digest = hashlib.sha256(data).hexdigest()
+        name = self.blob_name(digest)
+        if not self.exists(name):
+            self.save(name, ContentFile(data))
+        return digest, len(data)
+
+    def open_blob(self, digest):
+        return self.open(self.blob_name(digest), 'rb')
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content, so an existing file already holds the same bytes
+        return name
+
+
+class DefaultBlobStore(LazyObject):
+    def _setup(self):
+        self._wrapped = ContentAddressedStorage(
+            location=getattr(settings, 'PAYMENT_PROOF_ROOT', settings.BASE_DIR / 'media' / 'payment_proofs')
+        )
+
+
+blob_store = DefaultBlobStore()
+
+
+def is_external_url(value):
+    return bool(value) and value.startswith(('http://', 'https://'))
+
+
+def decode_inline(value):
+    """
+    Decode a data URL or bare base64 string into (bytes, content_type).
+    The client's type is only kept when it is one of INLINE_CONTENT_TYPES,
+    otherwise the content type is DEFAULT_CONTENT_TYPE.
+    Raises ValueError when the value is not strictly valid base64, so text
+    that only happens to contain base64 characters is never taken for data.
+    """
+    content_type = DEFAULT_CONTENT_TYPE
+    match = DATA_URL_RE.match(value)
+    if match:
+        declared = (match.group('content_type') or '').lower()
+        if declared in INLINE_CONTENT_TYPES:
+            content_type = declared
+        value = value[match.end():]
+    # Line breaks and padding spaces are common in stored base64; anything else is invalid
+    value = WHITESPACE_RE.sub('', value)
+    try:
+        return base64.b64decode(value, validate=True), content_type
+    except (binascii.Error, ValueError):
+        raise ValueError('Payment proof is not valid base64 data')
+
+
+def store_inline(value):
+    """Move an inline base64 proof into the blob store; returns (digest, size, content_type)"""
+    data, content_type = decode_inline(value)
+    digest, size = blob_store.put(data)
+    return digest, size, content_type
+
+
+def set_content_headers(response, content_type, filename=None):
+    """
+    Content-Type and Content-Disposition for a body whose type came from an
+    upload: types outside INLINE_CONTENT_TYPES are sent as an attachment, and
+    nosniff stops the browser from guessing a type of its own
+    """
+    inline = content_type in INLINE_CONTENT_TYPES
+    response['Content-Type'] = content_type if inline else DEFAULT_CONTENT_TYPE
+    disposition = content_disposition_header(not inline, filename)
+    if disposition:
+        response['Content-Disposition'] = disposition
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+def sign_proof_id(payment_id):
+    """Grant for download_payment_proof, valid for PROOF_URL_MAX_AGE"""
+    return signing.dumps(payment_id, salt=PROOF_URL_SALT)
+
+
+def unsign_proof_id(grant):
+    """Payment id from a sign_proof_id grant; raises ValueError when invalid or expired"""
+    try:
+        payment_id = signing.loads(grant, salt=PROOF_URL_SALT, max_age=PROOF_URL_MAX_AGE)
+    except signing.BadSignature:
+        raise ValueError('Payment proof link is invalid or has expired')
+    if not isinstance(payment_id, int):
+        raise ValueError('Payment proof link is invalid or has expired')
+    return payment_id
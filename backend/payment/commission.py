@@ -0,0 +1,77 @@
+"""
+Cached access to the CommissionSettings singleton.
+
+Rates are kept in process memory. The settings row's id and updated_at
+(bumped by every save) act as its version: each process reads them with a
+one-row query at most every VERSION_CHECK_SECONDS and reloads the rates when
+they differ from its copy's, so rate changes reach every worker within that
+window without a settings query per commission lookup. The version lives in
+the database, so this needs no shared cache backend.
+"""
+import threading
+import time
+from decimal import Decimal
+
+from .models import CommissionSettings
+
+
+VERSION_CHECK_SECONDS = 5
+
+# CommissionSettings field holding the rate for each commission tier
+TIER_RATE_FIELDS = {
+    'default': 'default_commission_rate',
+    'bronze': 'mechanic_bronze_rate',
+    'silver': 'mechanic_silver_rate',
+    'gold': 'mechanic_gold_rate',
+    'shop': 'shop_commission_rate',
+}
+
+_lock = threading.Lock()
+_state = {'rates': None, 'version': None, 'checked_at': 0.0}
+
+
+def _current_version():
+    """(settings_id, updated_at) of the settings row, or None when there is none"""
+    return CommissionSettings.objects.values_list('settings_id', 'updated_at').first()
+
+
+def rates_for(commission_settings):
+    """Return {tier: Decimal rate} for a CommissionSettings instance"""
+    return {
+        tier: Decimal(str(getattr(commission_settings, field)))
+        for tier, field in TIER_RATE_FIELDS.items()
+    }
+
+
+def _load_rates():
+    return rates_for(CommissionSettings.objects.first() or CommissionSettings())
+
+
+def get_rates():
+    """Return {tier: Decimal rate} from the in-process copy, reloading when stale"""
+    now = time.monotonic()
+    rates = _state['rates']
+    if rates is not None and now - _state['checked_at'] < VERSION_CHECK_SECONDS:
+        return rates
+
+    with _lock:
+        version = _current_version()
+        if _state['rates'] is None or _state['version'] != version:
+            # A save between the two queries only means one more reload next check
+            _state['rates'] = _load_rates()
+            _state['version'] = version
+        _state['checked_at'] = now
+        return _state['rates']
+
+
+def get_rate(tier):
+    return get_rates()[tier]
+
+
+def invalidate():
+    """
+    Drop this process's copy; other workers see the new updated_at on their
+    next version check
+    """
+    with _lock:
+        _state['rates'] = None
@@ -0,0 +1,151 @@
+"""
+Booking completion ledger.
+
+Completing a booking writes its CompletedBooking and payment Transaction in
+the same database transaction as the status change, so financial views can
+read the ledger instead of rebuilding figures from bookings. Provider
+earnings and daily rollups are updated as a follow-up step once the ledger
+row has committed (see payment.signals).
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Case, When, Value, DateTimeField
+from django.utils import timezone
+
+from bookings.models import Booking, CompletedBooking
+from .models import Transaction, ProviderEarnings
+from . import commission, rollups
+
+
+CENT = Decimal('0.01')
+
+
+def get_commission_tier(provider):
+    """
+    Resolve the commission tier for a provider account: shop owners and
+    mechanics working for a shop pay the shop rate, other mechanics pay
+    the rate of their ranking.
+    """
+    if provider is None:
+        return 'default'
+    if hasattr(provider, 'shop_owner_profile'):
+        return 'shop'
+
+    mechanic = getattr(provider, 'mechanic_profile', None)
+    if mechanic is None:
+        return 'default'
+    if mechanic.is_working_for_shop:
+        return 'shop'
+    if mechanic.ranking in commission.TIER_RATE_FIELDS:
+        return mechanic.ranking
+    return 'default'
+
+
+def split_amount(total_amount, rate):
+    """Return (commission_amount, provider_payout) for a total and a percentage rate"""
+    total_amount = Decimal(total_amount or 0).quantize(CENT)
+    commission_amount = (total_amount * Decimal(rate) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+    return commission_amount, total_amount - commission_amount
+
+
+def complete_booking(booking, completed_at=None, notes=None):
+    """
+    Mark a booking completed and write its ledger entries atomically.
+    Safe to call more than once: a booking only ever gets one Transaction.
+    Returns the booking's Transaction.
+    """
+    completed_at = completed_at or timezone.now()
+
+    with transaction.atomic():
+        # Lock the booking so concurrent completions serialize on it
+        locked = Booking.objects.select_for_update().select_related(
+            'request__client', 'request__provider'
+        ).get(booking_id=booking.booking_id)
+
+        locked.status = 'completed'
+        locked.completed_at = locked.completed_at or completed_at
+        locked.save(update_fields=['status', 'completed_at', 'updated_at'])
+
+        CompletedBooking.objects.get_or_create(
+            booking=locked,
+            defaults={'total_amount': locked.amount_fee, 'notes': notes}
+        )
+
+        ledger_entry = locked.transactions.first()
+        if ledger_entry is None:
+            provider = locked.request.provider
+            tier = get_commission_tier(provider)
+            rate = commission.get_rate(tier)
+            commission_amount, payout = split_amount(locked.amount_fee, rate)
+            ledger_entry = Transaction.objects.create(
+                booking=locked,
+                provider=provider,
+                client_id=locked.request.client_id,
+                total_amount=locked.amount_fee,
+                commission_rate=rate,
+                commission_tier=tier,
+                commission_amount=commission_amount,
+                provider_payout=payout,
+                status='completed'
+            )
+
+    booking.status = locked.status
+    booking.completed_at = locked.completed_at
+    return ledger_entry
+
+
+def record_earnings(ledger_entry, sign=1):
+    """Add a committed Transaction to its provider's daily earnings row"""
+    rollups.increment(
+        ProviderEarnings,
+        {'provider_id': ledger_entry.provider_id, 'day': timezone.localdate(ledger_entry.transaction_date)},
+        gross_amount=sign * ledger_entry.total_amount,
+        commission_amount=sign * ledger_entry.commission_amount,
+        net_amount=sign * ledger_entry.provider_payout,
+        transaction_count=sign
+    )
+
+
+def backfill_transactions(batch_size=500):
+    """
+    Write ledger rows for completed bookings that predate the ledger,
+    dated at the booking's completion. Returns the number created.
+    Bulk inserts skip the rollup signals; rebuild rollups afterwards.
+    """
+    created = 0
+    while True:
+        bookings = list(
+            Booking.objects.filter(status='completed', transactions__isnull=True)
+            .select_related('request__provider__mechanic_profile', 'request__provider__shop_owner_profile')
+            .order_by('booking_id')[:batch_size]
+        )
+        if not bookings:
+            return created
+
+        entries = []
+        for booking in bookings:
+            tier = get_commission_tier(booking.request.provider)
+            rate = commission.get_rate(tier)
+            commission_amount, payout = split_amount(booking.amount_fee, rate)
+            entries.append(Transaction(
+                booking=booking,
+                provider_id=booking.request.provider_id,
+                client_id=booking.request.client_id,
+                total_amount=booking.amount_fee,
+                commission_rate=rate,
+                commission_tier=tier,
+                commission_amount=commission_amount,
+                provider_payout=payout,
+                status='completed'
+            ))
+
+        with transaction.atomic():
+            Transaction.objects.bulk_create(entries)
+            # transaction_date is auto_now_add, so restamp it with the completion time
+            Transaction.objects.filter(booking__in=bookings).update(transaction_date=Case(
+                *[When(booking_id=booking.booking_id, then=Value(booking.completed_at or booking.updated_at))
+                  for booking in bookings],
+                output_field=DateTimeField()
+            ))
+        created += len(entries)
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payment import ledger, rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily financial rollups, provider earnings and token sales from the transaction ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='start_day',
+            type=str,
+            help='First day to rebuild (YYYY-MM-DD), defaults to the beginning of the ledger',
+        )
+        parser.add_argument(
+            '--to',
+            dest='end_day',
+            type=str,
+            help='Last day to rebuild (YYYY-MM-DD), defaults to today',
+        )
+        parser.add_argument(
+            '--skip-transactions',
+            action='store_true',
+            help='Do not create ledger transactions for completed bookings that have none',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_day = datetime.strptime(options['start_day'], '%Y-%m-%d').date() if options['start_day'] else None
+            end_day = datetime.strptime(options['end_day'], '%Y-%m-%d').date() if options['end_day'] else None
+        except ValueError:
+            raise CommandError('Dates must use YYYY-MM-DD format')
+
+        if not options['skip_transactions']:
+            created = ledger.backfill_transactions()
+            self.stdout.write(f'Created {created} ledger transactions for previously completed bookings')
+
+        rows = rollups.rebuild(start_day, end_day)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily financial rollup rows'))
+
+        rows = rollups.rebuild_token_sales(start_day, end_day)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} daily token sales rows'))
@@ -0,0 +1,55 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payment import payouts
+
+
+class Command(BaseCommand):
+    help = 'Create payouts for every provider with pending completed transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--before',
+            type=str,
+            help='Only pay out transactions made before this day (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=payouts.DEFAULT_BATCH_SIZE,
+            help='Providers paid out per database transaction',
+        )
+        parser.add_argument(
+            '--payment-method',
+            type=str,
+            help='Payment method recorded on the created payouts',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be paid out without creating payouts',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = None
+        if options['before']:
+            try:
+                day = datetime.strptime(options['before'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--before must use YYYY-MM-DD format')
+            cutoff = timezone.make_aware(datetime.combine(day, time.min))
+
+        if options['dry_run']:
+            pending = payouts.summarize_pending(cutoff)
+            for row in pending:
+                self.stdout.write(f"Provider {row['provider_id']}: {row['count']} transactions, ₱{row['total']}")
+            total = sum(row['total'] for row in pending)
+            self.stdout.write(self.style.SUCCESS(f'{len(pending)} payouts totalling ₱{total} would be created'))
+            return
+
+        created, paid = payouts.generate_payouts(
+            cutoff, batch_size=options['batch_size'], payment_method=options['payment_method']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Created {created} payouts covering {paid} transactions'))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from payment.blobstore import is_external_url, store_inline
+from payment.models import BookingPayment
+
+
+class Command(BaseCommand):
+    help = 'Move inline base64 payment proofs into the content-addressed blob store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Payments converted per database transaction',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        moved = skipped = 0
+
+        while True:
+            # Walk by primary key so each batch only loads its own proofs into memory
+            batch = list(
+                BookingPayment.objects.filter(
+                    payment_id__gt=last_id,
+                    payment_proof_hash__isnull=True,
+                    payment_proof__isnull=False
+                ).exclude(payment_proof='').order_by('payment_id').only('payment_id', 'payment_proof')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].payment_id
+
+            converted = []
+            for payment in batch:
+                if is_external_url(payment.payment_proof):
+                    continue
+                try:
+                    digest, size, content_type = store_inline(payment.payment_proof)
+                except ValueError:
+                    skipped += 1
+                    self.stdout.write(self.style.WARNING(f'Payment #{payment.payment_id}: proof is not valid base64, skipped and left in place'))
+                    continue
+                payment.payment_proof = None
+                payment.payment_proof_hash = digest
+                payment.payment_proof_size = size
+                payment.payment_proof_content_type = content_type
+                converted.append(payment)
+
+            with transaction.atomic():
+                BookingPayment.objects.bulk_update(converted, [
+                    'payment_proof', 'payment_proof_hash', 'payment_proof_size', 'payment_proof_content_type'
+                ])
+            moved += len(converted)
+            self.stdout.write(f'Moved {moved} proofs (up to payment #{last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} payment proofs to the blob store, {skipped} skipped'))
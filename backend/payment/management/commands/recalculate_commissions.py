@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from payment import commission, recalculation
+
+
+class Command(BaseCommand):
+    help = 'Re-split pending transactions whose commission rate differs from the current settings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tier',
+            action='append',
+            choices=list(commission.TIER_RATE_FIELDS),
+            help='Only recalculate this commission tier (repeatable)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=recalculation.DEFAULT_BATCH_SIZE,
+            help='Transaction id range updated per database transaction',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without writing anything',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        summaries = recalculation.recalculate(
+            tiers=options['tier'], dry_run=options['dry_run'], batch_size=options['batch_size']
+        )
+
+        for summary in summaries:
+            self.stdout.write(
+                f"{summary['tier']}: {summary['transactions']} transactions at {summary['rate']}%, "
+                f"commission {summary['commission_before']} -> {summary['commission_after']} "
+                f"({summary['commission_delta']:+})"
+            )
+            if options['dry_run']:
+                for row in summary['sample']:
+                    self.stdout.write(
+                        f"  #{row['transaction_id']}: {row['total_amount']} at {row['commission_rate']}% "
+                        f"commission {row['commission_amount']} -> {row['new_commission']}"
+                    )
+
+        total = sum(summary['transactions'] for summary in summaries)
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Dry run: {total} transactions would be recalculated'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Recalculated {total} transactions'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from payment import reconciliation
+from payment.models import ReconciliationRun
+
+
+class Command(BaseCommand):
+    help = 'Check that booking fees, booking payments, legacy payments and transactions agree'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=reconciliation.DEFAULT_CHUNK_SIZE,
+            help='Bookings compared per chunk',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue the most recent unfinished run from its checkpoint',
+        )
+        parser.add_argument(
+            '--run-id',
+            type=int,
+            help='Continue a specific unfinished run from its checkpoint',
+        )
+
+    def handle(self, *args, **options):
+        run = None
+        if options['run_id'] or options['resume']:
+            unfinished = ReconciliationRun.objects.exclude(status='completed')
+            if options['run_id']:
+                unfinished = unfinished.filter(run_id=options['run_id'])
+            run = unfinished.order_by('-started_at').first()
+            if run is None:
+                raise CommandError('No unfinished reconciliation run to resume')
+            run.status = 'running'
+            run.error = None
+            run.save(update_fields=['status', 'error', 'updated_at'])
+            self.stdout.write(f'Resuming run #{run.run_id} after booking #{run.last_booking_id}')
+
+        run = reconciliation.reconcile(run, chunk_size=options['chunk_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Run #{run.run_id} checked {run.bookings_checked} bookings and found {run.mismatches_found} mismatches'
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_passwordreset_pwreset_status_expires_idx'),
+        ('payment', '0004_bookingpayment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='commission_tier',
+            field=models.CharField(choices=[('default', 'Default'), ('bronze', 'Bronze'), ('silver', 'Silver'), ('gold', 'Gold'), ('shop', 'Shop')], default='default', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ProviderEarnings',
+            fields=[
+                ('earnings_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('gross_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_out_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_earnings', to='accounts.account')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('provider', 'day'), name='unique_provider_earnings_day')],
+            },
+        ),
+    ]
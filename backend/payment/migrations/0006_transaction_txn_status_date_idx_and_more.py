@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_passwordreset_pwreset_status_expires_idx'),
+        ('bookings', '0002_alter_backjobsbooking_status_and_more'),
+        ('payment', '0005_transaction_commission_tier_providerearnings'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['status', 'transaction_date'], name='txn_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['provider', 'transaction_date'], name='txn_provider_date_idx'),
+        ),
+    ]
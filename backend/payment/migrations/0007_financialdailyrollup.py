@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0006_transaction_txn_status_date_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinancialDailyRollup',
+            fields=[
+                ('rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('provider_type', models.CharField(choices=[('mechanic', 'Mechanic'), ('shop', 'Shop')], max_length=20)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('refunds', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('payouts', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('refund_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'provider_type'), name='unique_financial_rollup_day')],
+            },
+        ),
+    ]
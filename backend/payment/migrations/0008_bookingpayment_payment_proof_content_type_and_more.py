@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0007_financialdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookingpayment',
+            name='payment_proof_content_type',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookingpayment',
+            name='payment_proof_hash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='bookingpayment',
+            name='payment_proof_size',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
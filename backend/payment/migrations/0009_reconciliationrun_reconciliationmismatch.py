@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_alter_backjobsbooking_status_and_more'),
+        ('payment', '0008_bookingpayment_payment_proof_content_type_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReconciliationRun',
+            fields=[
+                ('run_id', models.AutoField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('chunk_size', models.IntegerField(default=5000)),
+                ('last_booking_id', models.IntegerField(default=0)),
+                ('bookings_checked', models.IntegerField(default=0)),
+                ('mismatches_found', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReconciliationMismatch',
+            fields=[
+                ('mismatch_id', models.AutoField(primary_key=True, serialize=False)),
+                ('check_type', models.CharField(choices=[('payment_total', 'Payment total differs from booking fee'), ('payment_balance', 'Payment balance does not match amounts'), ('payment_overpaid', 'Payment amount exceeds total'), ('legacy_payment', 'Legacy payments differ from booking fee'), ('transaction_total', 'Transaction total differs from booking fee'), ('transaction_split', 'Commission and payout do not add up'), ('missing_transaction', 'Completed booking has no transaction')], max_length=30)),
+                ('expected_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('actual_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True)),
+                ('record_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reconciliation_mismatches', to='bookings.booking')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mismatches', to='payment.reconciliationrun')),
+            ],
+            options={
+                'ordering': ['booking_id'],
+                'indexes': [models.Index(fields=['run', 'check_type'], name='recon_run_check_idx')],
+            },
+        ),
+    ]
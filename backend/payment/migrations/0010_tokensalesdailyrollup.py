@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0009_reconciliationrun_reconciliationmismatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenSalesDailyRollup',
+            fields=[
+                ('rollup_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('purchase_count', models.IntegerField(default=0)),
+                ('tokens_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('package', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='payment.tokenpackage')),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'package'), name='unique_token_sales_rollup_day')],
+            },
+        ),
+    ]
@@ -55,6 +55,14 @@ class Transaction(models.Model):
         ('processing', 'Processing'),
     ]
 
+    COMMISSION_TIER_CHOICES = [
+        ('default', 'Default'),
+        ('bronze', 'Bronze'),
+        ('silver', 'Silver'),
+        ('gold', 'Gold'),
+        ('shop', 'Shop'),
+    ]
+
     transaction_id = models.AutoField(primary_key=True)
     booking = models.ForeignKey('bookings.Booking', on_delete=models.CASCADE, related_name='transactions')
     provider = models.ForeignKey('accounts.Account', on_delete=models.SET_NULL, null=True, related_name='transactions_received')
@@ -63,6 +71,7 @@ class Transaction(models.Model):
     # Amount details
     total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     commission_rate = models.DecimalField(max_digits=5, decimal_places=2, default=15.00)
+    commission_tier = models.CharField(max_length=20, choices=COMMISSION_TIER_CHOICES, default='default')
     commission_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     provider_payout = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     
@@ -80,6 +89,10 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ['-transaction_date']
+        indexes = [
+            models.Index(fields=['status', 'transaction_date'], name='txn_status_date_idx'),
+            models.Index(fields=['provider', 'transaction_date'], name='txn_provider_date_idx'),
+        ]
 
     def __str__(self):
         return f"Transaction #{self.transaction_id} - ₱{self.total_amount}"
@@ -92,6 +105,61 @@ class Transaction(models.Model):
         super().save(*args, **kwargs)
 
 
+class ProviderEarnings(models.Model):
+    """
+    Daily earnings aggregate per provider, maintained from the transaction ledger
+    """
+    earnings_id = models.AutoField(primary_key=True)
+    provider = models.ForeignKey('accounts.Account', on_delete=models.CASCADE, related_name='daily_earnings')
+    day = models.DateField()
+    gross_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_out_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'day'], name='unique_provider_earnings_day'),
+        ]
+
+    def __str__(self):
+        return f"Earnings for {self.provider_id} on {self.day} - ₱{self.net_amount}"
+
+
+class FinancialDailyRollup(models.Model):
+    """
+    Platform financial totals per day and provider type, maintained
+    incrementally from transactions, refunds and payouts
+    """
+    PROVIDER_TYPE_CHOICES = [
+        ('mechanic', 'Mechanic'),
+        ('shop', 'Shop'),
+    ]
+
+    rollup_id = models.AutoField(primary_key=True)
+    day = models.DateField()
+    provider_type = models.CharField(max_length=20, choices=PROVIDER_TYPE_CHOICES)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    refunds = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payouts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    booking_count = models.IntegerField(default=0)
+    refund_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'provider_type'], name='unique_financial_rollup_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.provider_type} - ₱{self.revenue}"
+
+
 class Payout(models.Model):
     """
     Payout records to mechanics/shop owners
@@ -126,7 +194,7 @@ class Payout(models.Model):
         ordering = ['-requested_at']
 
     def __str__(self):
-        return f"Payout #{self.payout_id} to {self.recipient.username} - ₱{self.amount}"
+        return f"Payout #{self.payout_id} to account #{self.recipient_id} - ₱{self.amount}"
 
 
 class TokenPackage(models.Model):
@@ -151,6 +219,26 @@ class TokenPackage(models.Model):
         return f"{self.name} - {self.tokens} tokens for ₱{self.price}"
 
 
+class TokenSalesDailyRollup(models.Model):
+    """
+    Completed token purchase totals per day and package, maintained
+    incrementally from accounts.TokenPurchase
+    """
+    rollup_id = models.AutoField(primary_key=True)
+    day = models.DateField()
+    package = models.ForeignKey('payment.TokenPackage', on_delete=models.SET_NULL, null=True, blank=True, related_name='daily_sales')
+    purchase_count = models.IntegerField(default=0)
+    tokens_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'package'], name='unique_token_sales_rollup_day'),
+        ]
+
+
 class BookingPayment(models.Model):
     """
     Payment records for bookings - tracks client payments
@@ -188,7 +276,10 @@ class BookingPayment(models.Model):
     remaining_balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     
     # Payment proof
-    payment_proof = models.TextField(null=True, blank=True)  # Base64 image or URL
+    payment_proof = models.TextField(null=True, blank=True)  # External URL, or legacy base64 not yet moved to the blob store
+    payment_proof_hash = models.CharField(max_length=64, null=True, blank=True)  # SHA-256 name in the blob store
+    payment_proof_size = models.IntegerField(null=True, blank=True)
+    payment_proof_content_type = models.CharField(max_length=100, null=True, blank=True)
     reference_number = models.CharField(max_length=255, null=True, blank=True)
     
     # Metadata
@@ -204,7 +295,7 @@ class BookingPayment(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Payment for Booking #{self.booking.booking_id} - {self.payment_status}"
+        return f"Payment for Booking #{self.booking_id} - {self.payment_status}"
 
     def save(self, *args, **kwargs):
         # Auto-calculate remaining balance
@@ -221,3 +312,64 @@ class BookingPayment(models.Model):
             
         super().save(*args, **kwargs)
 
+
+
+class ReconciliationRun(models.Model):
+    """
+    One pass of the payment reconciliation job, checkpointed per chunk
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    run_id = models.AutoField(primary_key=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    chunk_size = models.IntegerField(default=5000)
+    last_booking_id = models.IntegerField(default=0)  # checkpoint: every booking up to here is checked
+    bookings_checked = models.IntegerField(default=0)
+    mismatches_found = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Reconciliation #{self.run_id} - {self.status}"
+
+
+class ReconciliationMismatch(models.Model):
+    """
+    A disagreement between the amounts recorded for a booking
+    """
+    CHECK_CHOICES = [
+        ('payment_total', 'Payment total differs from booking fee'),
+        ('payment_balance', 'Payment balance does not match amounts'),
+        ('payment_overpaid', 'Payment amount exceeds total'),
+        ('legacy_payment', 'Legacy payments differ from booking fee'),
+        ('transaction_total', 'Transaction total differs from booking fee'),
+        ('transaction_split', 'Commission and payout do not add up'),
+        ('missing_transaction', 'Completed booking has no transaction'),
+    ]
+
+    mismatch_id = models.AutoField(primary_key=True)
+    run = models.ForeignKey('payment.ReconciliationRun', on_delete=models.CASCADE, related_name='mismatches')
+    booking = models.ForeignKey('bookings.Booking', on_delete=models.CASCADE, related_name='reconciliation_mismatches')
+    check_type = models.CharField(max_length=30, choices=CHECK_CHOICES)
+    expected_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    actual_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    record_id = models.IntegerField(null=True, blank=True)  # payment or transaction id the mismatch was found on
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['booking_id']
+        indexes = [
+            models.Index(fields=['run', 'check_type'], name='recon_run_check_idx'),
+        ]
+
+    def __str__(self):
+        return f"Booking #{self.booking_id} - {self.check_type}"
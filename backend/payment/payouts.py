@@ -0,0 +1,141 @@
+"""
+Batch payout generation.
+
+Pending completed transactions are grouped by provider with one aggregate
+query, then paid out a chunk of providers at a time. Each chunk locks its
+transactions, bulk-creates the Payouts and their transaction links, marks
+the transactions paid with a single UPDATE and bumps the rollups, all in
+one short database transaction.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Sum, Count
+from django.utils import timezone
+
+from accounts.models import ShopOwner
+from .models import Transaction, Payout, ProviderEarnings, FinancialDailyRollup
+from . import rollups
+
+
+DEFAULT_BATCH_SIZE = 200
+
+
+def pending_transactions(cutoff=None):
+    transactions = Transaction.objects.filter(
+        status='completed', payout_status='pending', provider__isnull=False
+    )
+    if cutoff:
+        transactions = transactions.filter(transaction_date__lt=cutoff)
+    return transactions
+
+
+def summarize_pending(cutoff=None):
+    """One aggregate query: [{'provider_id', 'total', 'count'}] ordered by provider"""
+    return list(
+        pending_transactions(cutoff).values('provider_id').annotate(
+            total=Sum('provider_payout'), count=Count('transaction_id')
+        ).order_by('provider_id')
+    )
+
+
+def _create_payouts(payouts):
+    """
+    Insert payouts; returns (payouts, whether post_save already recorded them
+    in the rollups)
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return Payout.objects.bulk_create(payouts), False
+    # Backends that cannot return ids from a bulk insert (MySQL) need one insert
+    # per payout, and save() fires payout_saved which adds each to the rollups
+    for payout in payouts:
+        payout.save()
+    return payouts, True
+
+
+def _record_paid_out(day, amounts):
+    """Add paid out amounts to each provider's earnings row for the day"""
+    ProviderEarnings.objects.bulk_create(
+        [ProviderEarnings(provider_id=provider_id, day=day) for provider_id in amounts],
+        ignore_conflicts=True
+    )
+    rows = list(ProviderEarnings.objects.select_for_update().filter(provider_id__in=amounts, day=day))
+    for row in rows:
+        row.paid_out_amount += amounts[row.provider_id]
+    ProviderEarnings.objects.bulk_update(rows, ['paid_out_amount'])
+
+
+def _pay_chunk(provider_ids, cutoff, now, payment_method, processed_by):
+    """Pay out one chunk of providers; returns (payouts created, transactions paid)"""
+    with transaction.atomic():
+        locked = pending_transactions(cutoff).filter(provider_id__in=provider_ids)
+        if connection.features.has_select_for_update_skip_locked:
+            locked = locked.select_for_update(skip_locked=True)
+        else:
+            locked = locked.select_for_update()
+        rows = list(locked.values_list('transaction_id', 'provider_id', 'provider_payout'))
+        if not rows:
+            return 0, 0
+
+        amounts = defaultdict(Decimal)
+        by_provider = defaultdict(list)
+        for transaction_id, provider_id, provider_payout in rows:
+            amounts[provider_id] += provider_payout
+            by_provider[provider_id].append(transaction_id)
+
+        payouts, in_rollups = _create_payouts([
+            Payout(
+                recipient_id=provider_id,
+                amount=amount,
+                payment_method=payment_method,
+                status='completed',
+                processed_by=processed_by,
+                processed_at=now,
+                notes=f'Batch payout for {len(by_provider[provider_id])} transactions'
+            )
+            for provider_id, amount in amounts.items()
+        ])
+
+        Link = Payout.transactions.through
+        Link.objects.bulk_create([
+            Link(payout_id=payout.payout_id, transaction_id=transaction_id)
+            for payout in payouts
+            for transaction_id in by_provider[payout.recipient_id]
+        ], batch_size=1000)
+
+        Transaction.objects.filter(transaction_id__in=[row[0] for row in rows]).update(
+            payout_status='paid', payout_date=now, updated_at=now
+        )
+
+        day = timezone.localdate(now)
+        _record_paid_out(day, amounts)
+        if in_rollups:
+            return len(payouts), len(rows)
+        shops = set(ShopOwner.objects.filter(shop_owner_id__in=amounts).values_list('shop_owner_id', flat=True))
+        for provider_type in ('mechanic', 'shop'):
+            total = sum(
+                (amount for provider_id, amount in amounts.items() if (provider_id in shops) == (provider_type == 'shop')),
+                Decimal('0')
+            )
+            rollups.increment(FinancialDailyRollup, {'day': day, 'provider_type': provider_type}, payouts=total)
+
+    return len(payouts), len(rows)
+
+
+def generate_payouts(cutoff=None, batch_size=DEFAULT_BATCH_SIZE, payment_method=None, processed_by=None):
+    """
+    Create one completed Payout per provider covering every pending completed
+    transaction before the cutoff. Returns (payouts created, transactions paid).
+    """
+    now = timezone.now()
+    provider_ids = [row['provider_id'] for row in summarize_pending(cutoff)]
+
+    created = paid = 0
+    for start in range(0, len(provider_ids), batch_size):
+        chunk_created, chunk_paid = _pay_chunk(
+            provider_ids[start:start + batch_size], cutoff, now, payment_method, processed_by
+        )
+        created += chunk_created
+        paid += chunk_paid
+    return created, paid
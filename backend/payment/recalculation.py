@@ -0,0 +1,127 @@
+"""
+Commission recalculation.
+
+When commission rates change, pending ledger transactions of the affected
+tiers are re-split at the new rate with database-side UPDATE expressions,
+one primary key range at a time. Each range also moves the matching
+ProviderEarnings and FinancialDailyRollup rows by the commission delta in
+the same database transaction, so the rollups stay equal to a rebuild.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import F, Sum, Count, Min, Max, Value, DecimalField, ExpressionWrapper
+from django.db.models.functions import Round, TruncDate
+
+from .models import Transaction, ProviderEarnings, FinancialDailyRollup
+from . import commission, rollups
+
+
+DEFAULT_BATCH_SIZE = 5000
+SAMPLE_SIZE = 20
+RATE_PRECISION = Decimal('0.01')
+
+
+def recalculable_transactions():
+    """Transactions whose commission can still change: not paid out and not refunded"""
+    return Transaction.objects.filter(payout_status='pending').exclude(status='refunded')
+
+
+def _new_commission(rate):
+    return Round(
+        ExpressionWrapper(
+            F('total_amount') * Value(rate) / Value(Decimal('100')),
+            output_field=DecimalField(max_digits=14, decimal_places=4)
+        ),
+        precision=2, output_field=DecimalField(max_digits=12, decimal_places=2)
+    )
+
+
+def stale_transactions(tier, rate):
+    return recalculable_transactions().filter(commission_tier=tier).exclude(commission_rate=rate)
+
+
+def preview(tier, rate):
+    """Dry-run diff for one tier: affected count, commission delta and sample rows"""
+    stale = stale_transactions(tier, rate).annotate(new_commission=_new_commission(rate))
+    totals = stale.aggregate(
+        count=Count('transaction_id'),
+        old_total=Sum('commission_amount'),
+        new_total=Sum('new_commission')
+    )
+    old_total = totals['old_total'] or Decimal('0.00')
+    new_total = totals['new_total'] or Decimal('0.00')
+    return {
+        'tier': tier,
+        'rate': rate,
+        'transactions': totals['count'],
+        'commission_before': old_total,
+        'commission_after': new_total,
+        'commission_delta': new_total - old_total,
+        'sample': list(stale.order_by('transaction_id').values(
+            'transaction_id', 'total_amount', 'commission_rate', 'commission_amount', 'new_commission'
+        )[:SAMPLE_SIZE]),
+    }
+
+
+def _recalculate_range(tier, rate, low, high):
+    """Re-split one primary key range of a tier; returns the number of rows updated"""
+    with transaction.atomic():
+        stale = stale_transactions(tier, rate).filter(transaction_id__gte=low, transaction_id__lt=high)
+        ids = list(stale.select_for_update().values_list('transaction_id', flat=True))
+        if not ids:
+            return 0
+        rows = Transaction.objects.filter(transaction_id__in=ids)
+
+        deltas = rows.annotate(
+            day=TruncDate('transaction_date'), new_commission=_new_commission(rate)
+        ).values('provider_id', 'day').annotate(
+            delta=Sum(F('new_commission') - F('commission_amount'))
+        ).order_by()
+        deltas = list(deltas)
+
+        new_commission = _new_commission(rate)
+        updated = rows.update(
+            commission_rate=rate,
+            commission_amount=new_commission,
+            provider_payout=F('total_amount') - new_commission
+        )
+
+        provider_type = rollups.provider_type_for_tier(tier)
+        by_day = {}
+        for row in deltas:
+            delta = row['delta'] or Decimal('0.00')
+            by_day[row['day']] = by_day.get(row['day'], Decimal('0.00')) + delta
+            if row['provider_id']:
+                rollups.increment(
+                    ProviderEarnings, {'provider_id': row['provider_id'], 'day': row['day']},
+                    commission_amount=delta, net_amount=-delta
+                )
+        for day, delta in by_day.items():
+            rollups.increment(FinancialDailyRollup, {'day': day, 'provider_type': provider_type}, commission=delta)
+
+    return updated
+
+
+def recalculate(rates=None, tiers=None, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Bring pending transactions in line with the given rates (the current
+    settings by default). Returns one summary per tier; with dry_run the
+    summaries are previews and nothing is written.
+    """
+    rates = rates or commission.get_rates()
+    summaries = []
+    for tier in tiers or commission.TIER_RATE_FIELDS:
+        rate = Decimal(rates[tier]).quantize(RATE_PRECISION, rounding=ROUND_HALF_UP)
+        summary = preview(tier, rate)
+        if dry_run or not summary['transactions']:
+            summaries.append(summary)
+            continue
+
+        bounds = stale_transactions(tier, rate).aggregate(low=Min('transaction_id'), high=Max('transaction_id'))
+        updated = 0
+        for low in range(bounds['low'], bounds['high'] + 1, batch_size):
+            updated += _recalculate_range(tier, rate, low, low + batch_size)
+        summary['transactions'] = updated
+        summaries.append(summary)
+    return summaries
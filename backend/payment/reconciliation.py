@@ -0,0 +1,142 @@
+"""
+Payment reconciliation.
+
+Bookings are walked in primary key order a chunk at a time. For each chunk
+the matching BookingPayment, Payment and Transaction rows are read with one
+range query per table and streamed past the chunk's fees, held in integer
+cents by booking id. Mismatches and the run checkpoint are written in the
+same transaction, so an interrupted run resumes exactly where it stopped.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import Booking
+from .models import BookingPayment, Payment, Transaction, ReconciliationRun, ReconciliationMismatch
+
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Legacy Payment rows in these states never moved money
+VOID_PAYMENT_STATUSES = ('failed', 'cancelled', 'refunded')
+
+
+def _cents(value):
+    return int((value or 0) * 100)
+
+
+def _amount(cents):
+    return None if cents is None else Decimal(cents).scaleb(-2)
+
+
+def _mismatch(run, booking_id, check_type, expected, actual, record_id=None):
+    return ReconciliationMismatch(
+        run=run, booking_id=booking_id, check_type=check_type,
+        expected_amount=_amount(expected), actual_amount=_amount(actual), record_id=record_id
+    )
+
+
+def check_chunk(run, last_booking_id, chunk_size):
+    """
+    Reconcile the next chunk of bookings after last_booking_id.
+    Returns (mismatches, bookings checked, highest booking id checked).
+    """
+    bookings = list(
+        Booking.objects.filter(booking_id__gt=last_booking_id).order_by('booking_id')
+        .values_list('booking_id', 'request_id', 'status', 'amount_fee')[:chunk_size]
+    )
+    if not bookings:
+        return [], 0, last_booking_id
+
+    high = bookings[-1][0]
+    in_chunk = {'booking_id__gt': last_booking_id, 'booking_id__lte': high}
+
+    # booking id -> fee in cents
+    fees = {booking_id: _cents(amount_fee) for booking_id, _, _, amount_fee in bookings}
+    bookings_by_request = defaultdict(list)
+    for booking_id, request_id, _, _ in bookings:
+        bookings_by_request[request_id].append(booking_id)
+
+    mismatches = []
+
+    # BookingPayment: total must equal the fee, balance must equal total - paid
+    payments = BookingPayment.objects.filter(**in_chunk).order_by('payment_id').values_list(
+        'payment_id', 'booking_id', 'total_amount', 'amount_paid', 'remaining_balance'
+    )
+    for payment_id, booking_id, total, amount_paid, balance in payments.iterator(chunk_size=chunk_size):
+        fee, total, amount_paid, balance = fees[booking_id], _cents(total), _cents(amount_paid), _cents(balance)
+        if total != fee:
+            mismatches.append(_mismatch(run, booking_id, 'payment_total', fee, total, payment_id))
+        expected_balance = max(total - amount_paid, 0)
+        if balance != expected_balance:
+            mismatches.append(_mismatch(run, booking_id, 'payment_balance', expected_balance, balance, payment_id))
+        if amount_paid > total:
+            mismatches.append(_mismatch(run, booking_id, 'payment_overpaid', total, amount_paid, payment_id))
+
+    # Legacy Payment rows hang off the request; their sum must equal the fee
+    legacy_sums = defaultdict(int)
+    legacy = Payment.objects.filter(request_id__in=list(bookings_by_request)).exclude(
+        status__in=VOID_PAYMENT_STATUSES
+    ).order_by('payment_id').values_list('request_id', 'amount')
+    for request_id, amount in legacy.iterator(chunk_size=chunk_size):
+        for booking_id in bookings_by_request[request_id]:
+            legacy_sums[booking_id] += _cents(amount)
+    for booking_id in sorted(legacy_sums):
+        if legacy_sums[booking_id] != fees[booking_id]:
+            mismatches.append(_mismatch(run, booking_id, 'legacy_payment', fees[booking_id], legacy_sums[booking_id]))
+
+    # Transactions: total must equal the fee and split exactly into commission + payout
+    with_transaction = set()
+    transactions = Transaction.objects.filter(**in_chunk).order_by('transaction_id').values_list(
+        'transaction_id', 'booking_id', 'total_amount', 'commission_amount', 'provider_payout'
+    )
+    for transaction_id, booking_id, total, commission_amount, payout in transactions.iterator(chunk_size=chunk_size):
+        with_transaction.add(booking_id)
+        total = _cents(total)
+        if total != fees[booking_id]:
+            mismatches.append(_mismatch(run, booking_id, 'transaction_total', fees[booking_id], total, transaction_id))
+        split = _cents(commission_amount) + _cents(payout)
+        if split != total:
+            mismatches.append(_mismatch(run, booking_id, 'transaction_split', total, split, transaction_id))
+
+    for booking_id, _, booking_status, _ in bookings:
+        if booking_status == 'completed' and booking_id not in with_transaction:
+            mismatches.append(_mismatch(run, booking_id, 'missing_transaction', fees[booking_id], None))
+
+    return mismatches, len(bookings), high
+
+
+def reconcile(run=None, chunk_size=DEFAULT_CHUNK_SIZE, max_chunks=None):
+    """
+    Run (or resume) a reconciliation pass. Each chunk's mismatches are saved
+    together with the checkpoint. Returns the ReconciliationRun.
+    """
+    if run is None:
+        run = ReconciliationRun.objects.create(chunk_size=chunk_size)
+
+    chunks = 0
+    try:
+        while max_chunks is None or chunks < max_chunks:
+            mismatches, checked, high = check_chunk(run, run.last_booking_id, run.chunk_size)
+            if not checked:
+                run.status = 'completed'
+                run.finished_at = timezone.now()
+                run.save(update_fields=['status', 'finished_at', 'updated_at'])
+                break
+
+            with transaction.atomic():
+                ReconciliationMismatch.objects.bulk_create(mismatches, batch_size=1000)
+                run.last_booking_id = high
+                run.bookings_checked += checked
+                run.mismatches_found += len(mismatches)
+                run.save(update_fields=['last_booking_id', 'bookings_checked', 'mismatches_found', 'updated_at'])
+            chunks += 1
+    except Exception as e:
+        run.status = 'failed'
+        run.error = str(e)
+        run.save(update_fields=['status', 'error', 'updated_at'])
+        raise
+
+    return run
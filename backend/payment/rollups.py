@@ -0,0 +1,239 @@
+"""
+Daily financial rollups.
+
+FinancialDailyRollup and ProviderEarnings hold per-day totals so stats for
+any date range sum a few hundred small rows instead of scanning bookings.
+Rows are bumped incrementally (see payment.signals) and can be rebuilt
+from the ledger with the backfill_financial_rollups command.
+TokenSalesDailyRollup does the same for completed token purchases.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum, Count, Exists, OuterRef, Subquery, Value, CharField, Case, When
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from accounts.models import ShopOwner, TokenPurchase
+from bookings.models import RefundedBooking
+from .models import FinancialDailyRollup, ProviderEarnings, Transaction, Payout, TokenSalesDailyRollup
+
+
+ROLLUP_TOTALS = ('revenue', 'commission', 'refunds', 'payouts', 'booking_count', 'refund_count')
+
+
+def increment(model, keys, **deltas):
+    """
+    Add deltas to the row identified by keys, creating it when missing.
+    Uses F() expressions so concurrent writers never lose an update.
+    """
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    rows = model.objects.filter(**keys)
+    increments = {field: F(field) + value for field, value in deltas.items()}
+
+    if rows.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas)
+    except IntegrityError:
+        # Another writer created the row first
+        rows.update(**increments)
+
+
+def provider_type_for_tier(tier):
+    return 'shop' if tier == 'shop' else 'mechanic'
+
+
+def _day(value):
+    return timezone.localdate(value or timezone.now())
+
+
+def record_transaction(ledger_entry, sign=1):
+    """Count a ledger Transaction towards its day's revenue and commission"""
+    increment(
+        FinancialDailyRollup,
+        {'day': _day(ledger_entry.transaction_date), 'provider_type': provider_type_for_tier(ledger_entry.commission_tier)},
+        revenue=sign * ledger_entry.total_amount,
+        commission=sign * ledger_entry.commission_amount,
+        booking_count=sign
+    )
+
+
+def record_refund(refund, sign=1):
+    """Count an approved refund on the day it was processed"""
+    tier = Transaction.objects.filter(booking_id=refund.booking_id).values_list('commission_tier', flat=True).first()
+    increment(
+        FinancialDailyRollup,
+        {'day': _day(refund.processed_at), 'provider_type': provider_type_for_tier(tier)},
+        refunds=sign * refund.refund_amount,
+        refund_count=sign
+    )
+
+
+def record_payout(payout, sign=1):
+    """Count a completed payout on the day it was processed"""
+    is_shop = ShopOwner.objects.filter(shop_owner_id=payout.recipient_id).exists()
+    increment(
+        FinancialDailyRollup,
+        {'day': _day(payout.processed_at), 'provider_type': 'shop' if is_shop else 'mechanic'},
+        payouts=sign * payout.amount
+    )
+
+
+def record_token_purchase(token_purchase, sign=1):
+    """Count a completed token purchase towards its day and package"""
+    increment(
+        TokenSalesDailyRollup,
+        {'day': _day(token_purchase.purchased_at), 'package_id': token_purchase.package_id},
+        purchase_count=sign,
+        tokens_sold=sign * token_purchase.tokens_amount,
+        revenue=sign * token_purchase.price
+    )
+
+
+def summarize(start_day=None, end_day=None, provider_type=None):
+    """Sum rollup rows for an inclusive day range; returns a dict of totals"""
+    rows = FinancialDailyRollup.objects.all()
+    if start_day:
+        rows = rows.filter(day__gte=start_day)
+    if end_day:
+        rows = rows.filter(day__lte=end_day)
+    if provider_type:
+        rows = rows.filter(provider_type=provider_type)
+
+    totals = rows.aggregate(**{field: Sum(field) for field in ROLLUP_TOTALS})
+    return {
+        field: value if value is not None else (0 if field.endswith('_count') else Decimal('0.00'))
+        for field, value in totals.items()
+    }
+
+
+def rebuild(start_day=None, end_day=None):
+    """
+    Recompute FinancialDailyRollup and ProviderEarnings rows for a day range
+    from the ledger, refunds and payouts with a handful of grouped queries.
+    Returns the number of rollup rows written.
+    """
+    def in_range(queryset, field):
+        if start_day:
+            queryset = queryset.filter(**{f'{field}__gte': start_day})
+        if end_day:
+            queryset = queryset.filter(**{f'{field}__lte': end_day})
+        return queryset
+
+    shop_tier = Case(When(commission_tier='shop', then=Value('shop')), default=Value('mechanic'), output_field=CharField())
+    totals = {}
+
+    def bucket(day, provider_type):
+        return totals.setdefault((day, provider_type), {field: 0 for field in ROLLUP_TOTALS})
+
+    transactions = in_range(
+        Transaction.objects.annotate(day=TruncDate('transaction_date'), provider_type=shop_tier), 'day'
+    )
+    for row in transactions.values('day', 'provider_type').annotate(
+        revenue=Sum('total_amount'), commission=Sum('commission_amount'), booking_count=Count('transaction_id')
+    ):
+        entry = bucket(row['day'], row['provider_type'])
+        entry.update(revenue=row['revenue'], commission=row['commission'], booking_count=row['booking_count'])
+
+    tier = Transaction.objects.filter(booking_id=OuterRef('booking_id')).values('commission_tier')[:1]
+    refunds = in_range(
+        RefundedBooking.objects.filter(status='approved').annotate(
+            day=TruncDate(Coalesce('processed_at', 'updated_at')),
+            tier=Subquery(tier)
+        ), 'day'
+    )
+    for row in refunds.values('day', 'tier').annotate(amount=Sum('refund_amount'), count=Count('refunded_booking_id')):
+        entry = bucket(row['day'], provider_type_for_tier(row['tier']))
+        entry['refunds'] += row['amount'] or 0
+        entry['refund_count'] += row['count']
+
+    payouts = in_range(
+        Payout.objects.filter(status='completed').annotate(
+            day=TruncDate(Coalesce('processed_at', 'updated_at')),
+            is_shop=Exists(ShopOwner.objects.filter(shop_owner_id=OuterRef('recipient_id')))
+        ), 'day'
+    )
+    for row in payouts.values('day', 'is_shop').annotate(amount=Sum('amount')):
+        entry = bucket(row['day'], 'shop' if row['is_shop'] else 'mechanic')
+        entry['payouts'] += row['amount'] or 0
+
+    earnings = {}
+    for row in in_range(
+        Transaction.objects.filter(provider__isnull=False).annotate(day=TruncDate('transaction_date')), 'day'
+    ).values('provider_id', 'day').annotate(
+        gross=Sum('total_amount'), commission=Sum('commission_amount'),
+        net=Sum('provider_payout'), count=Count('transaction_id')
+    ):
+        earnings[(row['provider_id'], row['day'])] = ProviderEarnings(
+            provider_id=row['provider_id'], day=row['day'], gross_amount=row['gross'],
+            commission_amount=row['commission'], net_amount=row['net'], transaction_count=row['count']
+        )
+    for row in in_range(
+        Transaction.objects.filter(provider__isnull=False, payout_status='paid').annotate(
+            day=TruncDate(Coalesce('payout_date', 'updated_at'))
+        ), 'day'
+    ).values('provider_id', 'day').annotate(paid=Sum('provider_payout')):
+        key = (row['provider_id'], row['day'])
+        if key not in earnings:
+            earnings[key] = ProviderEarnings(provider_id=row['provider_id'], day=row['day'])
+        earnings[key].paid_out_amount = row['paid']
+
+    with transaction.atomic():
+        in_range(FinancialDailyRollup.objects.all(), 'day').delete()
+        in_range(ProviderEarnings.objects.all(), 'day').delete()
+        FinancialDailyRollup.objects.bulk_create([
+            FinancialDailyRollup(day=day, provider_type=provider_type, **values)
+            for (day, provider_type), values in totals.items()
+        ], batch_size=1000)
+        ProviderEarnings.objects.bulk_create(earnings.values(), batch_size=1000)
+
+    return len(totals)
+
+
+def summarize_token_sales(start_day=None, end_day=None):
+    """Token sales for an inclusive day range: overall totals, per package and per day"""
+    rows = TokenSalesDailyRollup.objects.all()
+    if start_day:
+        rows = rows.filter(day__gte=start_day)
+    if end_day:
+        rows = rows.filter(day__lte=end_day)
+
+    sums = {'purchase_count': Sum('purchase_count'), 'tokens_sold': Sum('tokens_sold'), 'revenue': Sum('revenue')}
+    totals = rows.aggregate(**sums)
+    return {
+        'total_sales': totals['purchase_count'] or 0,
+        'tokens_sold': totals['tokens_sold'] or 0,
+        'total_revenue': totals['revenue'] or Decimal('0.00'),
+        'by_package': list(rows.values('package_id', 'package__name').annotate(**sums).order_by('package_id')),
+        'by_day': list(rows.values('day').annotate(**sums).order_by('day')),
+    }
+
+
+def rebuild_token_sales(start_day=None, end_day=None):
+    """Recompute TokenSalesDailyRollup rows for a day range; returns the number written"""
+    purchases = TokenPurchase.objects.filter(status='completed').annotate(day=TruncDate('purchased_at'))
+    rows = TokenSalesDailyRollup.objects.all()
+    if start_day:
+        purchases = purchases.filter(day__gte=start_day)
+        rows = rows.filter(day__gte=start_day)
+    if end_day:
+        purchases = purchases.filter(day__lte=end_day)
+        rows = rows.filter(day__lte=end_day)
+
+    totals = [
+        TokenSalesDailyRollup(
+            day=row['day'], package_id=row['package_id'], purchase_count=row['count'],
+            tokens_sold=row['tokens'] or 0, revenue=row['revenue'] or 0
+        )
+        for row in purchases.values('day', 'package_id').annotate(
+            count=Count('token_purchase_id'), tokens=Sum('tokens_amount'), revenue=Sum('price')
+        )
+    ]
+    with transaction.atomic():
+        rows.delete()
+        TokenSalesDailyRollup.objects.bulk_create(totals, batch_size=1000)
+    return len(totals)
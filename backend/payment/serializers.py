@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.urls import reverse
 from .models import BookingPayment, Transaction
+from .blobstore import is_external_url, sign_proof_id, store_inline
 from bookings.models import Booking
 
 
@@ -20,6 +22,30 @@ class BookingPaymentSerializer(serializers.ModelSerializer):
             'payment_method_display', 'payment_type_display'
         ]
         read_only_fields = ['payment_id', 'booking', 'paid_by', 'payment_status', 'remaining_balance', 'created_at', 'updated_at']
+        extra_kwargs = {'payment_proof': {'write_only': True}}
+
+    def _store_proof(self, validated_data):
+        """Move an uploaded base64 proof into the blob store, keeping only its hash on the row"""
+        proof = validated_data.get('payment_proof')
+        if not proof:
+            return
+        if is_external_url(proof):
+            validated_data.update(payment_proof_hash=None, payment_proof_size=None, payment_proof_content_type=None)
+            return
+        try:
+            digest, size, content_type = store_inline(proof)
+        except ValueError as e:
+            raise serializers.ValidationError({'payment_proof': str(e)})
+        validated_data.update(
+            payment_proof=None,
+            payment_proof_hash=digest,
+            payment_proof_size=size,
+            payment_proof_content_type=content_type
+        )
+
+    def update(self, instance, validated_data):
+        self._store_proof(validated_data)
+        return super().update(instance, validated_data)
 
     def create(self, validated_data):
         booking_id = validated_data.pop('booking_id')
@@ -44,6 +70,7 @@ class BookingPaymentSerializer(serializers.ModelSerializer):
                 pass
         
         validated_data['booking'] = booking
+        self._store_proof(validated_data)
         
         return super().create(validated_data)
 
@@ -55,9 +82,24 @@ class BookingPaymentDetailSerializer(serializers.ModelSerializer):
     payment_method_display = serializers.CharField(source='get_payment_method_display', read_only=True)
     payment_type_display = serializers.CharField(source='get_payment_type_display', read_only=True)
     
+    payment_proof_url = serializers.SerializerMethodField()
+    
     class Meta:
         model = BookingPayment
-        fields = '__all__'
+        exclude = ['payment_proof', 'payment_proof_hash', 'payment_proof_content_type']
+        
+    def get_payment_proof_url(self, obj):
+        """Signed, expiring link to the proof download endpoint instead of inlining the image"""
+        if 'payment_proof' in obj.get_deferred_fields():
+            has_legacy_proof = bool(getattr(obj, 'legacy_proof_length', None))
+        else:
+            has_legacy_proof = bool(obj.payment_proof)
+        if not (obj.payment_proof_hash or has_legacy_proof):
+            return None
+        
+        url = reverse('download_payment_proof', args=[sign_proof_id(obj.payment_id)])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
         
     def get_booking_details(self, obj):
         return {
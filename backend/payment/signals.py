@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import TokenPurchase
+from bookings.models import RefundedBooking
+from .models import CommissionSettings, Transaction, Payout
+from . import commission, ledger, rollups
+
+
+def _remember_status(sender, instance, **kwargs):
+    """Stash the stored status so post_save can tell which way it moved"""
+    instance._previous_status = None
+    if instance.pk:
+        instance._previous_status = sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+def _status_change(instance, counted_status):
+    """Return +1 when the row entered counted_status, -1 when it left, else 0"""
+    was_counted = getattr(instance, '_previous_status', None) == counted_status
+    is_counted = instance.status == counted_status
+    return int(is_counted) - int(was_counted)
+
+
+@receiver(post_save, sender=Transaction)
+def transaction_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    def update_aggregates():
+        rollups.record_transaction(instance)
+        if instance.provider_id:
+            ledger.record_earnings(instance)
+    transaction.on_commit(update_aggregates)
+
+
+@receiver(post_delete, sender=Transaction)
+def transaction_deleted(sender, instance, **kwargs):
+    def update_aggregates():
+        rollups.record_transaction(instance, sign=-1)
+        if instance.provider_id:
+            ledger.record_earnings(instance, sign=-1)
+    transaction.on_commit(update_aggregates)
+
+
+pre_save.connect(_remember_status, sender=RefundedBooking, dispatch_uid='refund_remember_status')
+pre_save.connect(_remember_status, sender=Payout, dispatch_uid='payout_remember_status')
+pre_save.connect(_remember_status, sender=TokenPurchase, dispatch_uid='token_purchase_remember_status')
+
+
+@receiver(post_save, sender=RefundedBooking)
+def refund_saved(sender, instance, **kwargs):
+    sign = _status_change(instance, 'approved')
+    if sign:
+        transaction.on_commit(lambda: rollups.record_refund(instance, sign))
+
+
+@receiver(post_save, sender=Payout)
+def payout_saved(sender, instance, **kwargs):
+    sign = _status_change(instance, 'completed')
+    if sign:
+        transaction.on_commit(lambda: rollups.record_payout(instance, sign))
+
+
+@receiver(post_save, sender=TokenPurchase)
+def token_purchase_saved(sender, instance, **kwargs):
+    sign = _status_change(instance, 'completed')
+    if sign:
+        transaction.on_commit(lambda: rollups.record_token_purchase(instance, sign))
+
+
+@receiver(post_delete, sender=TokenPurchase)
+def token_purchase_deleted(sender, instance, **kwargs):
+    if instance.status == 'completed':
+        transaction.on_commit(lambda: rollups.record_token_purchase(instance, sign=-1))
+
+
+@receiver(post_save, sender=CommissionSettings)
+@receiver(post_delete, sender=CommissionSettings)
+def commission_settings_changed(sender, **kwargs):
+    transaction.on_commit(commission.invalidate)
@@ -5,6 +5,7 @@ urlpatterns = [
     # Payment creation and updates
     path('create/', views.create_payment, name='create_payment'),
     path('<int:payment_id>/', views.update_payment, name='update_payment'),
+    path('proof/<str:grant>/', views.download_payment_proof, name='download_payment_proof'),
     
     # Booking payment information
     path('booking/<int:booking_id>/', views.get_booking_payment, name='get_booking_payment'),
@@ -13,4 +14,8 @@ urlpatterns = [
     # User-specific payments
     path('client/<int:client_id>/', views.get_client_payments, name='get_client_payments'),
     path('provider/<int:provider_id>/', views.get_provider_payments, name='get_provider_payments'),
+    
+    # Provider earnings analytics
+    path('provider/<int:provider_id>/earnings/', views.provider_earnings, name='provider_earnings'),
+    path('provider/<int:provider_id>/earnings/transactions/', views.provider_earnings_transactions, name='provider_earnings_transactions'),
 ]
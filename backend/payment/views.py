@@ -2,10 +2,22 @@ from django.shortcuts import render
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.db.models import Sum
+from django.db.models.functions import Length, TruncMonth, TruncWeek
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseRedirect
 from django.utils import timezone
-from .models import BookingPayment, Transaction
+from .models import BookingPayment, Transaction, ProviderEarnings
+from .blobstore import DEFAULT_CONTENT_TYPE, blob_store, decode_inline, is_external_url, set_content_headers, unsign_proof_id
 from .serializers import BookingPaymentSerializer, BookingPaymentDetailSerializer, TransactionSerializer
 from bookings.models import Booking
+from accounts.pagination import InvalidCursor, get_page_params, paginate
+
+
+def _list_queryset(payments):
+    """Leave legacy base64 proofs in the database; lists only need to know one exists"""
+    return payments.defer('payment_proof').annotate(legacy_proof_length=Length('payment_proof'))
 
 
 @api_view(['POST'])
@@ -30,7 +42,7 @@ def create_payment(request):
         payment = serializer.save(payment_date=timezone.now())
         
         # Return detailed response
-        detail_serializer = BookingPaymentDetailSerializer(payment)
+        detail_serializer = BookingPaymentDetailSerializer(payment, context={'request': request})
         return Response({
             'message': 'Payment submitted successfully',
             'payment': detail_serializer.data
@@ -65,7 +77,7 @@ def get_booking_payment(request, booking_id):
             except Booking.DoesNotExist:
                 return Response({'error': 'Booking not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = BookingPaymentDetailSerializer(payment)
+        serializer = BookingPaymentDetailSerializer(payment, context={'request': request})
         return Response(serializer.data)
         
     except Exception as e:
@@ -78,8 +90,8 @@ def list_booking_payments(request, booking_id):
     Get all payments for a specific booking (payment history)
     GET /api/payments/booking/<booking_id>/history/
     """
-    payments = BookingPayment.objects.filter(booking__booking_id=booking_id).order_by('-created_at')
-    serializer = BookingPaymentDetailSerializer(payments, many=True)
+    payments = _list_queryset(BookingPayment.objects.filter(booking__booking_id=booking_id)).order_by('-created_at')
+    serializer = BookingPaymentDetailSerializer(payments, many=True, context={'request': request})
     return Response(serializer.data)
 
 
@@ -102,7 +114,7 @@ def update_payment(request, payment_id):
     
     if serializer.is_valid():
         payment = serializer.save()
-        detail_serializer = BookingPaymentDetailSerializer(payment)
+        detail_serializer = BookingPaymentDetailSerializer(payment, context={'request': request})
         return Response({
             'message': 'Payment updated successfully',
             'payment': detail_serializer.data
@@ -117,11 +129,11 @@ def get_client_payments(request, client_id):
     Get all payments made by a specific client
     GET /api/payments/client/<client_id>/
     """
-    payments = BookingPayment.objects.filter(
+    payments = _list_queryset(BookingPayment.objects.filter(
         paid_by__acc_id=client_id
-    ).select_related('booking').order_by('-created_at')
+    )).select_related('booking').order_by('-created_at')
     
-    serializer = BookingPaymentDetailSerializer(payments, many=True)
+    serializer = BookingPaymentDetailSerializer(payments, many=True, context={'request': request})
     return Response(serializer.data)
 
 
@@ -131,9 +143,179 @@ def get_provider_payments(request, provider_id):
     Get all payments for bookings assigned to a specific provider (mechanic/shop)
     GET /api/payments/provider/<provider_id>/
     """
-    payments = BookingPayment.objects.filter(
+    payments = _list_queryset(BookingPayment.objects.filter(
         booking__request__provider__acc_id=provider_id
-    ).select_related('booking').order_by('-created_at')
+    )).select_related('booking').order_by('-created_at')
     
-    serializer = BookingPaymentDetailSerializer(payments, many=True)
+    serializer = BookingPaymentDetailSerializer(payments, many=True, context={'request': request})
     return Response(serializer.data)
+
+
+@api_view(['GET'])
+def download_payment_proof(request, grant):
+    """
+    Stream the proof image for a payment from the blob store
+    GET /api/payments/proof/<grant>/ with the signed grant from payment_proof_url
+    """
+    try:
+        payment_id = unsign_proof_id(grant)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+
+    payment = BookingPayment.objects.filter(payment_id=payment_id).values(
+        'payment_proof_hash', 'payment_proof_content_type'
+    ).first()
+    if payment is None:
+        return Response({'error': 'Payment not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    digest = payment['payment_proof_hash']
+    if digest:
+        # Blobs are immutable, so the hash doubles as a strong ETag
+        etag = f'"{digest}"'
+        if request.headers.get('If-None-Match') == etag:
+            return HttpResponseNotModified()
+        try:
+            blob = blob_store.open_blob(digest)
+        except FileNotFoundError:
+            return Response({'error': 'Payment proof file is missing'}, status=status.HTTP_404_NOT_FOUND)
+        response = FileResponse(blob)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return set_content_headers(response, payment['payment_proof_content_type'] or DEFAULT_CONTENT_TYPE)
+
+    # Rows not yet moved by migrate_payment_proofs still hold the proof inline
+    legacy_proof = BookingPayment.objects.filter(payment_id=payment_id).values_list('payment_proof', flat=True).first()
+    if not legacy_proof:
+        return Response({'error': 'No payment proof uploaded'}, status=status.HTTP_404_NOT_FOUND)
+    if is_external_url(legacy_proof):
+        return HttpResponseRedirect(legacy_proof)
+    try:
+        data, content_type = decode_inline(legacy_proof)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return set_content_headers(HttpResponse(data), content_type)
+
+
+EARNINGS_PERIODS = {
+    'week': (TruncWeek, 12 * 7),
+    'month': (TruncMonth, 366),
+}
+
+
+def _parse_day(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+@api_view(['GET'])
+def provider_earnings(request, provider_id):
+    """
+    Get bucketed earnings series for a provider from the daily earnings rollup
+    GET /api/payments/provider/<provider_id>/earnings/?period=week|month&from=YYYY-MM-DD&to=YYYY-MM-DD
+    """
+    period = request.GET.get('period', 'month')
+    if period not in EARNINGS_PERIODS:
+        return Response({'error': 'period must be week or month'}, status=status.HTTP_400_BAD_REQUEST)
+    trunc, default_span = EARNINGS_PERIODS[period]
+
+    try:
+        end_day = _parse_day(request.GET.get('to')) or timezone.localdate()
+        start_day = _parse_day(request.GET.get('from')) or end_day - timedelta(days=default_span)
+    except ValueError:
+        return Response({'error': 'Dates must use YYYY-MM-DD format'}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = ProviderEarnings.objects.filter(
+        provider_id=provider_id, day__gte=start_day, day__lte=end_day
+    ).annotate(bucket=trunc('day')).values('bucket').annotate(
+        gross=Sum('gross_amount'),
+        commission=Sum('commission_amount'),
+        net=Sum('net_amount'),
+        paid_out=Sum('paid_out_amount'),
+        transactions=Sum('transaction_count')
+    ).order_by('bucket')
+
+    # Pending is the running balance owed to the provider, so start from what was owed before the range
+    opening = ProviderEarnings.objects.filter(provider_id=provider_id, day__lt=start_day).aggregate(
+        net=Sum('net_amount'), paid_out=Sum('paid_out_amount')
+    )
+    pending = (opening['net'] or Decimal('0')) - (opening['paid_out'] or Decimal('0'))
+
+    series = []
+    totals = {'gross': Decimal('0'), 'commission': Decimal('0'), 'net': Decimal('0'), 'paid_out': Decimal('0')}
+    for row in rows:
+        for key in totals:
+            totals[key] += row[key]
+        pending += row['net'] - row['paid_out']
+        series.append({
+            'period_start': row['bucket'].isoformat(),
+            'gross': str(row['gross']),
+            'commission': str(row['commission']),
+            'payout': str(row['net']),
+            'paid_out': str(row['paid_out']),
+            'pending': str(pending),
+            'transactions': row['transactions']
+        })
+
+    return Response({
+        'provider_id': provider_id,
+        'period': period,
+        'from': start_day.isoformat(),
+        'to': end_day.isoformat(),
+        'series': series,
+        'totals': {
+            'gross': str(totals['gross']),
+            'commission': str(totals['commission']),
+            'payout': str(totals['net']),
+            'paid_out': str(totals['paid_out']),
+            'pending': str(pending)
+        }
+    })
+
+
+@api_view(['GET'])
+def provider_earnings_transactions(request, provider_id):
+    """
+    Page through the ledger transactions behind a provider's earnings, newest first
+    GET /api/payments/provider/<provider_id>/earnings/transactions/?from=YYYY-MM-DD&to=YYYY-MM-DD&cursor=...
+    """
+    try:
+        cursor_values, page_size = get_page_params(request)
+        start_day = _parse_day(request.GET.get('from'))
+        end_day = _parse_day(request.GET.get('to'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Served by the (provider, transaction_date) index
+    transactions = Transaction.objects.filter(provider_id=provider_id)
+    if start_day:
+        transactions = transactions.filter(
+            transaction_date__gte=timezone.make_aware(datetime.combine(start_day, time.min))
+        )
+    if end_day:
+        transactions = transactions.filter(
+            transaction_date__lt=timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min))
+        )
+
+    try:
+        rows, next_cursor = paginate(
+            transactions.values(
+                'transaction_id', 'booking_id', 'total_amount', 'commission_tier', 'commission_rate',
+                'commission_amount', 'provider_payout', 'status', 'payout_status', 'payout_date', 'transaction_date'
+            ),
+            ('-transaction_date', '-transaction_id'), cursor_values, page_size
+        )
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'results': [
+            {
+                **row,
+                'total_amount': str(row['total_amount']),
+                'commission_rate': str(row['commission_rate']),
+                'commission_amount': str(row['commission_amount']),
+                'provider_payout': str(row['provider_payout']),
+            }
+            for row in rows
+        ],
+        'next_cursor': next_cursor
+    })
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests', '0008_merge_20251218_1210'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='request',
+            name='request_status',
+            field=models.CharField(choices=[('pending', 'pending'), ('qouted', 'qouted'), ('accepted', 'accepted'), ('rejected', 'rejected'), ('expired', 'expired')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='request',
+            index=models.Index(fields=['request_status', 'created_at'], name='request_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:44
+
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    for model_name in ('CustomRequest', 'EmergencyRequest'):
+        model = apps.get_model('requests', model_name)
+        batch = []
+        for row in model.objects.only('request', 'description').iterator(chunk_size=500):
+            text = row.description or ''
+            row.summary = text[:100] + "..." if len(text) > 100 else text
+            batch.append(row)
+            if len(batch) >= 500:
+                model.objects.bulk_update(batch, ['summary'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['summary'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests', '0009_request_expired_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customrequest',
+            name='summary',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='emergencyrequest',
+            name='summary',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('requests', '0010_customrequest_summary_emergencyrequest_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customrequest',
+            name='concern_picture',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emergencyrequest',
+            name='concern_picture',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
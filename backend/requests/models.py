@@ -1,5 +1,53 @@
 from django.db import models
 
+
+SUMMARY_LENGTH = 100
+
+# Columns list views never render: base64 pictures and long free text
+LIST_DEFERRED_FIELDS = (
+    'custom_request__description',
+    'custom_request__concern_picture',
+    'custom_request__providers_note',
+    'emergency_request__description',
+    'emergency_request__concern_picture',
+    'emergency_request__providers_note',
+    'direct_request__providers_note',
+    'direct_request__service__description',
+    'direct_request__service__service_banner',
+)
+
+
+def summarize(text):
+    """Short card summary stored alongside a request description"""
+    text = text or ''
+    return text[:SUMMARY_LENGTH] + "..." if len(text) > SUMMARY_LENGTH else text
+
+
+class SummaryMixin:
+    """Keep the summary column in step with the description on every save"""
+    def save(self, *args, **kwargs):
+        self.summary = summarize(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'summary'}
+        super().save(*args, **kwargs)
+
+
+class RequestQuerySet(models.QuerySet):
+    def for_list(self):
+        """
+        Join everything a list card shows in one query and leave the large
+        media and text columns of the request details behind.
+        """
+        return self.select_related(
+            'client__client_id',
+            'provider',
+            'custom_request',
+            'emergency_request',
+            'direct_request__service',
+        ).defer(*LIST_DEFERRED_FIELDS)
+
+
 class Request(models.Model):
     REQUEST_TYPE_CHOICES = [
         ('custom', 'custom'),
@@ -11,6 +59,7 @@ class Request(models.Model):
         ('qouted', 'qouted'),
         ('accepted', 'accepted'),
         ('rejected', 'rejected'),
+        ('expired', 'expired'),
     ]
 
     request_id = models.AutoField(primary_key=True)
@@ -21,10 +70,18 @@ class Request(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = RequestQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['request_status', 'created_at'], name='request_status_created_idx'),
+        ]
+
 
-class CustomRequest(models.Model):
+class CustomRequest(SummaryMixin, models.Model):
     request = models.OneToOneField('requests.Request', primary_key=True, on_delete=models.CASCADE, related_name='custom_request')
     description = models.TextField(null=True, blank=True)
+    summary = models.CharField(max_length=255, blank=True, default='')
     concern_picture = models.TextField(null=True, blank=True)
     providers_note = models.TextField(null=True, blank=True)
     estimated_budget = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
@@ -50,8 +107,9 @@ class DirectRequestAddOn(models.Model):
     service_add_on = models.ForeignKey('services.ServiceAddOn', on_delete=models.CASCADE, related_name='direct_request_addon_of')
 
 
-class EmergencyRequest(models.Model):
+class EmergencyRequest(SummaryMixin, models.Model):
     request = models.OneToOneField('requests.Request', primary_key=True, on_delete=models.CASCADE, related_name='emergency_request')
     description = models.TextField(null=True, blank=True)
+    summary = models.CharField(max_length=255, blank=True, default='')
     concern_picture = models.TextField(null=True, blank=True)
     providers_note = models.TextField(null=True, blank=True)
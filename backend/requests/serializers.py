@@ -210,14 +210,12 @@ class RequestListSerializer(serializers.ModelSerializer):
         """Get a summary of the request based on type"""
         try:
             if obj.request_type == 'custom' and hasattr(obj, 'custom_request'):
-                description = obj.custom_request.description or "No description"
-                return description[:100] + "..." if len(description) > 100 else description
+                return obj.custom_request.summary or "No description"
             elif obj.request_type == 'direct' and hasattr(obj, 'direct_request'):
                 service_name = obj.direct_request.service.name if obj.direct_request.service else "Unknown Service"
                 return f"Direct service request: {service_name}"
             elif obj.request_type == 'emergency' and hasattr(obj, 'emergency_request'):
-                description = obj.emergency_request.description or "Emergency request"
-                return description[:100] + "..." if len(description) > 100 else description
+                return obj.emergency_request.summary or "Emergency request"
         except Exception as e:
             print(f"Error getting request summary: {e}")
         return "Request details unavailable"
\ No newline at end of file
@@ -5,6 +5,7 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_time
 from django.views.decorators.csrf import csrf_exempt
 
 from .models import Request, CustomRequest, QuotedRequestItem, DirectRequest, EmergencyRequest
@@ -15,6 +16,7 @@ from .serializers import (
 )
 from accounts.models import Account, Client, AccountAddress, Mechanic
 from bookings.models import Booking
+from service_details.models import ServiceTime
 
 
 @csrf_exempt
@@ -72,6 +74,14 @@ def create_custom_request(request):
                 estimated_budget=data.get('estimated_budget')
             )
             
+            # Commit the chosen slot so it shows as taken in the mechanic's calendar
+            ServiceTime.objects.create(
+                custom_request=custom_request,
+                is_urgent=data.get('schedule_type') == 'urgent',
+                date=data.get('scheduled_date'),
+                time=data.get('scheduled_time')
+            )
+            
             # Update or create client address if location data provided
             address_fields = [
                 'house_building_number', 'street_name', 'subdivision_village',
@@ -130,14 +140,7 @@ def get_client_requests(request):
         # Get all requests for this client
         requests = Request.objects.filter(
             client=client
-        ).select_related(
-            'provider', 'client__client_id'
-        ).prefetch_related(
-            'custom_request__quoted_items',
-            'direct_request__quoted_items',
-            'direct_request__service',
-            'emergency_request'
-        ).order_by('-created_at')
+        ).for_list().order_by('-created_at')
         
         # Apply status filter if provided
         status_filter = request.GET.get('status')
@@ -383,11 +386,7 @@ def get_provider_requests(request):
         # Get all requests for this provider
         requests = Request.objects.filter(
             provider=provider
-        ).select_related(
-            'client__client_id', 'provider'
-        ).prefetch_related(
-            'custom_request', 'direct_request', 'emergency_request'
-        ).order_by('-created_at')
+        ).for_list().order_by('-created_at')
         
         # Apply status filter if provided
         status_filter = request.GET.get('status')
@@ -495,14 +494,7 @@ def get_mechanic_available_requests(request):
     ).exclude(
         # Exclude requests that already have bookings
         request_id__in=Booking.objects.values_list('request_id', flat=True)
-    ).select_related(
-        'client',
-        'client__client_id'
-    ).prefetch_related(
-        'custom_request',
-        'direct_request',
-        'emergency_request'
-    ).order_by('-created_at')
+    ).for_list().order_by('-created_at')
     
     # Serialize the requests
     serializer = RequestListSerializer(requests_queryset, many=True)
@@ -539,14 +531,7 @@ def get_mechanic_pending_requests(request):
     requests_queryset = Request.objects.filter(
         provider=user.acc_id,
         request_status='pending'
-    ).select_related(
-        'client',
-        'client__client_id'
-    ).prefetch_related(
-        'custom_request',
-        'direct_request',
-        'emergency_request'
-    ).order_by('-created_at')
+    ).for_list().order_by('-created_at')
     
     # Serialize the requests
     serializer = RequestListSerializer(requests_queryset, many=True)
@@ -738,6 +723,16 @@ def create_direct_request(request):
                     'error': f'Missing required field: {field}'
                 }, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            scheduled_date = parse_date(str(data['scheduled_date']))
+            scheduled_time = parse_time(str(data['scheduled_time']))
+        except ValueError:
+            scheduled_date = scheduled_time = None
+        if scheduled_date is None or scheduled_time is None:
+            return Response({
+                'error': 'scheduled_date must be YYYY-MM-DD and scheduled_time HH:MM'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
         with transaction.atomic():
             # Get the client
             try:
@@ -810,8 +805,12 @@ def create_direct_request(request):
                             setattr(address, field, value)
                     address.save()
             
-            # Store schedule info in service_details (optional for now)
-            # You could extend DirectRequest model to include schedule fields
+            # Commit the chosen slot so it shows as taken in the mechanic's calendar
+            ServiceTime.objects.create(
+                direct_request=direct_request,
+                date=scheduled_date,
+                time=scheduled_time
+            )
             
             # Return the created request
             request_serializer = RequestSerializer(main_request)
@@ -1409,14 +1408,7 @@ def get_mechanic_quoted_requests(request):
     requests_queryset = Request.objects.filter(
         provider=user.acc_id,
         request_status='qouted'
-    ).select_related(
-        'client',
-        'client__client_id'
-    ).prefetch_related(
-        'custom_request',
-        'direct_request',
-        'emergency_request'
-    ).order_by('-updated_at')
+    ).for_list().order_by('-updated_at')
     
     # Serialize the requests
     serializer = RequestListSerializer(requests_queryset, many=True)
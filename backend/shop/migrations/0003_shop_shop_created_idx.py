@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_account_account_created_idx_and_more'),
+        ('shop', '0002_shopitem'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shop',
+            index=models.Index(fields=['created_at', 'shop_id'], name='shop_created_idx'),
+        ),
+    ]
@@ -15,6 +15,11 @@ class Shop(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'shop_id'], name='shop_created_idx'),
+        ]
+
     def __str__(self):
         return self.shop_name
 
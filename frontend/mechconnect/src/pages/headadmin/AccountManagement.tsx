@@ -40,6 +40,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './AccountManagement.css';
 
@@ -62,6 +63,8 @@ const AccountManagement: React.FC = () => {
   const [admins, setAdmins] = useState<AdminAccount[]>([]);
   const [filteredAdmins, setFilteredAdmins] = useState<AdminAccount[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchText, setSearchText] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
   const [showCreateModal, setShowCreateModal] = useState(false);
@@ -115,20 +118,26 @@ const AccountManagement: React.FC = () => {
     filterAdminsList();
   }, [searchText, filterStatus, admins]);
 
-  const fetchAdmins = async () => {
+  const fetchAdmins = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/admin-accounts/?user_id=${userId}`);
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`${API_BASE_URL}/head-admin/admin-accounts/?user_id=${userId}${cursorParam}`, { headers: authHeaders() });
       if (response.ok) {
         const data = await response.json();
-        setAdmins(data);
-        setFilteredAdmins(data);
+        setAdmins(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching admin accounts:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -165,6 +174,7 @@ const AccountManagement: React.FC = () => {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({
           ...formData,
@@ -196,6 +206,7 @@ const AccountManagement: React.FC = () => {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({
           ...formData,
@@ -225,6 +236,7 @@ const AccountManagement: React.FC = () => {
       const userId = localStorage.getItem('userId');
       const response = await fetch(`${API_BASE_URL}/head-admin/admin-accounts/${deleteAdminId}/?user_id=${userId}`, {
         method: 'DELETE',
+        headers: authHeaders(),
       });
 
       if (response.ok) {
@@ -248,6 +260,7 @@ const AccountManagement: React.FC = () => {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({
           admin_id: userId,
@@ -480,6 +493,16 @@ const AccountManagement: React.FC = () => {
                       <p>No admin accounts found</p>
                     </div>
                   )}
+                  {nextCursor && (
+                    <IonButton
+                      expand="block"
+                      fill="outline"
+                      disabled={loadingMore}
+                      onClick={() => fetchAdmins(nextCursor)}
+                    >
+                      {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+                    </IonButton>
+                  )}
                 </div>
               </IonCardContent>
             </IonCard>
@@ -40,6 +40,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Disputes.css';
 
@@ -63,6 +64,8 @@ const Disputes: React.FC = () => {
   const [disputes, setDisputes] = useState<Dispute[]>([]);
   const [filteredDisputes, setFilteredDisputes] = useState<Dispute[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchText, setSearchText] = useState('');
   const [filterStatus, setFilterStatus] = useState('pending');
   const [showAlert, setShowAlert] = useState(false);
@@ -99,20 +102,26 @@ const Disputes: React.FC = () => {
     filterDisputesList();
   }, [searchText, filterStatus, disputes]);
 
-  const fetchDisputes = async () => {
+  const fetchDisputes = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/disputes/?user_id=${userId}`);
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`${API_BASE_URL}/head-admin/disputes/?user_id=${userId}${cursorParam}`);
       if (response.ok) {
         const data = await response.json();
-        setDisputes(data);
-        setFilteredDisputes(data);
+        setDisputes(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching disputes:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -165,7 +174,7 @@ const Disputes: React.FC = () => {
       
       const response = await fetch(`${API_BASE_URL}/${endpoint}/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           dispute_id: alertConfig.disputeId,
@@ -378,6 +387,16 @@ const Disputes: React.FC = () => {
                       <p>No disputes found</p>
                     </div>
                   )}
+                  {nextCursor && (
+                    <IonButton
+                      expand="block"
+                      fill="outline"
+                      disabled={loadingMore}
+                      onClick={() => fetchDisputes(nextCursor)}
+                    >
+                      {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+                    </IonButton>
+                  )}
                 </div>
               </IonCardContent>
             </IonCard>
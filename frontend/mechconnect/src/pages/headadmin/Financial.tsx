@@ -46,6 +46,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Financial.css';
 
@@ -143,7 +144,7 @@ const Financial: React.FC = () => {
       }
 
       // Fetch commission settings
-      const settingsResponse = await fetch(`${API_BASE_URL}/head-admin/commission/settings/?user_id=${userId}`);
+      const settingsResponse = await fetch(`${API_BASE_URL}/head-admin/commission/settings/?user_id=${userId}`, { headers: authHeaders() });
       if (settingsResponse.ok) {
         const settingsData = await settingsResponse.json();
         setCommissionSettings(settingsData);
@@ -207,6 +208,7 @@ const Financial: React.FC = () => {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify(commissionSettings),
       });
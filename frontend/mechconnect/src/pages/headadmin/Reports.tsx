@@ -40,6 +40,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Reports.css';
 
@@ -151,7 +152,7 @@ const Reports: React.FC = () => {
       const adminId = localStorage.getItem('userId');
       const response = await fetch(`${API_BASE_URL}/head-admin/review-report/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           report_id: selectedReport.id,
@@ -184,7 +185,7 @@ const Reports: React.FC = () => {
       const adminId = localStorage.getItem('userId');
       const response = await fetch(`${API_BASE_URL}/head-admin/dismiss-report/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           report_id: alertConfig.reportId
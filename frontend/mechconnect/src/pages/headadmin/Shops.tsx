@@ -45,6 +45,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Shops.css';
 
@@ -68,10 +69,16 @@ interface Shop {
   total_services: number;
 }
 
+interface ShopCounts {
+  total: number;
+  verified: number;
+  active: number;
+  mechanics: number;
+}
+
 const Shops: React.FC = () => {
   const history = useHistory();
   const [shops, setShops] = useState<Shop[]>([]);
-  const [filteredShops, setFilteredShops] = useState<Shop[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchText, setSearchText] = useState('');
   const [filterStatus, setFilterStatus] = useState('all');
@@ -85,6 +92,9 @@ const Shops: React.FC = () => {
   });
   const [selectedShop, setSelectedShop] = useState<Shop | null>(null);
   const [showModal, setShowModal] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [counts, setCounts] = useState<ShopCounts | null>(null);
 
   useEffect(() => {
     const storedUser = localStorage.getItem('user');
@@ -101,60 +111,48 @@ const Shops: React.FC = () => {
       history.push('/login');
       return;
     }
-
-    fetchShops();
   }, [history]);
 
   useEffect(() => {
-    filterShopsList();
-  }, [searchText, filterStatus, filterVerification, shops]);
+    // Search and filters run on the server; wait for typing to pause before querying
+    const timer = setTimeout(() => fetchShops(), 300);
+    return () => clearTimeout(timer);
+  }, [searchText, filterStatus, filterVerification]);
 
-  const fetchShops = async () => {
+  const fetchShops = async (cursor?: string) => {
     try {
-      setLoading(true);
-      const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/shops/?user_id=${userId}`);
+      if (cursor) {
+        setLoadingMore(true);
+      }
+      const params = new URLSearchParams();
+      params.set('user_id', localStorage.getItem('userId') || '');
+      if (searchText.trim()) {
+        params.set('search', searchText.trim());
+      }
+      if (filterStatus !== 'all') {
+        params.set('status', filterStatus);
+      }
+      if (filterVerification !== 'all') {
+        params.set('verification', filterVerification);
+      }
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await fetch(`${API_BASE_URL}/head-admin/shops/?${params.toString()}`);
       if (response.ok) {
         const data = await response.json();
-        setShops(data);
-        setFilteredShops(data);
+        setShops(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
+        setCounts(data.counts);
       }
     } catch (error) {
       console.error('Error fetching shops:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  const filterShopsList = () => {
-    let filtered = [...shops];
-
-    // Search filter
-    if (searchText) {
-      filtered = filtered.filter(shop => 
-        shop.shop_name.toLowerCase().includes(searchText.toLowerCase()) ||
-        shop.owner_name.toLowerCase().includes(searchText.toLowerCase()) ||
-        shop.city.toLowerCase().includes(searchText.toLowerCase())
-      );
-    }
-
-    // Status filter
-    if (filterStatus === 'active') {
-      filtered = filtered.filter(shop => shop.is_active);
-    } else if (filterStatus === 'inactive') {
-      filtered = filtered.filter(shop => !shop.is_active);
-    }
-
-    // Verification filter
-    if (filterVerification === 'verified') {
-      filtered = filtered.filter(shop => shop.is_verified);
-    } else if (filterVerification === 'unverified') {
-      filtered = filtered.filter(shop => !shop.is_verified);
-    }
-
-    setFilteredShops(filtered);
-  };
-
   const handleVerifyShop = (shopId: number, shopName: string) => {
     setAlertConfig({
       header: 'Verify Shop',
@@ -200,7 +198,7 @@ const Shops: React.FC = () => {
       
       const response = await fetch(`${API_BASE_URL}/${endpoint}/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           shop_id: alertConfig.shopId
@@ -274,7 +272,7 @@ const Shops: React.FC = () => {
                   <IonSearchbar
                     value={searchText}
                     onIonInput={(e) => setSearchText(e.detail.value!)}
-                    placeholder="Search by shop name, owner, or city"
+                    placeholder="Search by shop name"
                     className="search-bar"
                   />
                   
@@ -308,28 +306,28 @@ const Shops: React.FC = () => {
               <div className="stat-box">
                 <IonIcon icon={storefrontOutline} className="stat-icon" />
                 <div>
-                  <h3>{shops.length}</h3>
+                  <h3>{counts ? counts.total : '-'}</h3>
                   <p>Total Shops</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={checkmarkCircleOutline} className="stat-icon success" />
                 <div>
-                  <h3>{shops.filter(s => s.is_verified).length}</h3>
+                  <h3>{counts ? counts.verified : '-'}</h3>
                   <p>Verified</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={timeOutline} className="stat-icon warning" />
                 <div>
-                  <h3>{shops.filter(s => s.is_active).length}</h3>
+                  <h3>{counts ? counts.active : '-'}</h3>
                   <p>Active</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={hammerOutline} className="stat-icon" />
                 <div>
-                  <h3>{shops.reduce((sum, shop) => sum + shop.total_mechanics, 0)}</h3>
+                  <h3>{counts ? counts.mechanics : '-'}</h3>
                   <p>Total Mechanics</p>
                 </div>
               </div>
@@ -337,7 +335,7 @@ const Shops: React.FC = () => {
 
             {/* Shops Grid */}
             <div className="shops-grid">
-              {filteredShops.map(shop => (
+              {shops.map(shop => (
                 <IonCard key={shop.id} className="shop-card">
                   <IonCardContent>
                     <div className="shop-header">
@@ -438,12 +436,22 @@ const Shops: React.FC = () => {
               ))}
             </div>
 
-            {filteredShops.length === 0 && (
+            {shops.length === 0 && (
               <div className="no-results">
                 <IonIcon icon={searchOutline} />
                 <p>No shops found matching your criteria</p>
               </div>
             )}
+            {nextCursor && (
+              <IonButton
+                expand="block"
+                fill="outline"
+                disabled={loadingMore}
+                onClick={() => fetchShops(nextCursor)}
+              >
+                {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+              </IonButton>
+            )}
           </div>
         </IonContent>
 
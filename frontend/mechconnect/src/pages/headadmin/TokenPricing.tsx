@@ -37,6 +37,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './TokenPricing.css';
 
@@ -102,7 +103,7 @@ const TokenPricing: React.FC = () => {
       const userId = localStorage.getItem('userId');
       
       // Fetch packages
-      const packagesResponse = await fetch(`${API_BASE_URL}/head-admin/token-pricing/?user_id=${userId}`);
+      const packagesResponse = await fetch(`${API_BASE_URL}/head-admin/token-pricing/?user_id=${userId}`, { headers: authHeaders() });
       if (packagesResponse.ok) {
         const packagesData = await packagesResponse.json();
         setPackages(packagesData.packages || []);
@@ -122,6 +123,7 @@ const TokenPricing: React.FC = () => {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({
           ...newPackage,
@@ -149,6 +151,7 @@ const TokenPricing: React.FC = () => {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
+          ...authHeaders(),
         },
         body: JSON.stringify({
           ...pkg,
@@ -176,6 +179,7 @@ const TokenPricing: React.FC = () => {
       const userId = localStorage.getItem('userId');
       const response = await fetch(`${API_BASE_URL}/head-admin/token-pricing/${packageId}/?user_id=${userId}`, {
         method: 'DELETE',
+        headers: authHeaders(),
       });
 
       if (response.ok) {
@@ -57,6 +57,12 @@ interface TokenPurchase {
   purchased_at: string;
 }
 
+interface TokenSalesStats {
+  total_sales: number;
+  tokens_sold: number;
+  total_revenue: string;
+}
+
 const Tokens: React.FC = () => {
   const history = useHistory();
   const [purchases, setPurchases] = useState<TokenPurchase[]>([]);
@@ -67,6 +73,9 @@ const Tokens: React.FC = () => {
   const [filterUserType, setFilterUserType] = useState('all');
   const [selectedPurchase, setSelectedPurchase] = useState<TokenPurchase | null>(null);
   const [showModal, setShowModal] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [salesStats, setSalesStats] = useState<TokenSalesStats | null>(null);
 
   useEffect(() => {
     const storedUser = localStorage.getItem('user');
@@ -85,26 +94,44 @@ const Tokens: React.FC = () => {
     }
 
     fetchTokenPurchases();
+    fetchTokenSales();
   }, [history]);
 
   useEffect(() => {
     filterPurchasesList();
   }, [searchText, filterStatus, filterUserType, purchases]);
 
-  const fetchTokenPurchases = async () => {
+  const fetchTokenPurchases = async (cursor?: string) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/token-purchases/?user_id=${userId}`);
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`${API_BASE_URL}/head-admin/token-purchases/?user_id=${userId}${cursorParam}`);
       if (response.ok) {
         const data = await response.json();
-        setPurchases(data);
-        setFilteredPurchases(data);
+        setPurchases(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching token purchases:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  const fetchTokenSales = async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/head-admin/token-sales/`);
+      if (response.ok) {
+        setSalesStats(await response.json());
+      }
+    } catch (error) {
+      console.error('Error fetching token sales:', error);
     }
   };
 
@@ -152,13 +179,8 @@ const Tokens: React.FC = () => {
     }
   };
 
-  const totalRevenue = purchases
-    .filter(p => p.status === 'completed')
-    .reduce((sum, p) => sum + parseFloat(p.price), 0);
-
-  const totalTokens = purchases
-    .filter(p => p.status === 'completed')
-    .reduce((sum, p) => sum + p.tokens_amount, 0);
+  const totalRevenue = salesStats ? parseFloat(salesStats.total_revenue) : 0;
+  const totalTokens = salesStats ? salesStats.tokens_sold : 0;
 
   if (loading) {
     return (
@@ -342,6 +364,16 @@ const Tokens: React.FC = () => {
                       <p>No token purchases found</p>
                     </div>
                   )}
+                  {nextCursor && (
+                    <IonButton
+                      expand="block"
+                      fill="outline"
+                      disabled={loadingMore}
+                      onClick={() => fetchTokenPurchases(nextCursor)}
+                    >
+                      {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+                    </IonButton>
+                  )}
                 </div>
               </IonCardContent>
             </IonCard>
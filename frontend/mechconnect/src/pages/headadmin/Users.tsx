@@ -31,6 +31,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Users.css';
 
@@ -48,16 +49,24 @@ interface User {
   roles: Array<{ account_role: string }>;
 }
 
+interface UserStats {
+  total: number;
+  active: number;
+  banned: number;
+}
+
 const HeadAdminUsers: React.FC = () => {
   const history = useHistory();
   const [users, setUsers] = useState<User[]>([]);
-  const [filteredUsers, setFilteredUsers] = useState<User[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchText, setSearchText] = useState('');
   const [filterRole, setFilterRole] = useState('all');
   const [filterStatus, setFilterStatus] = useState('all');
   const [showAlert, setShowAlert] = useState(false);
   const [alertConfig, setAlertConfig] = useState({ header: '', message: '', userId: 0, action: '' });
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [userStats, setUserStats] = useState<UserStats | null>(null);
 
   useEffect(() => {
     const storedUser = localStorage.getItem('user');
@@ -75,59 +84,68 @@ const HeadAdminUsers: React.FC = () => {
       return;
     }
 
-    fetchUsers();
+    fetchUserStats();
   }, [history]);
 
   useEffect(() => {
-    filterUsers();
-  }, [searchText, filterRole, filterStatus, users]);
+    // Search and filters run on the server; wait for typing to pause before querying
+    const timer = setTimeout(() => fetchUsers(), 300);
+    return () => clearTimeout(timer);
+  }, [searchText, filterRole, filterStatus]);
 
-  const fetchUsers = async () => {
+  const buildQuery = () => {
+    const params = new URLSearchParams();
+    params.set('user_id', localStorage.getItem('userId') || '');
+    if (searchText.trim()) {
+      params.set('search', searchText.trim());
+    }
+    if (filterRole !== 'all') {
+      params.set('role', filterRole);
+    }
+    if (filterStatus === 'active') {
+      params.set('active', 'true');
+      params.set('banned', 'false');
+    } else if (filterStatus === 'banned') {
+      params.set('banned', 'true');
+    } else if (filterStatus === 'inactive') {
+      params.set('active', 'false');
+    }
+    return params;
+  };
+
+  const fetchUsers = async (cursor?: string) => {
     try {
-      setLoading(true);
-      const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/users/?user_id=${userId}`);
+      if (cursor) {
+        setLoadingMore(true);
+      }
+      const params = buildQuery();
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await fetch(`${API_BASE_URL}/head-admin/users/?${params.toString()}`);
       if (response.ok) {
         const data = await response.json();
-        setUsers(data);
-        setFilteredUsers(data);
+        setUsers(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching users:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  const filterUsers = () => {
-    let filtered = [...users];
-
-    // Search filter
-    if (searchText) {
-      filtered = filtered.filter(user => 
-        user.username.toLowerCase().includes(searchText.toLowerCase()) ||
-        user.email.toLowerCase().includes(searchText.toLowerCase()) ||
-        `${user.first_name} ${user.last_name}`.toLowerCase().includes(searchText.toLowerCase())
-      );
-    }
-
-    // Role filter
-    if (filterRole !== 'all') {
-      filtered = filtered.filter(user => 
-        user.roles.some(r => r.account_role === filterRole)
-      );
-    }
-
-    // Status filter
-    if (filterStatus === 'active') {
-      filtered = filtered.filter(user => user.is_active && !user.is_banned);
-    } else if (filterStatus === 'banned') {
-      filtered = filtered.filter(user => user.is_banned);
-    } else if (filterStatus === 'inactive') {
-      filtered = filtered.filter(user => !user.is_active);
+  const fetchUserStats = async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/head-admin/dashboard/stats/`);
+      if (response.ok) {
+        const data = await response.json();
+        setUserStats(data.users);
+      }
+    } catch (error) {
+      console.error('Error fetching user stats:', error);
     }
-
-    setFilteredUsers(filtered);
   };
 
   const handleBanUser = (userId: number, username: string) => {
@@ -157,7 +175,7 @@ const HeadAdminUsers: React.FC = () => {
       
       const response = await fetch(`${API_BASE_URL}/${endpoint}/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           user_id: alertConfig.userId
@@ -166,6 +184,7 @@ const HeadAdminUsers: React.FC = () => {
 
       if (response.ok) {
         fetchUsers(); // Refresh the list
+        fetchUserStats();
       }
     } catch (error) {
       console.error('Error performing action:', error);
@@ -274,28 +293,28 @@ const HeadAdminUsers: React.FC = () => {
               <div className="stat-box">
                 <IonIcon icon={peopleOutline} className="stat-icon" />
                 <div>
-                  <h3>{users.length}</h3>
+                  <h3>{userStats ? userStats.total : '-'}</h3>
                   <p>Total Users</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={checkmarkCircleOutline} className="stat-icon success" />
                 <div>
-                  <h3>{users.filter(u => u.is_active && !u.is_banned).length}</h3>
+                  <h3>{userStats ? userStats.active : '-'}</h3>
                   <p>Active</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={banOutline} className="stat-icon danger" />
                 <div>
-                  <h3>{users.filter(u => u.is_banned).length}</h3>
+                  <h3>{userStats ? userStats.banned : '-'}</h3>
                   <p>Banned</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={closeCircleOutline} className="stat-icon warning" />
                 <div>
-                  <h3>{users.filter(u => !u.is_active).length}</h3>
+                  <h3>{userStats ? userStats.total - userStats.active : '-'}</h3>
                   <p>Inactive</p>
                 </div>
               </div>
@@ -305,7 +324,7 @@ const HeadAdminUsers: React.FC = () => {
             <IonCard>
               <IonCardHeader>
                 <IonCardTitle>
-                  Users ({filteredUsers.length})
+                  Users ({users.length}{nextCursor ? '+' : ''})
                 </IonCardTitle>
               </IonCardHeader>
               <IonCardContent>
@@ -324,7 +343,7 @@ const HeadAdminUsers: React.FC = () => {
                       </tr>
                     </thead>
                     <tbody>
-                      {filteredUsers.map(user => (
+                      {users.map(user => (
                         <tr key={user.id}>
                           <td>{user.id}</td>
                           <td className="username">{user.username}</td>
@@ -376,12 +395,22 @@ const HeadAdminUsers: React.FC = () => {
                       ))}
                     </tbody>
                   </table>
-                  {filteredUsers.length === 0 && (
+                  {users.length === 0 && (
                     <div className="no-results">
                       <IonIcon icon={searchOutline} />
                       <p>No users found matching your criteria</p>
                     </div>
                   )}
+                  {nextCursor && (
+                    <IonButton
+                      expand="block"
+                      fill="outline"
+                      disabled={loadingMore}
+                      onClick={() => fetchUsers(nextCursor)}
+                    >
+                      {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+                    </IonButton>
+                  )}
                 </div>
               </IonCardContent>
             </IonCard>
@@ -46,6 +46,7 @@ import {
 } from 'ionicons/icons';
 import { useHistory } from 'react-router-dom';
 import HeadAdminSidebar from '../../components/HeadAdminSidebar';
+import { authHeaders } from '../../utils/auth';
 import './HeadAdminLayout.css';
 import './Verifications.css';
 
@@ -56,6 +57,7 @@ interface Document {
   name: string;
   type: string;
   url: string;
+  size: number | null;
   date_issued: string | null;
   date_expiry: string | null;
   uploaded_at: string;
@@ -79,10 +81,16 @@ interface VerificationRequest {
   };
 }
 
+interface VerificationCounts {
+  total: number;
+  pending: number;
+  approved: number;
+  rejected: number;
+}
+
 const Verifications: React.FC = () => {
   const history = useHistory();
   const [verifications, setVerifications] = useState<VerificationRequest[]>([]);
-  const [filteredVerifications, setFilteredVerifications] = useState<VerificationRequest[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchText, setSearchText] = useState('');
   const [filterType, setFilterType] = useState('all');
@@ -96,6 +104,9 @@ const Verifications: React.FC = () => {
   });
   const [selectedVerification, setSelectedVerification] = useState<VerificationRequest | null>(null);
   const [showModal, setShowModal] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [counts, setCounts] = useState<VerificationCounts | null>(null);
 
   useEffect(() => {
     const storedUser = localStorage.getItem('user');
@@ -112,56 +123,50 @@ const Verifications: React.FC = () => {
       history.push('/login');
       return;
     }
-
-    fetchVerifications();
   }, [history]);
 
   useEffect(() => {
-    filterVerificationRequests();
-  }, [searchText, filterType, filterStatus, verifications]);
+    // Search and filters run on the server; wait for typing to pause before querying
+    const timer = setTimeout(() => fetchVerifications(), 300);
+    return () => clearTimeout(timer);
+  }, [searchText, filterType, filterStatus]);
 
-  const fetchVerifications = async () => {
+  const fetchVerifications = async (cursor?: string) => {
     try {
-      setLoading(true);
-      const userId = localStorage.getItem('userId');
-      const response = await fetch(`${API_BASE_URL}/head-admin/verifications/?user_id=${userId}`);
+      if (cursor) {
+        setLoadingMore(true);
+      }
+      const params = new URLSearchParams();
+      params.set('user_id', localStorage.getItem('userId') || '');
+      if (searchText.trim()) {
+        params.set('search', searchText.trim());
+      }
+      if (filterType !== 'all') {
+        params.set('account_type', filterType);
+      }
+      if (filterStatus !== 'all') {
+        params.set('status', filterStatus);
+      }
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await fetch(`${API_BASE_URL}/head-admin/verifications/?${params.toString()}`, {
+        headers: authHeaders(),
+      });
       if (response.ok) {
         const data = await response.json();
-        setVerifications(data);
-        setFilteredVerifications(data);
+        setVerifications(prev => (cursor ? [...prev, ...data.results] : data.results));
+        setNextCursor(data.next_cursor);
+        setCounts(data.counts);
       }
     } catch (error) {
       console.error('Error fetching verifications:', error);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  const filterVerificationRequests = () => {
-    let filtered = [...verifications];
-
-    // Search filter
-    if (searchText) {
-      filtered = filtered.filter(ver => 
-        ver.username.toLowerCase().includes(searchText.toLowerCase()) ||
-        ver.email.toLowerCase().includes(searchText.toLowerCase()) ||
-        ver.full_name.toLowerCase().includes(searchText.toLowerCase())
-      );
-    }
-
-    // Type filter
-    if (filterType !== 'all') {
-      filtered = filtered.filter(ver => ver.account_type === filterType);
-    }
-
-    // Status filter
-    if (filterStatus !== 'all') {
-      filtered = filtered.filter(ver => ver.status === filterStatus);
-    }
-
-    setFilteredVerifications(filtered);
-  };
-
   const handleApprove = (verificationId: number, username: string) => {
     setAlertConfig({
       header: 'Approve Verification',
@@ -191,7 +196,7 @@ const Verifications: React.FC = () => {
       
       const response = await fetch(`${API_BASE_URL}/${endpoint}/`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders() },
         body: JSON.stringify({
           admin_id: adminId,
           verification_id: alertConfig.verificationId
@@ -328,28 +333,28 @@ const Verifications: React.FC = () => {
               <div className="stat-box">
                 <IonIcon icon={timeOutline} className="stat-icon warning" />
                 <div>
-                  <h3>{verifications.filter(v => v.status === 'pending').length}</h3>
+                  <h3>{counts ? counts.pending : '-'}</h3>
                   <p>Pending</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={checkmarkCircleOutline} className="stat-icon success" />
                 <div>
-                  <h3>{verifications.filter(v => v.status === 'approved').length}</h3>
+                  <h3>{counts ? counts.approved : '-'}</h3>
                   <p>Approved</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={closeCircleOutline} className="stat-icon danger" />
                 <div>
-                  <h3>{verifications.filter(v => v.status === 'rejected').length}</h3>
+                  <h3>{counts ? counts.rejected : '-'}</h3>
                   <p>Rejected</p>
                 </div>
               </div>
               <div className="stat-box">
                 <IonIcon icon={documentTextOutline} className="stat-icon" />
                 <div>
-                  <h3>{verifications.length}</h3>
+                  <h3>{counts ? counts.total : '-'}</h3>
                   <p>Total Requests</p>
                 </div>
               </div>
@@ -359,7 +364,7 @@ const Verifications: React.FC = () => {
             <IonCard>
               <IonCardHeader>
                 <IonCardTitle>
-                  Verification Requests ({filteredVerifications.length})
+                  Verification Requests ({verifications.length}{nextCursor ? '+' : ''})
                 </IonCardTitle>
               </IonCardHeader>
               <IonCardContent>
@@ -378,7 +383,7 @@ const Verifications: React.FC = () => {
                       </tr>
                     </thead>
                     <tbody>
-                      {filteredVerifications.map(verification => (
+                      {verifications.map(verification => (
                         <tr key={verification.id}>
                           <td>{verification.id}</td>
                           <td>
@@ -450,12 +455,22 @@ const Verifications: React.FC = () => {
                       ))}
                     </tbody>
                   </table>
-                  {filteredVerifications.length === 0 && (
+                  {verifications.length === 0 && (
                     <div className="no-results">
                       <IonIcon icon={searchOutline} />
                       <p>No verification requests found</p>
                     </div>
                   )}
+                  {nextCursor && (
+                    <IonButton
+                      expand="block"
+                      fill="outline"
+                      disabled={loadingMore}
+                      onClick={() => fetchVerifications(nextCursor)}
+                    >
+                      {loadingMore ? <IonSpinner name="crescent" /> : 'Load More'}
+                    </IonButton>
+                  )}
                 </div>
               </IonCardContent>
             </IonCard>
@@ -43,6 +43,12 @@ export const getAuthToken = (): string | null => {
   }
 };
 
+// Admin endpoints read roles and permissions from the access token
+export const authHeaders = (): Record<string, string> => {
+  const token = getAuthToken();
+  return token ? { 'Authorization': `Bearer ${token}` } : {};
+};
+
 export const getUserData = (): any | null => {
   try {
     const userData = localStorage.getItem('user');